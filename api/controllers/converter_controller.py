@@ -1,7 +1,8 @@
 from http import HTTPStatus
-from typing import Annotated, final
+from typing import Annotated, Optional, Union, final
 
 from anydi_django import container
+from django.http import StreamingHttpResponse
 from ninja import UploadedFile
 from ninja.params.functions import File, Form
 from ninja_extra import api_controller, http_get, http_post  # pyright: ignore
@@ -12,6 +13,8 @@ from api.throttling import Anonymous60MinutesRateThrottle, Anonymous100PerDayRat
 from application.converter.commands.convert_images_command import ConvertImagesCommand
 from application.converter.commands.schemas import ConversionRequest, ConversionResponse, GetZipResponse
 from application.converter.queries.get_converted_zip_query import GetConvertedZipQuery
+from application.converter.queries.stream_converted_zip_query import StreamConvertedZipQuery
+from core.result import ContextResult
 from domain.converter.constants import ConverterConstants
 
 
@@ -56,10 +59,66 @@ class ConverterController(ControllerBase):
                 description="Upload files to be converted into different format",
             ),
         ],
+        target_size_bytes: Annotated[
+            Optional[int],
+            Form(
+                default=None,
+                gt=0,
+                title="Target size",
+                description="Choose the highest quality, up to the given one, whose output is estimated to fit in the given size. JPEG and WEBP only",
+            ),
+        ],
+        target_ssim: Annotated[
+            Optional[float],
+            Form(
+                default=None,
+                ge=ConverterConstants.MIN_TARGET_SSIM,
+                le=ConverterConstants.MAX_TARGET_SSIM,
+                title="Target SSIM",
+                description="Choose the lowest quality, up to the given one, whose output is at least as similar to the original. JPEG and WEBP only",
+            ),
+        ],
+        max_width: Annotated[
+            Optional[int],
+            Form(
+                default=None,
+                gt=0,
+                title="Max width",
+                description="Downscale images wider than the given width, keeping their aspect ratio",
+            ),
+        ],
+        max_height: Annotated[
+            Optional[int],
+            Form(
+                default=None,
+                gt=0,
+                title="Max height",
+                description="Downscale images higher than the given height, keeping their aspect ratio",
+            ),
+        ],
+        scale: Annotated[
+            Optional[float],
+            Form(
+                default=None,
+                gt=0,
+                le=ConverterConstants.MAX_RESIZE_SCALE,
+                title="Scale",
+                description="Downscale images by the given factor. Combined with max width and max height, the smallest size is used",
+            ),
+        ],
     ) -> ActionResultWithStatus[ConversionResponse]:
         async with container.arequest_context():
             convert_images_command = await container.aresolve(ConvertImagesCommand)
-            conversion_request = ConversionRequest.create(files, output_format, quality)
+            conversion_request = ConversionRequest.create(
+                files,
+                output_format,
+                quality,
+                target_size_bytes=target_size_bytes,
+                target_ssim=target_ssim,
+                max_width=max_width,
+                max_height=max_height,
+                scale=scale,
+            )
             results = await convert_images_command.ahandle(self.http_request, conversion_request)
             return ActionResult[ConversionResponse].from_results(results)
 
@@ -79,3 +138,28 @@ class ConverterController(ControllerBase):
             get_converted_zip_query = await container.aresolve(GetConvertedZipQuery)
             result = await get_converted_zip_query.ahandle(self.http_request)
             return ActionResult[GetZipResponse].from_result(result)
+
+    @http_get(
+        "zip/stream",
+        response={
+            HTTPStatus.NOT_FOUND: ActionResult[GetZipResponse],
+            HTTPStatus.BAD_REQUEST: ActionResult[GetZipResponse],
+            HTTPStatus.INTERNAL_SERVER_ERROR: ActionResult[GetZipResponse],
+        },
+        summary="Stream converted images as zip",
+        description="Builds the zip while the converted images are downloaded, instead of generating an archive in the storage",
+        throttle=[Anonymous60MinutesRateThrottle(), Anonymous100PerDayRateThrottle()],
+    )
+    async def astream_zip(self) -> Union[StreamingHttpResponse, ActionResultWithStatus[GetZipResponse]]:
+        async with container.arequest_context():
+            stream_converted_zip_query = await container.aresolve(StreamConvertedZipQuery)
+            result = await stream_converted_zip_query.ahandle(self.http_request)
+
+        if result.is_error():
+            return ActionResult[GetZipResponse].from_result(ContextResult[GetZipResponse].failure(result.error))
+
+        return StreamingHttpResponse(
+            result.ok,
+            content_type="application/zip",
+            headers={"Content-Disposition": 'attachment; filename="webpeditor_converted_images.zip"'},
+        )
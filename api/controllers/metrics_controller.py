@@ -0,0 +1,18 @@
+from http import HTTPStatus
+from typing import final
+
+from anydi_django import container
+from django.http import HttpResponse
+from ninja_extra import api_controller, http_get  # pyright: ignore
+
+from api.controllers.controller_base import ControllerBase
+from core.abc.tracer_abc import TracerABC
+
+
+@final
+@api_controller("metrics", tags="Metrics")
+class MetricsController(ControllerBase):
+    @http_get("", response={HTTPStatus.OK: None}, summary="Get metrics in the Prometheus text format", include_in_schema=False)
+    async def aget_metrics(self) -> HttpResponse:
+        tracer = await container.aresolve(TracerABC)
+        return HttpResponse(tracer.render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8")
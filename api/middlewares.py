@@ -10,6 +10,7 @@ from types_linq import Enumerable
 
 from api.action_result import ActionResult
 from core.abc.logger_abc import LoggerABC
+from core.abc.tracer_abc import TracerABC
 
 
 @final
@@ -46,3 +47,19 @@ class ErrorHandlingMiddleware:
             reason = response.content.decode(response.charset or "utf-8")
             self.__logger.request_exception(request, exception, f"Unhandled error. Reason: '{reason}'")
             return Option[ActionResult[Any]].Nothing()
+
+
+@final
+class ServerTimingMiddleware:
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponseBase]) -> None:
+        self.__tracer: Final[TracerABC] = container.resolve(TracerABC)
+        self.get_response: Callable[[HttpRequest], HttpResponseBase] = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        with self.__tracer.trace_request() as request_trace:
+            response = self.get_response(request)
+
+        if request_trace is not None and (server_timing := request_trace.to_server_timing()):
+            response["Server-Timing"] = server_timing
+
+        return response
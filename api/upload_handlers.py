@@ -0,0 +1,51 @@
+import hashlib
+from typing import Optional, final, override
+
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, MemoryFileUploadHandler, TemporaryFileUploadHandler
+from django.http import HttpRequest
+
+from core.utils import DigestUtils
+
+
+class _HashingUploadHandlerMixin(FileUploadHandler):
+    def __init__(self, request: Optional[HttpRequest] = None) -> None:
+        super().__init__(request)
+        self.__hasher = hashlib.sha256()
+
+    @override
+    def new_file(
+        self,
+        field_name: str,
+        file_name: str,
+        content_type: str,
+        content_length: Optional[int],
+        charset: Optional[str] = None,
+        content_type_extra: Optional[dict[str, bytes]] = None,
+    ) -> None:
+        # Created first, since the next handler may stop the handler chain by raising StopFutureHandlers
+        self.__hasher = hashlib.sha256()
+        super().new_file(field_name, file_name, content_type, content_length, charset, content_type_extra)
+
+    @override
+    def receive_data_chunk(self, raw_data: bytes, start: int) -> Optional[bytes]:
+        remaining_data = super().receive_data_chunk(raw_data, start)
+        # Chunks that are passed on are stored and hashed by the next handler
+        if remaining_data is None:
+            self.__hasher.update(raw_data)
+        return remaining_data
+
+    @override
+    def file_complete(self, file_size: int) -> Optional[UploadedFile]:
+        uploaded_file = super().file_complete(file_size)
+        if uploaded_file is not None:
+            DigestUtils.set_sha256(uploaded_file, self.__hasher.hexdigest())
+        return uploaded_file
+
+
+@final
+class HashingMemoryFileUploadHandler(_HashingUploadHandlerMixin, MemoryFileUploadHandler): ...
+
+
+@final
+class HashingTemporaryFileUploadHandler(_HashingUploadHandlerMixin, TemporaryFileUploadHandler): ...
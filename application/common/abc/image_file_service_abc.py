@@ -12,7 +12,7 @@ class ImageFileServiceABC(ABC):
     def verify_integrity(self, file: ImageFile.ImageFile) -> ContextResult[ImageFile.ImageFile]: ...
 
     @abstractmethod
-    def get_info(self, file: ImageFile.ImageFile) -> ContextResult[ImageFileInfo]: ...
+    def get_info(self, file: ImageFile.ImageFile, content: bytes) -> ContextResult[ImageFileInfo]: ...
 
     @abstractmethod
     def set_filename(self, file: ImageFile.ImageFile, filename: Union[str, bytes]) -> ContextResult[ImageFile.ImageFile]: ...
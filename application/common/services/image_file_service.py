@@ -1,5 +1,4 @@
 from decimal import ROUND_UP, Decimal
-from io import BytesIO
 from typing import Final, Union, final
 
 from PIL import ExifTags, Image, ImageFile, UnidentifiedImageError
@@ -31,9 +30,8 @@ class ImageFileService(ImageFileServiceABC):
         try:
             file.fp.seek(0)
             file_copy = Image.open(file.fp)
-            filename_copy = file.fp.name
             file.verify()
-            return self.set_filename(file_copy, filename_copy)
+            return self.set_filename(file_copy, file.filename)
         except UnidentifiedImageError:
             message = f"File '{file.filename}' cannot be processed. Incompatible file type"
             self.__logger.debug(message)
@@ -43,8 +41,8 @@ class ImageFileService(ImageFileServiceABC):
             self.__logger.exception(exception, message)
             return ContextResult[ImageFile.ImageFile].failure(ErrorContext.bad_request(message))
 
-    def get_info(self, file: ImageFile.ImageFile) -> ContextResult[ImageFileInfo]:
-        return self.__get_filename_details(file.filename).map2(self.__get_file_details(file), ImageFileInfo.create)
+    def get_info(self, file: ImageFile.ImageFile, content: bytes) -> ContextResult[ImageFileInfo]:
+        return self.__get_filename_details(file.filename).map2(self.__get_file_details(file, content), ImageFileInfo.create)
 
     def set_filename(self, file: ImageFile.ImageFile, filename: Union[str, bytes]) -> ContextResult[ImageFile.ImageFile]:
         return self.__filename_service.normalize(filename).map(lambda normalized: self.__set_filename(file, normalized))
@@ -58,13 +56,8 @@ class ImageFileService(ImageFileServiceABC):
             .map(lambda flatten_data: ImageFileInfo.FilenameDetails.create(*flatten_data))
         )
 
-    def __get_file_details(self, file: ImageFile.ImageFile) -> ContextResult[ImageFileInfo.FileDetails]:
-        buffer = BytesIO()
-
-        file.save(buffer, format=file.format)
-
-        content = buffer.getvalue()
-
+    def __get_file_details(self, file: ImageFile.ImageFile, content: bytes) -> ContextResult[ImageFileInfo.FileDetails]:
+        # Metadata is taken from the parsed header. The content is passed through as-is, without re-encoding
         file_details = ImageFileInfo.FileDetails(
             format=file.format or "",
             format_description=file.format_description or "",
@@ -77,8 +70,6 @@ class ImageFileService(ImageFileServiceABC):
             exif_data=self.__get_exif_data(file),
         )
 
-        buffer.close()
-
         return ContextResult[ImageFileInfo.FileDetails].success(file_details)
 
     @staticmethod
@@ -1,24 +1,22 @@
-from datetime import datetime
-from typing import Any, Final, Optional, final
+from datetime import timedelta
+from typing import Final, Optional, final
 from uuid import uuid4
 
 from asgiref.sync import sync_to_async
-from django.contrib.sessions.backends.db import SessionStore
+from django.contrib.sessions.backends.base import SessionBase
 from django.http.request import HttpRequest
 from django.utils import timezone
-from expression import Option
 from names_generator import generate_name
 
 from application.common.abc.signing_service_abc import SigningServiceABC
 from core.abc.logger_abc import LoggerABC
-from core.result import ContextResult, ErrorContext, as_awaitable_result
+from core.result import ContextResult, as_awaitable_result
 from webpeditor import settings
 
 
 @final
 class SessionService:
     __USER_ID_KEY: Final[str] = "USER_ID"
-    __SESSION_EXPIRY_SET_KEY: Final[str] = "SESSION_EXPIRY_SET"
 
     def __init__(
         self,
@@ -32,52 +30,32 @@ class SessionService:
 
     @as_awaitable_result
     async def aget_user_id(self) -> ContextResult[str]:
-        return await self.__aget_user_id() if not await self.__ais_expired() else await self.__acreate_user_id()
-
-    @as_awaitable_result
-    async def __acreate_user_id(self) -> ContextResult[str]:
-        signed_user_id = self.__signing_service.sign(self.__generate_id())
-        await self.__aset(self.__USER_ID_KEY, signed_user_id)
-        return await self.__aget_user_id()
-
-    @as_awaitable_result
-    async def __aget_user_id(self) -> ContextResult[str]:
-        return await (
-            ContextResult[str]
-            .from_result(
-                Option.of_optional(await self.__aget(self.__USER_ID_KEY))
-                .to_result(ErrorContext.not_found(f"Unable to find User in the {SessionStore.__name__}!"))
-                .bind(self.__signing_service.unsign)
-            )
-            .amap(self.__arefresh_expiry)
-        )
-
-    async def __arefresh_expiry(self, user_id: str) -> str:
-        await self.__aset_expiry(settings.SESSION_COOKIE_AGE)
-
-        expire_at = await self.__aget_expiry_date()
-        self.__logger.debug(f"Session for User '{user_id}' will expire at {expire_at.time()} UTC.")
-
-        await self.__aset(self.__SESSION_EXPIRY_SET_KEY, True)
-        return user_id
-
-    async def __ais_expired(self) -> bool:
-        is_expiry_set = await self.__aget(self.__SESSION_EXPIRY_SET_KEY)
-        expire_at = await self.__aget_expiry_date()
-        return not is_expiry_set or timezone.now() > expire_at
-
-    async def __aget(self, key: str) -> Optional[Any]:
-        return await sync_to_async(self.__http_request.session.get)(key)
-
-    async def __aset(self, key: str, value: Any) -> None:
-        await sync_to_async(self.__http_request.session.__setitem__)(key, value)
-        return await sync_to_async(self.__http_request.session.save)()
-
-    async def __aget_expiry_date(self) -> datetime:
-        return await sync_to_async(self.__http_request.session.get_expiry_date)()
-
-    async def __aset_expiry(self, value: int) -> None:
-        return await sync_to_async(self.__http_request.session.set_expiry)(value)
+        # The session is loaded and updated in a single hop to the synchronous session backend
+        return await sync_to_async(self.__get_user_id)()
+
+    def __get_user_id(self) -> ContextResult[str]:
+        session = self.__http_request.session
+        signed_user_id = self.__get_signed_user_id(session)
+
+        if signed_user_id is None:
+            signed_user_id = self.__signing_service.sign(self.__generate_id())
+            session[self.__USER_ID_KEY] = signed_user_id
+            self.__refresh_expiry(session)
+        elif session.get_expiry_date() - timezone.now() < timedelta(seconds=settings.SESSION_REFRESH_THRESHOLD_SECONDS):
+            self.__refresh_expiry(session)
+
+        # Modified sessions are saved by the session middleware once the response is ready
+        return self.__signing_service.unsign(signed_user_id)
+
+    def __get_signed_user_id(self, session: SessionBase) -> Optional[str]:
+        signed_user_id = session.get(self.__USER_ID_KEY)
+        return signed_user_id if isinstance(signed_user_id, str) and timezone.now() < session.get_expiry_date() else None
+
+    def __refresh_expiry(self, session: SessionBase) -> None:
+        # The expiry is absolute, so the remaining lifetime is known without saving the session on every request
+        expire_at = timezone.now() + timedelta(seconds=settings.SESSION_COOKIE_AGE)
+        session.set_expiry(expire_at)
+        self.__logger.debug(f"Session will expire at {expire_at.time()} UTC.")
 
     @staticmethod
     def __generate_id() -> str:
@@ -1,8 +1,11 @@
 import asyncio
-import hashlib
-from typing import Annotated, Final, final
+from collections.abc import Sequence
+from io import BytesIO
+from pathlib import Path
+from typing import Annotated, Final, Optional, Union, final
+from uuid import UUID
 
-from aiocache.backends.memory import SimpleMemoryCache
+from django.core.files.uploadedfile import TemporaryUploadedFile
 from django.http import HttpRequest
 from ninja import UploadedFile
 from PIL import Image
@@ -16,23 +19,33 @@ from application.common.abc.validator_abc import ValidatorABC
 from application.common.services.models.file_info import ImageFileInfo
 from application.common.services.session_service_factory import SessionServiceFactory
 from application.converter.commands.schemas.conversion import ConversionRequest, ConversionResponse
+from application.converter.services.abc.image_assets_cleanup_worker_abc import ImageAssetsCleanupWorkerABC
 from application.converter.services.abc.image_file_converter_abc import ImageFileConverterABC
+from application.converter.services.models.conversion import ConvertedImage
 from core.abc.logger_abc import LoggerABC
+from core.abc.tracer_abc import TracerABC
+from core.limiters.stage_limiter import StageLimiter
 from core.result import ContextResult, EnumerableContextResult, as_awaitable_enumerable_result, as_awaitable_result
 from core.types import Pair
+from core.utils import DigestUtils
 from domain.common.models import ImageAssetFile
 from domain.converter.models import ConverterConvertedImageAssetFile, ConverterOriginalImageAssetFile
 from infrastructure.abc.converter_image_assets_repository_abc import ConverterImageAssetsRepositoryABC
 from infrastructure.abc.files_repository_abc import FilesRepositoryABC
 from infrastructure.repositories.converter_files.converter_files_repository import ConverterFilesRepository
 from infrastructure.repositories.converter_files.models import UploadFileParams
-from infrastructure.repositories.converter_image_assets.models import CreateAssetFileParams
+from infrastructure.repositories.converter_image_assets.models import CreateAssetFileParams, CreateConverterAssetFileParams
+
+type _AssetFileParamsPair = Pair[
+    CreateAssetFileParams[ConverterOriginalImageAssetFile],
+    CreateAssetFileParams[ConverterConvertedImageAssetFile],
+]
+# Asset files of a processed image with the quality its converted image was encoded with
+type _ProcessedImage = Pair[_AssetFileParamsPair, int]
 
 
 @final
 class ConvertImagesCommand:
-    __CACHE: Final[SimpleMemoryCache] = SimpleMemoryCache()
-
     def __init__(
         self,
         session_service_factory: SessionServiceFactory,
@@ -42,6 +55,9 @@ class ConvertImagesCommand:
         image_file_service: ImageFileServiceABC,
         filename_service: FilenameServiceABC,
         converter_repo: ConverterImageAssetsRepositoryABC,
+        assets_cleanup_worker: ImageAssetsCleanupWorkerABC,
+        stage_limiter: StageLimiter,
+        tracer: TracerABC,
         logger: LoggerABC,
     ) -> None:
         self.__session_service_factory: Final[SessionServiceFactory] = session_service_factory
@@ -51,6 +67,9 @@ class ConvertImagesCommand:
         self.__filename_service: Final[FilenameServiceABC] = filename_service
         self.__image_converter: Final[ImageFileConverterABC] = image_converter
         self.__converter_repo: Final[ConverterImageAssetsRepositoryABC] = converter_repo
+        self.__assets_cleanup_worker: Final[ImageAssetsCleanupWorkerABC] = assets_cleanup_worker
+        self.__stage_limiter: Final[StageLimiter] = stage_limiter
+        self.__tracer: Final[TracerABC] = tracer
         self.__logger: Final[LoggerABC] = logger
 
     @as_awaitable_enumerable_result
@@ -60,15 +79,13 @@ class ConvertImagesCommand:
         request: ConversionRequest,
     ) -> EnumerableContextResult[ConversionResponse]:
         return await (
-            self.__conversion_request_validator.validate(request)
-            .abind(lambda _: self.__session_service_factory.create(http_request).aget_user_id())
+            self.__validate(request)
+            .abind(lambda _: self.__tracer.atrace("session", self.__session_service_factory.create(http_request).aget_user_id()))
             .abind_many(
-                lambda user_id: self.__aget_cache(user_id, request).aif_empty(
-                    self.__acleanup_previous_assets(user_id)
-                    .abind(lambda _: self.__converter_repo.aget_or_create_asset(user_id))
-                    .map(lambda _: (self.__aprocess(user_id, uploaded_file, request.options) for uploaded_file in request.files))
-                    .amap(lambda results: asyncio.gather(*results))
-                    .abind_many(lambda results: self.__set_cache(user_id, request, results))
+                lambda user_id: (
+                    self.__tracer.atrace("cleanup", self.__areplace_asset(user_id))
+                    .amap(lambda asset_id: self.__aprocess_files(user_id, asset_id, request))
+                    .bind_many(EnumerableContextResult[ConversionResponse].from_results)
                     .tap_either(
                         lambda values: self.__logger.info(f"Successfully converted {values.count()} image(s) for User '{user_id}'"),
                         lambda errors: self.__logger.error(f"Failed to convert images for User '{user_id}'"),
@@ -77,57 +94,82 @@ class ConvertImagesCommand:
             )
         )
 
-    @as_awaitable_result
-    async def __acleanup_previous_assets(self, user_id: str) -> ContextResult[None]:
-        asset_exists_result = await self.__converter_repo.aasset_exists(user_id)
-
-        if asset_exists_result.is_error():
-            return ContextResult[None].failure(asset_exists_result.error)
+    def __validate(self, request: ConversionRequest) -> ContextResult[ConversionRequest]:
+        with self.__tracer.span("validate"):
+            return self.__conversion_request_validator.validate(request)
 
-        if asset_exists_result.ok is False:
-            return ContextResult[None].success(None)
-
-        results = await asyncio.gather(
-            self.__converter_repo.adelete_asset(user_id),
-            self.__converter_files_repo.adelete_files(user_id, "original"),
-            self.__converter_files_repo.adelete_files(user_id, "converted"),
+    @as_awaitable_result
+    async def __areplace_asset(self, user_id: str) -> ContextResult[UUID]:
+        # Records of the previous asset are replaced synchronously. Its remote files are deleted by the cleanup worker,
+        # and new files are uploaded to the folder of the new asset, so they are never affected by the deletion
+        return await self.__converter_repo.areplace_asset(user_id).abind(
+            lambda asset: self.__assets_cleanup_worker.aschedule(user_id).map(lambda _: asset.id)
         )
 
-        return (
-            EnumerableContextResult[None]
-            .from_results(results)
-            .where(lambda result: result.is_error())
-            .first2(ContextResult[None].success(None))
-        )
+    async def __aprocess_files(self, user_id: str, asset_id: UUID, request: ConversionRequest) -> list[ContextResult[ConversionResponse]]:
+        results = await asyncio.gather(*(self.__aprocess(user_id, asset_id, file, request.options) for file in request.files))
+        return await self.__apersist(user_id, asset_id, results)
 
     @as_awaitable_result
     async def __aprocess(
         self,
         user_id: str,
+        asset_id: UUID,
         uploaded_file: UploadedFile,
         options: ConversionRequest.Options,
-    ) -> ContextResult[ConversionResponse]:
-        with Image.open(uploaded_file) as image_file:
-            return await (
-                self.__image_file_service.verify_integrity(image_file)
-                .bind(lambda file: self.__image_file_service.set_filename(file, uploaded_file.name))
-                .abind(lambda file: self.__aget_original(user_id, file).amap2(self.__aconvert(user_id, file, options), self.__to_response))
-            )
+    ) -> ContextResult[_ProcessedImage]:
+        # Files wait for a slot before each stage, so uploads of the first files overlap conversions of the next ones.
+        # The pipeline slot is held until both uploads finish, and the params kept for persistence carry no content,
+        # so the number of contents held in memory by the process is bounded by the slots of the whole pipeline
+        async with self.__stage_limiter.aslot("pipeline"):
+            # The uploaded content is read once and passed through untouched. Both the original and the converted images
+            # are described from their parsed headers, so pixel data is decoded only by the conversion itself
+            uploaded_file.seek(0)
+            content = uploaded_file.read()
+            content_hash = DigestUtils.get_sha256(uploaded_file, content)
+            # Files that are already written to the disk by the upload handler are uploaded from there
+            upload_content = Path(uploaded_file.temporary_file_path()) if isinstance(uploaded_file, TemporaryUploadedFile) else content
+
+            with BytesIO(content) as buffered_file, Image.open(buffered_file) as image_file:
+                return await self.__averify(image_file, uploaded_file.name, len(content)).abind(
+                    lambda file: self.__aget_original(user_id, asset_id, file, content, upload_content).azip(
+                        self.__aconvert(user_id, asset_id, file, content, content_hash, options),
+                        lambda original, converted: Pair(Pair(original, converted.item1), converted.item2),
+                    )
+                )
+
+    @as_awaitable_result
+    async def __averify(self, file: ImageFile, filename: Optional[str], size: int) -> ContextResult[ImageFile]:
+        async with self.__stage_limiter.aslot("decode"):
+            return await asyncio.to_thread(self.__verify, file, filename, size)
+
+    def __verify(self, file: ImageFile, filename: Optional[str], size: int) -> ContextResult[ImageFile]:
+        with self.__tracer.span("decode") as span:
+            span.add_bytes(size)
+            return self.__image_file_service.set_filename(file, filename).bind(self.__image_file_service.verify_integrity)
 
     @as_awaitable_result
-    async def __aget_original(self, user_id: str, file: ImageFile) -> ContextResult[ConverterOriginalImageAssetFile]:
+    async def __aget_original(
+        self,
+        user_id: str,
+        asset_id: UUID,
+        file: ImageFile,
+        content: bytes,
+        upload_content: Union[bytes, Path],
+    ) -> ContextResult[CreateAssetFileParams[ConverterOriginalImageAssetFile]]:
         return await (
-            self.__image_file_service.get_info(file)
-            .abind(lambda file_info: self.__aupload(user_id, "original", file_info).map(lambda url: (url, file_info)))
-            .map(Pair[HttpUrl, ImageFileInfo].from_tuple)
+            self.__image_file_service.get_info(file, content)
             .abind(
-                lambda pair: self.__converter_repo.aget_or_create_asset_file(
-                    user_id,
-                    params=CreateAssetFileParams(
-                        file_url=str(pair.item1),
-                        file_info=pair.item2,
-                        file_type=ConverterOriginalImageAssetFile,
-                    ),
+                lambda file_info: self.__aupload(user_id, f"{asset_id}/original", file_info, upload_content).map(
+                    lambda url: (url, file_info)
+                )
+            )
+            .map(Pair[HttpUrl, ImageFileInfo].from_tuple)
+            .map(
+                lambda pair: CreateAssetFileParams(
+                    file_url=str(pair.item1),
+                    file_info=self.__release_content(pair.item2),
+                    file_type=ConverterOriginalImageAssetFile,
                 )
             )
         )
@@ -136,45 +178,108 @@ class ConvertImagesCommand:
     async def __aconvert(
         self,
         user_id: str,
+        asset_id: UUID,
         file: ImageFile,
+        content: bytes,
+        content_hash: str,
         options: ConversionRequest.Options,
-    ) -> ContextResult[ConverterConvertedImageAssetFile]:
+    ) -> ContextResult[Pair[CreateAssetFileParams[ConverterConvertedImageAssetFile], int]]:
         return await (
-            self.__image_converter.aconvert(file, options)
-            .bind(self.__image_file_service.get_info)
-            .abind(lambda file_info: self.__aupload(user_id, "converted", file_info).map(lambda url: (url, file_info)))
-            .map(Pair[HttpUrl, ImageFileInfo].from_tuple)
+            self.__aconvert_content(file, content, content_hash, options)
             .abind(
-                lambda pair: self.__converter_repo.aget_or_create_asset_file(
+                lambda converted: self.__aupload(
                     user_id,
-                    params=CreateAssetFileParams(
+                    f"{asset_id}/converted",
+                    converted.file_info,
+                    converted.file_info.file_details.content,
+                ).map(lambda url: (url, converted))
+            )
+            .map(Pair[HttpUrl, ConvertedImage].from_tuple)
+            .map(
+                lambda pair: Pair(
+                    CreateAssetFileParams(
                         file_url=str(pair.item1),
-                        file_info=pair.item2,
+                        file_info=self.__release_content(pair.item2.file_info),
                         file_type=ConverterConvertedImageAssetFile,
                     ),
+                    pair.item2.quality,
                 )
             )
         )
 
     @as_awaitable_result
-    async def __aupload(self, user_id: str, relative_folder_path: str, file_info: ImageFileInfo) -> ContextResult[HttpUrl]:
-        return await self.__converter_files_repo.aupload_file(
-            user_id,
-            params=UploadFileParams(
-                content=file_info.file_details.content,
-                basename=file_info.filename_details.basename,
-                relative_folder_path=relative_folder_path,
-            ),
+    async def __aconvert_content(
+        self,
+        file: ImageFile,
+        content: bytes,
+        content_hash: str,
+        options: ConversionRequest.Options,
+    ) -> ContextResult[ConvertedImage]:
+        async with self.__stage_limiter.aslot("convert"):
+            return await self.__tracer.atrace(
+                "convert",
+                self.__image_converter.aconvert(file, content, content_hash, options),
+                measure=lambda converted: converted.file_info.file_details.size,
+            )
+
+    async def __apersist(
+        self,
+        user_id: str,
+        asset_id: UUID,
+        results: list[ContextResult[_ProcessedImage]],
+    ) -> list[ContextResult[ConversionResponse]]:
+        # Asset files of all the processed images are stored at once, attached to the asset their files were uploaded for
+        params: list[CreateConverterAssetFileParams] = (
+            Enumerable(results)
+            .where(lambda result: result.is_ok())
+            .select_many(lambda result: (result.ok.item1.item1, result.ok.item1.item2))
+            .to_list()
         )
 
-    def __to_response(
+        if len(params) == 0:
+            return [ContextResult[ConversionResponse].failure(result.error) for result in results]
+
+        async with self.__stage_limiter.aslot("persist"):
+            with self.__tracer.span("persist"):
+                asset_files_result = await self.__converter_repo.abulk_create_asset_files(user_id, asset_id, params=params)
+
+        if asset_files_result.is_error():
+            return [ContextResult[ConversionResponse].failure(asset_files_result.error)]
+
+        asset_file_pairs = iter(Enumerable(asset_files_result.ok).chunk(2))
+
+        return [result.map(lambda processed_image: self.__to_response(next(asset_file_pairs), processed_image.item2)) for result in results]
+
+    @as_awaitable_result
+    async def __aupload(
         self,
-        original_asset_file: ConverterOriginalImageAssetFile,
-        converted_asset_file: ConverterConvertedImageAssetFile,
-    ) -> ConversionResponse:
-        original_image_data = self.__to_image_data(original_asset_file)
-        converted_image_data = self.__to_image_data(converted_asset_file)
-        return ConversionResponse.create(original_image_data, converted_image_data)
+        user_id: str,
+        relative_folder_path: str,
+        file_info: ImageFileInfo,
+        content: Union[bytes, Path],
+    ) -> ContextResult[HttpUrl]:
+        async with self.__stage_limiter.aslot("upload"):
+            with self.__tracer.span("upload") as span:
+                span.add_bytes(file_info.file_details.size)
+                return await self.__converter_files_repo.aupload_file(
+                    user_id,
+                    params=UploadFileParams(
+                        content=content,
+                        basename=file_info.filename_details.basename,
+                        relative_folder_path=relative_folder_path,
+                    ),
+                )
+
+    @staticmethod
+    def __release_content(file_info: ImageFileInfo) -> ImageFileInfo:
+        # Uploaded content is not persisted, so it is dropped instead of being held until all the files are processed
+        return file_info.model_copy(update={"file_details": file_info.file_details.model_copy(update={"content": b""})})
+
+    def __to_response(self, asset_files: Sequence[ImageAssetFile], quality: int) -> ConversionResponse:
+        # Asset files are created in the order of their params, the original image first
+        original_image_data = self.__to_image_data(asset_files[0])
+        converted_image_data = self.__to_image_data(asset_files[1])
+        return ConversionResponse.create(original_image_data, converted_image_data, quality)
 
     @staticmethod
     def __to_image_data(asset_file: ImageAssetFile) -> ConversionResponse.ImageData:
@@ -193,25 +298,3 @@ class ConvertImagesCommand:
             color_mode=asset_file.color_mode,
             exif_data=asset_file.exif_data,
         )
-
-    @as_awaitable_enumerable_result
-    async def __aget_cache(self, user_id: str, request: ConversionRequest) -> EnumerableContextResult[ConversionResponse]:
-        results = await self.__CACHE.get(self.__get_cache_key(user_id, request))
-        return results or EnumerableContextResult[ConversionResponse].empty()
-
-    @as_awaitable_enumerable_result
-    async def __set_cache(
-        self,
-        user_id: str,
-        request: ConversionRequest,
-        results: list[ContextResult[ConversionResponse]],
-    ) -> EnumerableContextResult[ConversionResponse]:
-        values = EnumerableContextResult[ConversionResponse].from_results(results)
-        await self.__CACHE.set(self.__get_cache_key(user_id, request), values)
-        return values
-
-    @staticmethod
-    def __get_cache_key(user_id: str, request: ConversionRequest) -> str:
-        hasher = hashlib.sha256()
-        Enumerable(request.files).select_many(lambda file: file.chunks()).as_more().for_each(hasher.update)
-        return f"{user_id}-{request.options.quality}-{request.options.output_format}-{hasher.hexdigest()}"
@@ -1,6 +1,6 @@
 from decimal import Decimal
 from enum import StrEnum
-from typing import Self
+from typing import Optional, Self
 from uuid import UUID
 
 from ninja import Schema, UploadedFile
@@ -15,7 +15,18 @@ class ConversionRequest(Schema):
     class Options(Schema):
         model_config = ConfigDict(frozen=True, strict=True, extra="forbid")
         output_format: "OutputFormats"
+        # The highest quality to use when a target is set. The lowest quality that meets the target is chosen
         quality: int
+        target_size_bytes: Optional[int] = None
+        target_ssim: Optional[float] = None
+        # Images are only ever downscaled, keeping their aspect ratio, to the smallest size the options allow
+        max_width: Optional[int] = None
+        max_height: Optional[int] = None
+        scale: Optional[float] = None
+
+        @property
+        def is_adaptive(self) -> bool:
+            return self.target_size_bytes is not None or self.target_ssim is not None
 
         class OutputFormats(StrEnum):
             JPEG = "JPEG"
@@ -27,8 +38,27 @@ class ConversionRequest(Schema):
             ICO = "ICO"
 
     @classmethod
-    def create(cls, files: list[UploadedFile], output_format: Options.OutputFormats, quality: int) -> Self:
-        return cls(files=files, options=cls.Options(output_format=output_format, quality=quality))
+    def create(
+        cls,
+        files: list[UploadedFile],
+        output_format: Options.OutputFormats,
+        quality: int,
+        target_size_bytes: Optional[int] = None,
+        target_ssim: Optional[float] = None,
+        max_width: Optional[int] = None,
+        max_height: Optional[int] = None,
+        scale: Optional[float] = None,
+    ) -> Self:
+        options = cls.Options(
+            output_format=output_format,
+            quality=quality,
+            target_size_bytes=target_size_bytes,
+            target_ssim=target_ssim,
+            max_width=max_width,
+            max_height=max_height,
+            scale=scale,
+        )
+        return cls(files=files, options=options)
 
 
 class ConversionResponse(Schema):
@@ -36,10 +66,11 @@ class ConversionResponse(Schema):
 
     original_image_data: "ImageData"
     converted_image_data: "ImageData"
+    quality: int
 
     @classmethod
-    def create(cls, original_image_data: "ImageData", converted_image_data: "ImageData") -> Self:
-        return cls(original_image_data=original_image_data, converted_image_data=converted_image_data)
+    def create(cls, original_image_data: "ImageData", converted_image_data: "ImageData", quality: int) -> Self:
+        return cls(original_image_data=original_image_data, converted_image_data=converted_image_data, quality=quality)
 
     class ImageData(Schema):
         model_config = ConfigDict(frozen=True, strict=True, extra="forbid")
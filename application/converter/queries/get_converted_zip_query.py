@@ -1,32 +1,80 @@
+import hashlib
+from datetime import timedelta
 from typing import Annotated, Final, final
+from uuid import UUID
 
 from django.http import HttpRequest
+from django.utils import timezone
 
 from application.common.services.session_service_factory import SessionServiceFactory
 from application.converter.commands.schemas.download import GetZipResponse
+from core.abc.logger_abc import LoggerABC
 from core.result.context_result import ContextResult, as_awaitable_result
+from domain.converter.models import ConverterImageAsset
 from infrastructure.abc.converter_image_assets_repository_abc import ConverterImageAssetsRepositoryABC
 from infrastructure.abc.files_repository_abc import FilesRepositoryABC
 from infrastructure.repositories.converter_files.converter_files_repository import ConverterFilesRepository
+from infrastructure.repositories.converter_image_assets.models import ConvertedZipArchive
 
 
 @final
 class GetConvertedZipQuery:
+    # An archive that expires sooner is rebuilt, so the returned URL stays usable for the download
+    __MIN_REMAINING_LIFETIME: Final[timedelta] = timedelta(minutes=5)
+
     def __init__(
         self,
         session_service_factory: SessionServiceFactory,
         converter_files_repo: Annotated[FilesRepositoryABC, ConverterFilesRepository.__name__],
         converter_repo: ConverterImageAssetsRepositoryABC,
+        logger: LoggerABC,
     ) -> None:
         self.__session_service_factory: Final[SessionServiceFactory] = session_service_factory
         self.__converter_files_repo: Final[Annotated[FilesRepositoryABC, ConverterFilesRepository.__name__]] = converter_files_repo
         self.__converter_repo: Final[ConverterImageAssetsRepositoryABC] = converter_repo
+        self.__logger: Final[LoggerABC] = logger
 
     @as_awaitable_result
     async def ahandle(self, http_request: HttpRequest) -> ContextResult[GetZipResponse]:
         return await (
             self.__session_service_factory.create(http_request)
             .aget_user_id()
-            .abind(lambda user_id: self.__converter_files_repo.azip_folder(user_id, "converted"))
-            .map(lambda zip_url: GetZipResponse(zip_url=str(zip_url)))
+            .abind(
+                lambda user_id: self.__converter_repo.aget_asset(user_id).abind(
+                    lambda asset: self.__converter_repo.aget_converted_asset_file_ids(user_id).abind(
+                        lambda asset_file_ids: self.__aget_zip_archive(user_id, asset, self.__get_fingerprint(asset_file_ids))
+                    )
+                )
+            )
+            .map(lambda zip_archive: GetZipResponse(zip_url=str(zip_archive.url)))
+        )
+
+    @as_awaitable_result
+    async def __aget_zip_archive(self, user_id: str, asset: ConverterImageAsset, fingerprint: str) -> ContextResult[ConvertedZipArchive]:
+        cached_zip_archive = await self.__converter_repo.aget_zip_archive(user_id)
+        if cached_zip_archive.is_ok() and self.__is_reusable(cached_zip_archive.ok, fingerprint):
+            self.__logger.debug(f"Reused zip archive of User '{user_id}' expiring at {cached_zip_archive.ok.expires_at}")
+            return cached_zip_archive
+
+        return await (
+            self.__converter_files_repo.azip_folder(user_id, f"{asset.id}/converted")
+            .map(lambda zip_archive: ConvertedZipArchive(fingerprint=fingerprint, url=zip_archive.url, expires_at=zip_archive.expires_at))
+            .abind(lambda zip_archive: self.__asave_zip_archive(user_id, asset.id, zip_archive))
         )
+
+    @as_awaitable_result
+    async def __asave_zip_archive(
+        self, user_id: str, asset_id: UUID, zip_archive: ConvertedZipArchive
+    ) -> ContextResult[ConvertedZipArchive]:
+        # The archive is usable even if it cannot be memoized, so the failure is only logged
+        result = await self.__converter_repo.asave_zip_archive(user_id, asset_id, zip_archive=zip_archive)
+        if result.is_error():
+            self.__logger.error(f"Unable to memoize zip archive of User '{user_id}': {result.error.message}")
+        return ContextResult[ConvertedZipArchive].success(zip_archive)
+
+    def __is_reusable(self, zip_archive: ConvertedZipArchive, fingerprint: str) -> bool:
+        return zip_archive.fingerprint == fingerprint and zip_archive.expires_at - timezone.now() > self.__MIN_REMAINING_LIFETIME
+
+    @staticmethod
+    def __get_fingerprint(asset_file_ids: list[UUID]) -> str:
+        return hashlib.sha256(",".join(str(asset_file_id) for asset_file_id in sorted(asset_file_ids)).encode()).hexdigest()
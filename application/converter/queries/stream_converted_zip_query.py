@@ -0,0 +1,82 @@
+import asyncio
+import itertools
+from collections import deque
+from typing import Annotated, AsyncIterator, Final, Iterator, final
+
+from django.http import HttpRequest
+
+from application.common.services.session_service_factory import SessionServiceFactory
+from core.abc.logger_abc import LoggerABC
+from core.archives.stored_zip_stream import StoredZipStream
+from core.result import ContextResult, ErrorContext, as_awaitable_result
+from core.types import Pair
+from domain.converter.models import ConverterConvertedImageAssetFile
+from infrastructure.abc.converter_image_assets_repository_abc import ConverterImageAssetsRepositoryABC
+from infrastructure.abc.files_repository_abc import FilesRepositoryABC
+from infrastructure.repositories.converter_files.converter_files_repository import ConverterFilesRepository
+
+type _Download = Pair[str, asyncio.Future[ContextResult[bytes]]]
+
+
+@final
+class StreamConvertedZipQuery:
+    __MAX_PREFETCHED_FILES: Final[int] = 4
+
+    def __init__(
+        self,
+        session_service_factory: SessionServiceFactory,
+        converter_files_repo: Annotated[FilesRepositoryABC, ConverterFilesRepository.__name__],
+        converter_repo: ConverterImageAssetsRepositoryABC,
+        logger: LoggerABC,
+    ) -> None:
+        self.__session_service_factory: Final[SessionServiceFactory] = session_service_factory
+        self.__converter_files_repo: Final[Annotated[FilesRepositoryABC, ConverterFilesRepository.__name__]] = converter_files_repo
+        self.__converter_repo: Final[ConverterImageAssetsRepositoryABC] = converter_repo
+        self.__logger: Final[LoggerABC] = logger
+
+    @as_awaitable_result
+    async def ahandle(self, http_request: HttpRequest) -> ContextResult[AsyncIterator[bytes]]:
+        return await (
+            self.__session_service_factory.create(http_request)
+            .aget_user_id()
+            .abind(self.__converter_repo.aget_converted_asset_files)
+            .filter_with(lambda asset_files: len(asset_files) > 0, lambda _: ErrorContext.not_found("No converted images found"))
+            .map(lambda asset_files: StoredZipStream.aiter(self.__aiter_entries(asset_files)))
+        )
+
+    async def __aiter_entries(self, asset_files: list[ConverterConvertedImageAssetFile]) -> AsyncIterator[Pair[str, bytes]]:
+        # Downloads run ahead of the archive in a bounded window: files are fetched concurrently,
+        # while at most a few of them are held in memory regardless of the number of files
+        pending_asset_files = iter(zip(self.__get_unique_filenames(asset_files), asset_files, strict=True))
+        downloads: deque[_Download] = deque(
+            self.__start_download(*pending_asset_file)
+            for pending_asset_file in itertools.islice(pending_asset_files, self.__MAX_PREFETCHED_FILES)
+        )
+        try:
+            while len(downloads) > 0:
+                download = downloads.popleft()
+                result = await download.item2
+
+                next_asset_file = next(pending_asset_files, None)
+                if next_asset_file is not None:
+                    downloads.append(self.__start_download(*next_asset_file))
+
+                if result.is_ok():
+                    yield Pair(download.item1, result.ok)
+                else:
+                    self.__logger.error(f"Skipped '{download.item1}' in the zip of converted images. {result.error}")
+        finally:
+            for download in downloads:
+                download.item2.cancel()
+
+    def __start_download(self, filename: str, asset_file: ConverterConvertedImageAssetFile) -> _Download:
+        return Pair(filename, asyncio.ensure_future(self.__converter_files_repo.adownload_file(asset_file.file_url)))
+
+    @staticmethod
+    def __get_unique_filenames(asset_files: list[ConverterConvertedImageAssetFile]) -> Iterator[str]:
+        # Archive entries must be unique, while different uploads may have been converted to the same filename
+        seen: dict[str, int] = {}
+        for asset_file in asset_files:
+            count = seen.get(asset_file.filename, 0)
+            seen[asset_file.filename] = count + 1
+            yield asset_file.filename if count == 0 else f"{count}_{asset_file.filename}"
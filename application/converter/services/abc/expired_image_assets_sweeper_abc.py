@@ -0,0 +1,10 @@
+from abc import ABC, abstractmethod
+
+from application.converter.services.models.cleanup import SweepMetrics
+from core.result import ContextResult, as_awaitable_result
+
+
+class ExpiredImageAssetsSweeperABC(ABC):
+    @abstractmethod
+    @as_awaitable_result
+    async def asweep(self) -> ContextResult[SweepMetrics]: ...
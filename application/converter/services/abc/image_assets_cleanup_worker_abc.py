@@ -0,0 +1,20 @@
+from abc import ABC, abstractmethod
+
+from application.converter.services.models.cleanup import CleanupStats
+from core.result import ContextResult, as_awaitable_result
+
+
+class ImageAssetsCleanupWorkerABC(ABC):
+    @abstractmethod
+    async def astart(self) -> None: ...
+
+    @abstractmethod
+    async def aclose(self) -> None: ...
+
+    @abstractmethod
+    @as_awaitable_result
+    async def aschedule(self, user_id: str) -> ContextResult[None]: ...
+
+    @abstractmethod
+    @as_awaitable_result
+    async def adrain(self) -> ContextResult[CleanupStats]: ...
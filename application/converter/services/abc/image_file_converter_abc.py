@@ -3,10 +3,17 @@ from abc import ABC, abstractmethod
 from PIL.ImageFile import ImageFile
 
 from application.converter.commands.schemas.conversion import ConversionRequest
+from application.converter.services.models.conversion import ConvertedImage
 from core.result import ContextResult, as_awaitable_result
 
 
 class ImageFileConverterABC(ABC):
     @abstractmethod
     @as_awaitable_result
-    async def aconvert(self, file: ImageFile, options: ConversionRequest.Options) -> ContextResult[ImageFile]: ...
+    async def aconvert(
+        self,
+        file: ImageFile,
+        content: bytes,
+        content_hash: str,
+        options: ConversionRequest.Options,
+    ) -> ContextResult[ConvertedImage]: ...
@@ -0,0 +1,63 @@
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Final, final
+
+from application.converter.services.abc.expired_image_assets_sweeper_abc import ExpiredImageAssetsSweeperABC
+from application.converter.services.abc.image_assets_cleanup_worker_abc import ImageAssetsCleanupWorkerABC
+from application.converter.services.models.cleanup import CleanupStats, SweepMetrics
+from core.abc.logger_abc import LoggerABC
+from core.result import ContextResult, as_awaitable_result
+from infrastructure.abc.converter_image_assets_repository_abc import ConverterImageAssetsRepositoryABC
+
+
+@final
+class ExpiredImageAssetsSweeper(ExpiredImageAssetsSweeperABC):
+    __BATCH_SIZE: Final[int] = 500
+
+    def __init__(
+        self,
+        max_age: timedelta,
+        converter_repo: ConverterImageAssetsRepositoryABC,
+        assets_cleanup_worker: ImageAssetsCleanupWorkerABC,
+        logger: LoggerABC,
+    ) -> None:
+        self.__max_age: Final[timedelta] = max_age
+        self.__converter_repo: Final[ConverterImageAssetsRepositoryABC] = converter_repo
+        self.__assets_cleanup_worker: Final[ImageAssetsCleanupWorkerABC] = assets_cleanup_worker
+        self.__logger: Final[LoggerABC] = logger
+
+    @as_awaitable_result
+    async def asweep(self) -> ContextResult[SweepMetrics]:
+        started_at = time.perf_counter()
+        return await self.__atombstone_expired_assets(datetime.now(timezone.utc) - self.__max_age).abind(
+            lambda expired_assets: self.__assets_cleanup_worker.adrain().map(
+                lambda stats: self.__to_metrics(expired_assets, stats, time.perf_counter() - started_at)
+            )
+        )
+
+    @as_awaitable_result
+    async def __atombstone_expired_assets(self, created_before: datetime) -> ContextResult[int]:
+        # Records are removed in bounded transactions first, so the remote deletions that follow are picked up
+        # by the cleanup worker even if the sweep is interrupted
+        expired_assets = 0
+        while True:
+            result = await self.__converter_repo.atombstone_expired_assets(created_before=created_before, limit=self.__BATCH_SIZE)
+            if result.is_error():
+                return ContextResult[int].failure(result.error)
+
+            expired_assets += result.ok
+            if result.ok < self.__BATCH_SIZE:
+                return ContextResult[int].success(expired_assets)
+
+    def __to_metrics(self, expired_assets: int, stats: CleanupStats, elapsed_seconds: float) -> SweepMetrics:
+        metrics = SweepMetrics(
+            expired_assets=expired_assets,
+            cleaned_folders=stats.cleaned,
+            failed_folders=stats.failed,
+            elapsed_seconds=elapsed_seconds,
+        )
+        self.__logger.info(
+            f"Swept {metrics.expired_assets} expired Converter Image Asset(s) in {metrics.elapsed_seconds:.2f}s "
+            f"({metrics.assets_per_second:.1f}/s). Deleted {metrics.cleaned_folders} folder(s), {metrics.failed_folders} failed"
+        )
+        return metrics
@@ -0,0 +1,135 @@
+import asyncio
+import contextlib
+from datetime import timedelta
+from enum import StrEnum
+from typing import Annotated, Final, Optional, final
+
+from application.converter.services.abc.image_assets_cleanup_worker_abc import ImageAssetsCleanupWorkerABC
+from application.converter.services.models.cleanup import CleanupStats
+from core.abc.logger_abc import LoggerABC
+from core.limiters.rate_limiter import RateLimiter
+from core.result import ContextResult, ErrorContext, as_awaitable_result
+from infrastructure.abc.converter_image_assets_repository_abc import ConverterImageAssetsRepositoryABC
+from infrastructure.abc.files_repository_abc import FilesRepositoryABC
+from infrastructure.repositories.converter_files.converter_files_repository import ConverterFilesRepository
+from infrastructure.repositories.converter_image_assets.models import ImageAssetTombstone
+
+
+@final
+class ImageAssetsCleanupWorker(ImageAssetsCleanupWorkerABC):
+    class Mode(StrEnum):
+        DEFERRED = "deferred"
+        INLINE = "inline"
+
+    __BATCH_SIZE: Final[int] = 50
+    __POLL_INTERVAL: Final[timedelta] = timedelta(minutes=1)
+    __BASE_RETRY_DELAY: Final[timedelta] = timedelta(seconds=5)
+    __MAX_RETRY_DELAY: Final[timedelta] = timedelta(hours=1)
+
+    def __init__(
+        self,
+        mode: Mode,
+        converter_repo: ConverterImageAssetsRepositoryABC,
+        converter_files_repo: Annotated[FilesRepositoryABC, ConverterFilesRepository.__name__],
+        max_concurrency: int,
+        max_requests_per_second: float,
+        logger: LoggerABC,
+    ) -> None:
+        self.__mode: Final[ImageAssetsCleanupWorker.Mode] = mode
+        self.__converter_repo: Final[ConverterImageAssetsRepositoryABC] = converter_repo
+        self.__converter_files_repo: Final[Annotated[FilesRepositoryABC, ConverterFilesRepository.__name__]] = converter_files_repo
+        self.__logger: Final[LoggerABC] = logger
+        # Remote deletions share the connection pool and the API rate limit with the requests
+        self.__semaphore: Final[asyncio.Semaphore] = asyncio.Semaphore(max_concurrency)
+        self.__rate_limiter: Final[RateLimiter] = RateLimiter(max_requests_per_second)
+        self.__task: Optional[asyncio.Task[None]] = None
+        self.__wakeup: Optional[asyncio.Event] = None
+
+    async def astart(self) -> None:
+        if self.__mode is ImageAssetsCleanupWorker.Mode.DEFERRED:
+            self.__ensure_started()
+
+    async def aclose(self) -> None:
+        task, self.__task, self.__wakeup = self.__task, None, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    @as_awaitable_result
+    async def aschedule(self, user_id: str) -> ContextResult[None]:
+        match self.__mode:
+            case ImageAssetsCleanupWorker.Mode.INLINE:
+                return await self.__acleanup_batch(user_id).bind(
+                    lambda stats: (
+                        ContextResult[None].failure(ErrorContext.server_error("Unable to delete previous image files"))
+                        if stats.failed > 0
+                        else ContextResult[None].success(None)
+                    )
+                )
+            case ImageAssetsCleanupWorker.Mode.DEFERRED:
+                # Tombstones are durable, so the request does not wait for the remote deletion
+                self.__ensure_started().set()
+                return ContextResult[None].success(None)
+
+    @as_awaitable_result
+    async def adrain(self) -> ContextResult[CleanupStats]:
+        cleaned, failed = 0, 0
+        while True:
+            result = await self.__acleanup_batch(None)
+            if result.is_error():
+                return ContextResult[CleanupStats].failure(result.error)
+
+            cleaned, failed = cleaned + result.ok.cleaned, failed + result.ok.failed
+            # Failed tombstones are rescheduled, so a batch that cleaned nothing means that nothing is due anymore
+            if result.ok.cleaned + result.ok.failed < self.__BATCH_SIZE or result.ok.cleaned == 0:
+                return ContextResult[CleanupStats].success(CleanupStats(cleaned=cleaned, failed=failed))
+
+    def __ensure_started(self) -> asyncio.Event:
+        # Servers that do not send lifespan events start the worker with the first scheduled cleanup
+        if self.__task is None or self.__task.done() or self.__wakeup is None:
+            self.__wakeup = asyncio.Event()
+            self.__task = asyncio.create_task(self.__arun(self.__wakeup), name=ImageAssetsCleanupWorker.__name__)
+        return self.__wakeup
+
+    async def __arun(self, wakeup: asyncio.Event) -> None:
+        while True:
+            try:
+                result = await self.__acleanup_batch(None)
+                if result.is_ok() and result.ok.failed == 0 and result.ok.cleaned == self.__BATCH_SIZE:
+                    continue
+            except Exception as exception:
+                self.__logger.exception(exception, "Image assets cleanup has failed")
+
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(wakeup.wait(), timeout=self.__POLL_INTERVAL.total_seconds())
+            wakeup.clear()
+
+    @as_awaitable_result
+    async def __acleanup_batch(self, user_id: Optional[str]) -> ContextResult[CleanupStats]:
+        tombstones_result = await self.__converter_repo.aget_due_tombstones(user_id=user_id, limit=self.__BATCH_SIZE)
+
+        if tombstones_result.is_error():
+            return ContextResult[CleanupStats].failure(tombstones_result.error)
+
+        results = await asyncio.gather(*(self.__acleanup(tombstone) for tombstone in tombstones_result.ok))
+        failed = sum(1 for result in results if result.is_error())
+
+        return ContextResult[CleanupStats].success(CleanupStats(cleaned=len(results) - failed, failed=failed))
+
+    @as_awaitable_result
+    async def __acleanup(self, tombstone: ImageAssetTombstone) -> ContextResult[None]:
+        async with self.__semaphore:
+            await self.__rate_limiter.aacquire()
+            delete_result = await self.__converter_files_repo.adelete_files(tombstone.user_id, str(tombstone.asset_id))
+
+        if delete_result.is_ok():
+            return await self.__converter_repo.adelete_tombstone(tombstone.asset_id)
+
+        delay = min(self.__BASE_RETRY_DELAY * 2**tombstone.attempts, self.__MAX_RETRY_DELAY)
+        self.__logger.error(
+            f"Unable to delete files of Converter Image Asset '{tombstone.asset_id}' for User '{tombstone.user_id}' "
+            f"(attempt {tombstone.attempts + 1}). Retrying in {delay}"
+        )
+        await self.__converter_repo.areschedule_tombstone(tombstone.asset_id, delay=delay, error=str(delete_result.error))
+        return ContextResult[None].failure(delete_result.error)
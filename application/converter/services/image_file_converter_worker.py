@@ -0,0 +1,294 @@
+import math
+from collections.abc import Iterator
+from io import BytesIO
+from typing import Any, Optional, Self, final
+
+from PIL import Image, ImageFile, ImageSequence
+from pydantic import BaseModel, ConfigDict
+
+from application.converter.services.image_similarity import ImageSimilarity
+from core.types import Pair
+from domain.converter.constants import ConverterConstants
+
+# Worker processes do not import the application services, so the flag must be set here as well
+ImageFile.LOAD_TRUNCATED_IMAGES = True
+
+
+@final
+class ImageFileConverterWorker:
+    class Params(BaseModel):
+        model_config = ConfigDict(frozen=True, strict=True, extra="forbid")
+
+        output_format: str
+        quality: int
+        target_size_bytes: Optional[int] = None
+        target_ssim: Optional[float] = None
+        max_width: Optional[int] = None
+        max_height: Optional[int] = None
+        scale: Optional[float] = None
+
+        @classmethod
+        def create(
+            cls,
+            output_format: str,
+            quality: int,
+            target_size_bytes: Optional[int] = None,
+            target_ssim: Optional[float] = None,
+            max_width: Optional[int] = None,
+            max_height: Optional[int] = None,
+            scale: Optional[float] = None,
+        ) -> Self:
+            return cls(
+                output_format=output_format,
+                quality=quality,
+                target_size_bytes=target_size_bytes,
+                target_ssim=target_ssim,
+                max_width=max_width,
+                max_height=max_height,
+                scale=scale,
+            )
+
+    @staticmethod
+    def convert(content: bytes, params: Params) -> bytes:
+        with Image.open(BytesIO(content)) as file:
+            size = ImageFileConverterWorker.__get_target_size(file, params)
+            if ImageFileConverterWorker.__is_animation(file, params):
+                return ImageFileConverterWorker.__convert_animation(file, params, size)
+
+            return ImageFileConverterWorker.__convert_format(ImageFileConverterWorker.__load(file, params, size), params)
+
+    @staticmethod
+    def convert_adaptive(content: bytes, params: Params) -> Pair[int, bytes]:
+        # Returns the chosen quality with the content, which is encoded once at full resolution
+        with Image.open(BytesIO(content)) as file:
+            size = ImageFileConverterWorker.__get_target_size(file, params)
+            if ImageFileConverterWorker.__is_animation(file, params):
+                return Pair(params.quality, ImageFileConverterWorker.__convert_animation(file, params, size))
+
+            image = ImageFileConverterWorker.__load(file, params, size)
+            quality = ImageFileConverterWorker.__search_quality(image, params)
+            return Pair(quality, ImageFileConverterWorker.__convert_format(image, params.model_copy(update={"quality": quality})))
+
+    @staticmethod
+    def __is_animation(file: ImageFile.ImageFile, params: Params) -> bool:
+        return getattr(file, "is_animated", False) and params.output_format in ConverterConstants.ANIMATED_IMAGE_FORMATS
+
+    @staticmethod
+    def __get_target_size(file: ImageFile.ImageFile, params: Params) -> tuple[int, int]:
+        ratio = min(
+            params.scale if params.scale is not None else ConverterConstants.MAX_RESIZE_SCALE,
+            params.max_width / file.width if params.max_width is not None else ConverterConstants.MAX_RESIZE_SCALE,
+            params.max_height / file.height if params.max_height is not None else ConverterConstants.MAX_RESIZE_SCALE,
+            ConverterConstants.MAX_RESIZE_SCALE,
+        )
+        return max(1, round(file.width * ratio)), max(1, round(file.height * ratio))
+
+    @staticmethod
+    def __load(file: ImageFile.ImageFile, params: Params, size: tuple[int, int]) -> Image.Image:
+        if size != file.size:
+            # JPEG images are decoded at up to 1/8 of their size by scaling the DCT coefficients, so the pixels of the
+            # full image are never held in memory. Other decoders ignore the draft and decode the full image
+            file.draft(file.mode, size)
+
+        return ImageFileConverterWorker.__resize(ImageFileConverterWorker.__to_target_mode(file, params), size)
+
+    @staticmethod
+    def __resize(image: Image.Image, size: tuple[int, int]) -> Image.Image:
+        if image.size == size:
+            return image
+        return image.resize(size, Image.Resampling.LANCZOS, reducing_gap=ConverterConstants.RESIZE_REDUCING_GAP)
+
+    @staticmethod
+    def __to_target_mode(file: ImageFile.ImageFile, params: Params) -> Image.Image:
+        source_has_alpha = file.mode == ConverterConstants.RGBA_MODE or file.format in ConverterConstants.ImageFormatsWithAlphaChannel
+        target_has_alpha = params.output_format in ConverterConstants.ImageFormatsWithAlphaChannel
+
+        target_mode = ConverterConstants.RGBA_MODE if target_has_alpha else ConverterConstants.RGB_MODE
+
+        image: Image.Image = file
+
+        # Optimize the color mode conversion
+        if image.mode != target_mode or image.mode == ConverterConstants.PALETTE_MODE:
+            image = image.convert(target_mode)
+        elif source_has_alpha and not target_has_alpha:
+            image = ImageFileConverterWorker.__to_rgb(image)
+
+        return image
+
+    @staticmethod
+    def __search_quality(image: Image.Image, params: Params) -> int:
+        # Trials are encoded from a small sample of the image, and the size of the whole image is estimated from the ratio of the areas
+        trial = ImageFileConverterWorker.__get_trial(image)
+
+        if params.target_size_bytes is not None:
+            area_ratio = (image.width * image.height) / (trial.width * trial.height)
+            return ImageFileConverterWorker.__search_quality_for_size(trial, params, params.target_size_bytes / area_ratio)
+        if params.target_ssim is not None:
+            return ImageFileConverterWorker.__search_quality_for_ssim(trial, params, params.target_ssim)
+        return params.quality
+
+    @staticmethod
+    def __get_trial(image: Image.Image) -> Image.Image:
+        # Tiles are sampled at full resolution instead of downscaling the image, which would average out the noise and
+        # the fine details that the encoded size and the similarity depend on
+        tile_width = min(ConverterConstants.ADAPTIVE_TRIAL_TILE_SIZE, image.width)
+        tile_height = min(ConverterConstants.ADAPTIVE_TRIAL_TILE_SIZE, image.height)
+        columns = min(ConverterConstants.ADAPTIVE_TRIAL_TILES_PER_SIDE, image.width // tile_width)
+        rows = min(ConverterConstants.ADAPTIVE_TRIAL_TILES_PER_SIDE, image.height // tile_height)
+        if columns * tile_width == image.width and rows * tile_height == image.height:
+            return image
+
+        trial = Image.new(image.mode, (columns * tile_width, rows * tile_height))
+        for row in range(rows):
+            for column in range(columns):
+                # Tiles are spread evenly from one edge of the image to the other
+                left = (image.width - tile_width) * column // max(columns - 1, 1)
+                top = (image.height - tile_height) * row // max(rows - 1, 1)
+                tile = image.crop((left, top, left + tile_width, top + tile_height))
+                trial.paste(tile, (column * tile_width, row * tile_height))
+
+        return trial
+
+    @staticmethod
+    def __search_quality_for_size(trial: Image.Image, params: Params, target_size: float) -> int:
+        # The highest quality that fits the size. The minimum quality is used when none fits
+        def fits(quality: int) -> bool:
+            return len(ImageFileConverterWorker.__convert_trial(trial, params, quality)) <= target_size
+
+        low, high = ConverterConstants.MIN_QUALITY, params.quality
+        if fits(high):
+            return high
+        while high - low > ConverterConstants.ADAPTIVE_QUALITY_TOLERANCE:
+            middle = (low + high) // 2
+            low, high = (middle, high) if fits(middle) else (low, middle)
+        return low
+
+    @staticmethod
+    def __search_quality_for_ssim(trial: Image.Image, params: Params, target_ssim: float) -> int:
+        # The lowest quality that is similar enough. The requested quality is used when none is
+        reference = ImageSimilarity.to_luma(trial)
+
+        def is_similar(quality: int) -> bool:
+            with BytesIO(ImageFileConverterWorker.__convert_trial(trial, params, quality)) as buffer, Image.open(buffer) as candidate:
+                return ImageSimilarity.get_ssim(reference, ImageSimilarity.to_luma(candidate)) >= target_ssim
+
+        low, high = ConverterConstants.MIN_QUALITY, params.quality
+        if is_similar(low):
+            return low
+        while high - low > ConverterConstants.ADAPTIVE_QUALITY_TOLERANCE:
+            middle = (low + high) // 2
+            low, high = (low, middle) if is_similar(middle) else (middle, high)
+        return high
+
+    @staticmethod
+    def __convert_trial(trial: Image.Image, params: Params, quality: int) -> bytes:
+        return ImageFileConverterWorker.__convert_format(trial, params.model_copy(update={"quality": quality}))
+
+    @staticmethod
+    def __convert_format(image: Image.Image, params: Params) -> bytes:
+        save_args: dict[str, Any] = {"quality": params.quality, "exif": image.getexif(), "optimize": True}
+
+        if params.output_format == ConverterConstants.ImageFormats.JPEG:
+            if image.mode != ConverterConstants.RGB_MODE:
+                image = image.convert(ConverterConstants.RGB_MODE)
+            save_args.update(
+                {"subsampling": 0 if params.quality >= 95 else 2, "progressive": ImageFileConverterWorker.__is_large_image(image)}
+            )
+        elif params.output_format == ConverterConstants.ImageFormatsWithAlphaChannel.PNG:
+            save_args.update({"compress_level": 6 if ImageFileConverterWorker.__is_large_image(image) else 9})
+        elif params.output_format == ConverterConstants.ImageFormatsWithAlphaChannel.WEBP:
+            save_args.update({"method": 4 if params.quality < 90 else 5, "lossless": params.quality >= 98})
+        elif params.output_format == ConverterConstants.ImageFormats.TIFF:
+            save_args.update({"compression": "jpeg" if image.mode == ConverterConstants.RGB_MODE else "tiff_deflate"})
+
+        with BytesIO() as buffer:
+            image.save(buffer, params.output_format, **save_args)
+            return buffer.getvalue()
+
+    @staticmethod
+    def __convert_animation(file: ImageFile.ImageFile, params: Params, size: tuple[int, int]) -> bytes:
+        # Frames are decoded one at a time while the encoder seeks through the source, instead of being copied up front
+        frame_count: int = getattr(file, "n_frames", 1)
+        if file.width * file.height * frame_count > ConverterConstants.MAX_TOTAL_FRAME_PIXELS:
+            raise ValueError(f"Animation with {frame_count} frames of {file.width}x{file.height} exceeds the pixel budget")
+
+        save_args: dict[str, Any] = {"save_all": True, "loop": file.info.get("loop", 0), "exif": file.getexif()}
+
+        with BytesIO() as buffer:
+            if params.output_format == ConverterConstants.ImageFormatsWithAlphaChannel.WEBP:
+                # The encoder takes the duration of the first frame for all the frames unless a list is given.
+                # Some decoders only read the duration of a frame when it is loaded, and each frame is released right after
+                durations = [ImageFileConverterWorker.__get_duration(frame) for frame in ImageSequence.Iterator(file)]
+                save_args.update(
+                    {
+                        "duration": durations,
+                        "quality": params.quality,
+                        "method": 4 if params.quality < 90 else 5,
+                        "lossless": params.quality >= 98,
+                    }
+                )
+                if size == file.size:
+                    file.save(buffer, params.output_format, **save_args)
+                else:
+                    # The encoder collects the appended frames in a list, so the downscaled frames are held in memory
+                    frames = [
+                        ImageFileConverterWorker.__resize(frame.convert(ConverterConstants.RGBA_MODE), size)
+                        for frame in ImageSequence.Iterator(file)
+                    ]
+                    frames[0].save(buffer, params.output_format, append_images=frames[1:], **save_args)
+            elif file.mode == ConverterConstants.PALETTE_MODE and size == file.size:
+                # Palettes of the source are kept. Frames sharing a palette are written without a local color table
+                file.save(buffer, params.output_format, optimize=True, **save_args)
+            else:
+                frames = ImageFileConverterWorker.__to_palette_frames(file, size)
+                next(frames).save(buffer, params.output_format, append_images=frames, optimize=True, **save_args)
+
+            return buffer.getvalue()
+
+    @staticmethod
+    def __get_duration(frame: Image.Image) -> int:
+        frame.load()
+        return int(frame.info.get("duration", 0))
+
+    @staticmethod
+    def __to_palette_frames(file: ImageFile.ImageFile, size: tuple[int, int]) -> Iterator[Image.Image]:
+        # All the frames are mapped to one palette, which is written once instead of a color table per frame
+        palette = ImageFileConverterWorker.__get_shared_palette(file)
+        for frame in ImageSequence.Iterator(file):
+            rgba_frame = ImageFileConverterWorker.__resize(frame.convert(ConverterConstants.RGBA_MODE), size)
+            palette_frame = rgba_frame.convert(ConverterConstants.RGB_MODE).quantize(palette=palette, dither=Image.Dither.NONE)
+            # Pixels that are mostly transparent are mapped to the index reserved for transparency
+            transparency_mask = rgba_frame.getchannel("A").point([255] * 128 + [0] * 128, mode="1")
+            palette_frame.paste(ConverterConstants.TRANSPARENT_PALETTE_INDEX, mask=transparency_mask)
+            palette_frame.info.update(
+                {"duration": frame.info.get("duration", 0), "transparency": ConverterConstants.TRANSPARENT_PALETTE_INDEX}
+            )
+            yield palette_frame
+
+    @staticmethod
+    def __get_shared_palette(file: ImageFile.ImageFile) -> Image.Image:
+        # The palette is computed from thumbnails of all the frames, so colors that appear in later frames are kept
+        # while only the small thumbnails are held in memory
+        size = ConverterConstants.PALETTE_THUMBNAIL_SIZE
+        frame_count: int = getattr(file, "n_frames", 1)
+        columns = math.ceil(math.sqrt(frame_count))
+        sample = Image.new(ConverterConstants.RGB_MODE, (columns * size, math.ceil(frame_count / columns) * size))
+        for index, frame in enumerate(ImageSequence.Iterator(file)):
+            thumbnail = frame.convert(ConverterConstants.RGB_MODE).resize((size, size), Image.Resampling.BOX)
+            sample.paste(thumbnail, ((index % columns) * size, (index // columns) * size))
+
+        return sample.quantize(colors=ConverterConstants.TRANSPARENT_PALETTE_INDEX)
+
+    @staticmethod
+    def __is_large_image(image: Image.Image) -> bool:
+        return image.width * image.height > ConverterConstants.SAFE_AREA
+
+    @staticmethod
+    def __to_rgb(rgba_image: Image.Image) -> Image.Image:
+        white_color = (255, 255, 255, 255)
+        white_background = Image.new(mode=ConverterConstants.RGBA_MODE, size=rgba_image.size, color=white_color)
+        # Ensure rgba_image is in RGBA mode before compositing
+        if rgba_image.mode != ConverterConstants.RGBA_MODE:
+            rgba_image = rgba_image.convert(ConverterConstants.RGBA_MODE)
+        # Merge RGBA into RGB with a white background
+        return Image.alpha_composite(white_background, rgba_image).convert(ConverterConstants.RGB_MODE)
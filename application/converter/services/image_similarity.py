@@ -0,0 +1,43 @@
+from typing import Final, final
+
+import numpy as np
+from numpy.typing import NDArray
+from PIL import Image
+
+
+@final
+class ImageSimilarity:
+    __WINDOW_SIZE: Final[int] = 7
+    __C1: Final[float] = (0.01 * 255) ** 2
+    __C2: Final[float] = (0.03 * 255) ** 2
+
+    @staticmethod
+    def to_luma(image: Image.Image) -> NDArray[np.float64]:
+        return np.asarray(image.convert("L"), dtype=np.float64)
+
+    @staticmethod
+    def get_ssim(reference: NDArray[np.float64], candidate: NDArray[np.float64]) -> float:
+        # Local statistics are averaged over a uniform window, computed for all the windows at once from integral images
+        window_size = min(ImageSimilarity.__WINDOW_SIZE, *reference.shape)
+        reference_mean = ImageSimilarity.__get_window_means(reference, window_size)
+        candidate_mean = ImageSimilarity.__get_window_means(candidate, window_size)
+        reference_variance = ImageSimilarity.__get_window_means(reference * reference, window_size) - reference_mean**2
+        candidate_variance = ImageSimilarity.__get_window_means(candidate * candidate, window_size) - candidate_mean**2
+        covariance = ImageSimilarity.__get_window_means(reference * candidate, window_size) - reference_mean * candidate_mean
+
+        numerator = (2 * reference_mean * candidate_mean + ImageSimilarity.__C1) * (2 * covariance + ImageSimilarity.__C2)
+        denominator = (reference_mean**2 + candidate_mean**2 + ImageSimilarity.__C1) * (
+            reference_variance + candidate_variance + ImageSimilarity.__C2
+        )
+        return float(np.mean(numerator / denominator))
+
+    @staticmethod
+    def __get_window_means(values: NDArray[np.float64], window_size: int) -> NDArray[np.float64]:
+        integral = np.pad(values.cumsum(axis=0).cumsum(axis=1), ((1, 0), (1, 0)))
+        sums = (
+            integral[window_size:, window_size:]
+            - integral[:-window_size, window_size:]
+            - integral[window_size:, :-window_size]
+            + integral[:-window_size, :-window_size]
+        )
+        return sums / (window_size * window_size)
@@ -0,0 +1,21 @@
+from pydantic import BaseModel, ConfigDict
+
+
+class CleanupStats(BaseModel):
+    model_config = ConfigDict(frozen=True, strict=True, extra="forbid")
+
+    cleaned: int
+    failed: int
+
+
+class SweepMetrics(BaseModel):
+    model_config = ConfigDict(frozen=True, strict=True, extra="forbid")
+
+    expired_assets: int
+    cleaned_folders: int
+    failed_folders: int
+    elapsed_seconds: float
+
+    @property
+    def assets_per_second(self) -> float:
+        return self.expired_assets / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
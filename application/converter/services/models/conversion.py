@@ -0,0 +1,16 @@
+from typing import Self
+
+from pydantic import BaseModel, ConfigDict
+
+from application.common.services.models.file_info import ImageFileInfo
+
+
+class ConvertedImage(BaseModel):
+    model_config = ConfigDict(frozen=True, strict=True, extra="forbid")
+
+    file_info: ImageFileInfo
+    quality: int
+
+    @classmethod
+    def create(cls, file_info: ImageFileInfo, quality: int) -> Self:
+        return cls(file_info=file_info, quality=quality)
@@ -1,8 +1,10 @@
+import warnings
 from typing import Final, Optional, final
 
 import bitmath
 from expression import Option
 from ninja import UploadedFile
+from PIL import Image, UnidentifiedImageError
 from types_linq import Enumerable
 
 from application.common.abc.filename_service_abc import FilenameServiceABC
@@ -46,17 +48,22 @@ class ConversionRequestValidator(ValidatorABC[ConversionRequest]):
             .append(self.__validate_file_count(value.files))
             .append(self.__validate_output_format(value.options.output_format))
             .append(self.__validate_quality(value.options.quality))
+            .append(self.__validate_target(value.options))
+            .append(self.__validate_resize(value.options))
         )
 
     def __validate_files(self, files: list[UploadedFile]) -> Enumerable[Option[str]]:
         return (
             Enumerable[UploadedFile](files)
             .select_many(
-                lambda uploaded_file: Enumerable[Option[str]]
-                .empty()
-                .append(self.__validate_filename(uploaded_file.name))
-                .append(self.__validate_empty_file_size(uploaded_file))
-                .append(self.__validate_max_file_size(uploaded_file))
+                lambda uploaded_file: (
+                    Enumerable[Option[str]]
+                    .empty()
+                    .append(self.__validate_filename(uploaded_file.name))
+                    .append(self.__validate_empty_file_size(uploaded_file))
+                    .append(self.__validate_max_file_size(uploaded_file))
+                    .append(self.__validate_image_header(uploaded_file))
+                )
             )
             .cast(Option[str])
         )
@@ -102,6 +109,50 @@ class ConversionRequestValidator(ValidatorABC[ConversionRequest]):
             else Option[str].Nothing()
         )
 
+    def __validate_image_header(self, uploaded_file: UploadedFile) -> Option[str]:
+        # Empty and oversized files are already rejected by the size checks
+        if not (0 < (uploaded_file.size or 0) <= ConverterConstants.MAX_FILE_SIZE):
+            return Option[str].Nothing()
+
+        filename = uploaded_file.name or ""
+
+        try:
+            width, height, frame_count = self.__read_header(uploaded_file)
+        except Image.DecompressionBombError:
+            return Option[str].Some(f"Image '{filename}' exceeds the maximum allowed size of {ConverterConstants.MAX_IMAGE_PIXELS} pixels")
+        except UnidentifiedImageError:
+            return Option[str].Some(f"File '{filename}' cannot be processed. Incompatible file type")
+        except Exception as exception:
+            self.__logger.exception(exception, f"Unable to read image header of '{filename}'")
+            return Option[str].Some(f"File '{filename}' cannot be processed. Corrupted or damaged file")
+        finally:
+            uploaded_file.seek(0)
+
+        if width * height > ConverterConstants.MAX_IMAGE_PIXELS:
+            return Option[str].Some(
+                f"Image '{filename}' with dimensions {width}x{height} exceeds the maximum allowed size of "
+                f"{ConverterConstants.MAX_IMAGE_PIXELS} pixels"
+            )
+
+        if width * height * frame_count > ConverterConstants.MAX_TOTAL_FRAME_PIXELS:
+            return Option[str].Some(
+                f"Image '{filename}' with {frame_count} frames of {width}x{height} exceeds the maximum allowed size of "
+                f"{ConverterConstants.MAX_TOTAL_FRAME_PIXELS} pixels for all frames"
+            )
+
+        return Option[str].Nothing()
+
+    @staticmethod
+    def __read_header(uploaded_file: UploadedFile) -> tuple[int, int, int]:
+        uploaded_file.seek(0)
+        # Opening is lazy. Only the header is parsed and no pixel data is decoded.
+        # Pillow's decompression bomb warning is redundant, since the pixel budget is lower than its threshold
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", Image.DecompressionBombWarning)
+            with Image.open(uploaded_file) as image:
+                frame_count: int = getattr(image, "n_frames", 1)
+                return image.width, image.height, frame_count
+
     @staticmethod
     def __validate_output_format(output_format: ConversionRequest.Options.OutputFormats) -> Option[str]:
         return (
@@ -110,6 +161,33 @@ class ConversionRequestValidator(ValidatorABC[ConversionRequest]):
             else Option[str].Nothing()
         )
 
+    @staticmethod
+    def __validate_target(options: ConversionRequest.Options) -> Option[str]:
+        if not options.is_adaptive:
+            return Option[str].Nothing()
+        if options.target_size_bytes is not None and options.target_ssim is not None:
+            return Option[str].Some("Only one of target size and target SSIM can be set")
+        if options.output_format not in ConverterConstants.ADAPTIVE_QUALITY_FORMATS:
+            formats = ", ".join(sorted(ConverterConstants.ADAPTIVE_QUALITY_FORMATS))
+            return Option[str].Some(f"Target size and target SSIM are only supported for {formats}")
+        if options.target_size_bytes is not None and options.target_size_bytes <= 0:
+            return Option[str].Some("Target size must be greater than 0")
+        if options.target_ssim is not None and not (
+            ConverterConstants.MIN_TARGET_SSIM <= options.target_ssim <= ConverterConstants.MAX_TARGET_SSIM
+        ):
+            return Option[str].Some(
+                f"Target SSIM must be between {ConverterConstants.MIN_TARGET_SSIM} and {ConverterConstants.MAX_TARGET_SSIM}"
+            )
+        return Option[str].Nothing()
+
+    @staticmethod
+    def __validate_resize(options: ConversionRequest.Options) -> Option[str]:
+        if (options.max_width is not None and options.max_width <= 0) or (options.max_height is not None and options.max_height <= 0):
+            return Option[str].Some("Max width and max height must be greater than 0")
+        if options.scale is not None and not (0 < options.scale <= ConverterConstants.MAX_RESIZE_SCALE):
+            return Option[str].Some(f"Scale must be greater than 0 and at most {ConverterConstants.MAX_RESIZE_SCALE}")
+        return Option[str].Nothing()
+
     @staticmethod
     def __validate_quality(quality: int) -> Option[str]:
         return (
@@ -1,3 +1,4 @@
+from datetime import timedelta
 from typing import Annotated
 
 from anydi import Module, provider
@@ -13,13 +14,25 @@ from application.common.services.signing_service import SigningService
 from application.converter.commands.convert_images_command import ConvertImagesCommand
 from application.converter.commands.schemas import ConversionRequest
 from application.converter.queries.get_converted_zip_query import GetConvertedZipQuery
+from application.converter.queries.stream_converted_zip_query import StreamConvertedZipQuery
+from application.converter.services.abc.expired_image_assets_sweeper_abc import ExpiredImageAssetsSweeperABC
+from application.converter.services.abc.image_assets_cleanup_worker_abc import ImageAssetsCleanupWorkerABC
 from application.converter.services.abc.image_file_converter_abc import ImageFileConverterABC
+from application.converter.services.expired_image_assets_sweeper import ExpiredImageAssetsSweeper
+from application.converter.services.image_assets_cleanup_worker import ImageAssetsCleanupWorker
 from application.converter.services.image_file_converter import ImageFileConverter
 from application.converter.validators.conversion_request_validator import ConversionRequestValidator
+from core.abc.byte_cache_abc import ByteCacheABC
 from core.abc.logger_abc import LoggerABC
+from core.abc.task_executor_abc import TaskExecutorABC
+from core.abc.tracer_abc import TracerABC
+from core.caches.memory_byte_cache import MemoryByteCache
+from core.caches.sqlite_byte_cache import SqliteByteCache
+from core.limiters.stage_limiter import StageLimiter
 from infrastructure.abc.converter_image_assets_repository_abc import ConverterImageAssetsRepositoryABC
 from infrastructure.abc.files_repository_abc import FilesRepositoryABC
 from infrastructure.repositories.converter_files.converter_files_repository import ConverterFilesRepository
+from webpeditor import settings
 
 
 class ApplicationModule(Module):
@@ -48,14 +61,77 @@ class ApplicationModule(Module):
     ) -> ValidatorABC[ConversionRequest]:
         return ConversionRequestValidator(image_file_service, filename_service, logger)
 
+    @provider(scope="singleton")
+    def provide_conversion_cache(self, logger: LoggerABC) -> Annotated[ByteCacheABC, ImageFileConverter.__name__]:
+        # Converted images stay cached as long as the session that could request them again
+        match settings.CONVERSION_CACHE_BACKEND:
+            case "memory":
+                return MemoryByteCache(settings.CONVERSION_CACHE_MAX_SIZE_BYTES, settings.SESSION_COOKIE_AGE)
+            case "sqlite":
+                return SqliteByteCache(
+                    settings.CONVERSION_CACHE_DATABASE_PATH,
+                    settings.CONVERSION_CACHE_MAX_SIZE_BYTES,
+                    settings.SESSION_COOKIE_AGE,
+                    logger,
+                )
+            case backend:
+                raise ValueError(f"Unsupported conversion cache backend '{backend}'")
+
     @provider(scope="request")
     def provide_converter_service(
         self,
         image_file_service: ImageFileServiceABC,
         filename_service: FilenameServiceABC,
+        task_executor: TaskExecutorABC,
+        conversion_cache: Annotated[ByteCacheABC, ImageFileConverter.__name__],
         logger: LoggerABC,
     ) -> ImageFileConverterABC:
-        return ImageFileConverter(image_file_service, filename_service, logger)
+        return ImageFileConverter(image_file_service, filename_service, task_executor, conversion_cache, logger)
+
+    @provider(scope="singleton")
+    def provide_image_assets_cleanup_worker(
+        self,
+        converter_repo: ConverterImageAssetsRepositoryABC,
+        converter_files_repo: Annotated[FilesRepositoryABC, ConverterFilesRepository.__name__],
+        logger: LoggerABC,
+    ) -> ImageAssetsCleanupWorkerABC:
+        return ImageAssetsCleanupWorker(
+            ImageAssetsCleanupWorker.Mode(settings.CONVERTER_ASSETS_CLEANUP_MODE),
+            converter_repo,
+            converter_files_repo,
+            settings.CONVERTER_ASSETS_CLEANUP_MAX_CONCURRENCY,
+            settings.CONVERTER_ASSETS_CLEANUP_MAX_REQUESTS_PER_SECOND,
+            logger,
+        )
+
+    @provider(scope="singleton")
+    def provide_expired_image_assets_sweeper(
+        self,
+        converter_repo: ConverterImageAssetsRepositoryABC,
+        assets_cleanup_worker: ImageAssetsCleanupWorkerABC,
+        logger: LoggerABC,
+    ) -> ExpiredImageAssetsSweeperABC:
+        # Assets are not reachable anymore once the session that created them has expired
+        return ExpiredImageAssetsSweeper(
+            timedelta(seconds=settings.SESSION_COOKIE_AGE),
+            converter_repo,
+            assets_cleanup_worker,
+            logger,
+        )
+
+    @provider(scope="singleton")
+    def provide_conversion_stage_limiter(self, tracer: TracerABC) -> Annotated[StageLimiter, ConvertImagesCommand.__name__]:
+        # Shared by all the requests of the process, so concurrent requests do not multiply the limits
+        return StageLimiter(
+            {
+                "pipeline": settings.CONVERTER_PIPELINE_MAX_FILES,
+                "decode": settings.CONVERTER_DECODE_MAX_CONCURRENCY,
+                "convert": settings.CONVERTER_CONVERT_MAX_CONCURRENCY,
+                "upload": settings.CONVERTER_UPLOAD_MAX_CONCURRENCY,
+                "persist": settings.CONVERTER_PERSIST_MAX_CONCURRENCY,
+            },
+            tracer,
+        )
 
     @provider(scope="request")
     def provide_convert_images_command(
@@ -67,6 +143,9 @@ class ApplicationModule(Module):
         image_file_service: ImageFileServiceABC,
         filename_service: FilenameServiceABC,
         converter_repo: ConverterImageAssetsRepositoryABC,
+        assets_cleanup_worker: ImageAssetsCleanupWorkerABC,
+        stage_limiter: Annotated[StageLimiter, ConvertImagesCommand.__name__],
+        tracer: TracerABC,
         logger: LoggerABC,
     ) -> ConvertImagesCommand:
         return ConvertImagesCommand(
@@ -77,6 +156,9 @@ class ApplicationModule(Module):
             image_file_service,
             filename_service,
             converter_repo,
+            assets_cleanup_worker,
+            stage_limiter,
+            tracer,
             logger,
         )
 
@@ -86,5 +168,16 @@ class ApplicationModule(Module):
         session_service_factory: SessionServiceFactory,
         converter_files_repo: Annotated[FilesRepositoryABC, ConverterFilesRepository.__name__],
         converter_repo: ConverterImageAssetsRepositoryABC,
+        logger: LoggerABC,
     ) -> GetConvertedZipQuery:
-        return GetConvertedZipQuery(session_service_factory, converter_files_repo, converter_repo)
+        return GetConvertedZipQuery(session_service_factory, converter_files_repo, converter_repo, logger)
+
+    @provider(scope="request")
+    def provide_stream_zip_query(
+        self,
+        session_service_factory: SessionServiceFactory,
+        converter_files_repo: Annotated[FilesRepositoryABC, ConverterFilesRepository.__name__],
+        converter_repo: ConverterImageAssetsRepositoryABC,
+        logger: LoggerABC,
+    ) -> StreamConvertedZipQuery:
+        return StreamConvertedZipQuery(session_service_factory, converter_files_repo, converter_repo, logger)
@@ -0,0 +1,16 @@
+from abc import ABC, abstractmethod
+
+from expression import Option
+
+from core.caches.models import CacheStats
+
+
+class ByteCacheABC(ABC):
+    @abstractmethod
+    async def aget(self, key: str) -> Option[bytes]: ...
+
+    @abstractmethod
+    async def aset(self, key: str, value: bytes) -> None: ...
+
+    @abstractmethod
+    def get_stats(self) -> CacheStats: ...
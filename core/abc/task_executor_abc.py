@@ -0,0 +1,13 @@
+from abc import ABC, abstractmethod
+from typing import Callable
+
+from core.result import ContextResult, as_awaitable_result
+
+
+class TaskExecutorABC(ABC):
+    @abstractmethod
+    @as_awaitable_result
+    async def aexecute[**P, T](self, func: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> ContextResult[T]: ...
+
+    @abstractmethod
+    def shutdown(self, wait: bool = True) -> None: ...
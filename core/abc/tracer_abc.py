@@ -0,0 +1,29 @@
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
+from contextlib import AbstractContextManager
+from typing import Optional
+
+from core.result import ContextResult, as_awaitable_result
+from core.tracing.request_trace import RequestTrace
+from core.tracing.span import Span
+
+
+class TracerABC(ABC):
+    @abstractmethod
+    def span(self, stage: str) -> AbstractContextManager[Span]: ...
+
+    @abstractmethod
+    @as_awaitable_result
+    async def atrace[T](
+        self,
+        stage: str,
+        awaitable: Awaitable[ContextResult[T]],
+        *,
+        measure: Optional[Callable[[T], int]] = None,
+    ) -> ContextResult[T]: ...
+
+    @abstractmethod
+    def trace_request(self) -> AbstractContextManager[Optional[RequestTrace]]: ...
+
+    @abstractmethod
+    def render_metrics(self) -> str: ...
@@ -0,0 +1,49 @@
+import io
+import time
+import zipfile
+from collections.abc import Buffer
+from typing import AsyncIterable, AsyncIterator, Final, final
+
+from core.types import Pair
+
+
+@final
+class StoredZipStream:
+    __CHUNK_SIZE: Final[int] = 64 * 1024
+
+    @staticmethod
+    async def aiter(entries: AsyncIterable[Pair[str, bytes]]) -> AsyncIterator[bytes]:
+        # Entries are stored without compression, since they are already compressed images. The archive is written to
+        # an unseekable sink, so sizes and checksums follow each entry and every written chunk is yielded immediately.
+        # Writes that only buffer inside the archive leave the sink empty, and empty chunks are never yielded
+        sink = _UnseekableSink()
+        with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED) as archive:
+            async for entry in entries:
+                filename, content = entry.item1, memoryview(entry.item2)
+                with archive.open(zipfile.ZipInfo(filename, date_time=time.localtime()[:6]), mode="w") as file:
+                    for offset in range(0, len(content), StoredZipStream.__CHUNK_SIZE):
+                        file.write(content[offset : offset + StoredZipStream.__CHUNK_SIZE])
+                        if data := sink.drain():
+                            yield data
+                if data := sink.drain():
+                    yield data
+        if data := sink.drain():
+            yield data
+
+
+class _UnseekableSink(io.RawIOBase):
+    def __init__(self) -> None:
+        super().__init__()
+        self.__chunks: Final[list[bytes]] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, buffer: Buffer, /) -> int:
+        self.__chunks.append(bytes(buffer))
+        return len(self.__chunks[-1])
+
+    def drain(self) -> bytes:
+        data = b"".join(self.__chunks)
+        self.__chunks.clear()
+        return data
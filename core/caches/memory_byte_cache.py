@@ -0,0 +1,68 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Final, final
+
+from expression import Option
+
+from core.abc.byte_cache_abc import ByteCacheABC
+from core.caches.models import CacheStats
+from core.types import Pair
+
+
+@final
+class MemoryByteCache(ByteCacheABC):
+    def __init__(self, max_size_bytes: int, ttl_seconds: int) -> None:
+        if max_size_bytes <= 0:
+            raise ValueError(f"Maximum cache size must be greater than 0, got {max_size_bytes}")
+        if ttl_seconds <= 0:
+            raise ValueError(f"Cache TTL must be greater than 0, got {ttl_seconds}")
+
+        self.__max_size_bytes: Final[int] = max_size_bytes
+        self.__ttl_seconds: Final[int] = ttl_seconds
+        self.__lock: Final[threading.Lock] = threading.Lock()
+        # Ordered from the least to the most recently used. Values are paired with their expiration time
+        self.__entries: Final[OrderedDict[str, Pair[float, bytes]]] = OrderedDict()
+        self.__size_bytes: int = 0
+        self.__hits: int = 0
+        self.__misses: int = 0
+        self.__writes: int = 0
+        self.__evictions: int = 0
+
+    async def aget(self, key: str) -> Option[bytes]:
+        with self.__lock:
+            entry = self.__entries.get(key)
+
+            if entry is None or entry.item1 <= time.monotonic():
+                if entry is not None:
+                    self.__remove(key)
+                self.__misses += 1
+                return Option[bytes].Nothing()
+
+            self.__entries.move_to_end(key)
+            self.__hits += 1
+            return Option[bytes].Some(entry.item2)
+
+    async def aset(self, key: str, value: bytes) -> None:
+        if len(value) > self.__max_size_bytes:
+            return
+
+        with self.__lock:
+            if key in self.__entries:
+                self.__remove(key)
+
+            self.__entries[key] = Pair(time.monotonic() + self.__ttl_seconds, value)
+            self.__size_bytes += len(value)
+            self.__writes += 1
+
+            while self.__size_bytes > self.__max_size_bytes:
+                self.__remove(next(iter(self.__entries)))
+                self.__evictions += 1
+
+    def get_stats(self) -> CacheStats:
+        with self.__lock:
+            return CacheStats(hits=self.__hits, misses=self.__misses, writes=self.__writes, evictions=self.__evictions)
+
+    def __remove(self, key: str) -> None:
+        entry = self.__entries.pop(key)
+        self.__size_bytes -= len(entry.item2)
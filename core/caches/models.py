@@ -0,0 +1,15 @@
+from pydantic import BaseModel, ConfigDict
+
+
+class CacheStats(BaseModel):
+    model_config = ConfigDict(frozen=True, strict=True, extra="forbid")
+
+    hits: int
+    misses: int
+    writes: int
+    evictions: int
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0.0
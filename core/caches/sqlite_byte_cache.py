@@ -0,0 +1,128 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Final, Optional, final
+
+from expression import Option
+
+from core.abc.byte_cache_abc import ByteCacheABC
+from core.abc.logger_abc import LoggerABC
+from core.caches.models import CacheStats
+
+
+@final
+class SqliteByteCache(ByteCacheABC):
+    __SCHEMA: Final[str] = """
+        CREATE TABLE IF NOT EXISTS byte_cache (
+            key TEXT PRIMARY KEY,
+            value BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            expires_at REAL NOT NULL,
+            accessed_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS byte_cache_accessed_at_idx ON byte_cache (accessed_at);
+    """
+
+    def __init__(self, database_path: Path, max_size_bytes: int, ttl_seconds: int, logger: LoggerABC) -> None:
+        if max_size_bytes <= 0:
+            raise ValueError(f"Maximum cache size must be greater than 0, got {max_size_bytes}")
+        if ttl_seconds <= 0:
+            raise ValueError(f"Cache TTL must be greater than 0, got {ttl_seconds}")
+
+        self.__database_path: Final[Path] = database_path
+        self.__max_size_bytes: Final[int] = max_size_bytes
+        self.__ttl_seconds: Final[int] = ttl_seconds
+        self.__logger: Final[LoggerABC] = logger
+        self.__lock: Final[threading.Lock] = threading.Lock()
+        self.__connection: Optional[sqlite3.Connection] = None
+        self.__hits: int = 0
+        self.__misses: int = 0
+        self.__writes: int = 0
+        self.__evictions: int = 0
+
+    async def aget(self, key: str) -> Option[bytes]:
+        try:
+            value = await asyncio.to_thread(self.__get, key)
+        except sqlite3.Error as exception:
+            self.__logger.exception(exception, f"Unable to read cache entry '{key}'")
+            value = None
+
+        with self.__lock:
+            if value is None:
+                self.__misses += 1
+                return Option[bytes].Nothing()
+
+            self.__hits += 1
+            return Option[bytes].Some(value)
+
+    async def aset(self, key: str, value: bytes) -> None:
+        if len(value) > self.__max_size_bytes:
+            return
+
+        try:
+            await asyncio.to_thread(self.__set, key, value)
+        except sqlite3.Error as exception:
+            self.__logger.exception(exception, f"Unable to write cache entry '{key}'")
+
+    def get_stats(self) -> CacheStats:
+        with self.__lock:
+            return CacheStats(hits=self.__hits, misses=self.__misses, writes=self.__writes, evictions=self.__evictions)
+
+    def __get(self, key: str) -> Optional[bytes]:
+        now = time.time()
+        with self.__lock:
+            connection = self.__get_connection()
+            row: Optional[tuple[bytes, float]] = connection.execute(
+                "SELECT value, expires_at FROM byte_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            value, expires_at = row
+            with connection:
+                if expires_at <= now:
+                    connection.execute("DELETE FROM byte_cache WHERE key = ?", (key,))
+                    return None
+
+                connection.execute("UPDATE byte_cache SET accessed_at = ? WHERE key = ?", (now, key))
+                return value
+
+    def __set(self, key: str, value: bytes) -> None:
+        now = time.time()
+        with self.__lock:
+            connection = self.__get_connection()
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO byte_cache (key, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, value, len(value), now + self.__ttl_seconds, now),
+                )
+                expired = connection.execute("DELETE FROM byte_cache WHERE expires_at <= ?", (now,)).rowcount
+                # Keeps the most recently used entries that fit into the size limit
+                evicted = connection.execute(
+                    """
+                    DELETE FROM byte_cache WHERE key IN (
+                        SELECT key FROM (
+                            SELECT key, SUM(size) OVER (ORDER BY accessed_at DESC, key) AS total_size FROM byte_cache
+                        ) WHERE total_size > ?
+                    )
+                    """,
+                    (self.__max_size_bytes,),
+                ).rowcount
+
+            self.__writes += 1
+            self.__evictions += expired + evicted
+
+    def __get_connection(self) -> sqlite3.Connection:
+        if self.__connection is None:
+            # Shared by several processes. WAL lets readers proceed while another process writes
+            connection = sqlite3.connect(self.__database_path, timeout=5.0, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(self.__SCHEMA)
+            self.__connection = connection
+
+        return self.__connection
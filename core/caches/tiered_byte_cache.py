@@ -0,0 +1,40 @@
+from typing import Final, final
+
+from expression import Option
+
+from core.abc.byte_cache_abc import ByteCacheABC
+from core.caches.models import CacheStats
+
+
+@final
+class TieredByteCache(ByteCacheABC):
+    def __init__(self, near_cache: ByteCacheABC, far_cache: ByteCacheABC) -> None:
+        self.__near_cache: Final[ByteCacheABC] = near_cache
+        self.__far_cache: Final[ByteCacheABC] = far_cache
+
+    async def aget(self, key: str) -> Option[bytes]:
+        value = await self.__near_cache.aget(key)
+        if value.is_some():
+            return value
+
+        value = await self.__far_cache.aget(key)
+        if value.is_some():
+            # Promoted, so the next lookup of the entry does not reach the far tier
+            await self.__near_cache.aset(key, value.value)
+
+        return value
+
+    async def aset(self, key: str, value: bytes) -> None:
+        await self.__near_cache.aset(key, value)
+        await self.__far_cache.aset(key, value)
+
+    def get_stats(self) -> CacheStats:
+        # Every miss of the near tier is looked up in the far tier, which holds every entry that is written
+        near_stats = self.__near_cache.get_stats()
+        far_stats = self.__far_cache.get_stats()
+        return CacheStats(
+            hits=near_stats.hits + far_stats.hits,
+            misses=far_stats.misses,
+            writes=far_stats.writes,
+            evictions=far_stats.evictions,
+        )
@@ -1,10 +1,28 @@
 from anydi import Module, provider
 
 from core.abc.logger_abc import LoggerABC
+from core.abc.task_executor_abc import TaskExecutorABC
+from core.abc.tracer_abc import TracerABC
+from core.executors.pool_task_executor import PoolTaskExecutor
 from core.logging.logger import Logger
+from core.tracing.tracer import Tracer
+from webpeditor import settings
 
 
 class CoreModule(Module):
     @provider(scope="singleton")
     def provide_logger(self) -> LoggerABC:
         return Logger()
+
+    @provider(scope="singleton")
+    def provide_task_executor(self, logger: LoggerABC) -> TaskExecutorABC:
+        return PoolTaskExecutor(
+            PoolTaskExecutor.Mode(settings.TASK_EXECUTOR_MODE),
+            settings.TASK_EXECUTOR_MAX_WORKERS,
+            settings.TASK_EXECUTOR_TIMEOUT_SECONDS,
+            logger,
+        )
+
+    @provider(scope="singleton")
+    def provide_tracer(self) -> TracerABC:
+        return Tracer(settings.TRACING_ENABLED)
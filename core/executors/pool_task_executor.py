@@ -0,0 +1,79 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from enum import StrEnum
+from functools import partial
+from typing import Callable, Final, Optional, final
+
+from core.abc.logger_abc import LoggerABC
+from core.abc.task_executor_abc import TaskExecutorABC
+from core.result import ContextResult, ErrorContext, as_awaitable_result
+
+
+@final
+class PoolTaskExecutor(TaskExecutorABC):
+    class Mode(StrEnum):
+        PROCESS = "process"
+        THREAD = "thread"
+
+    def __init__(self, mode: Mode, max_workers: int, timeout_seconds: float, logger: LoggerABC) -> None:
+        if max_workers <= 0:
+            raise ValueError(f"Maximum number of workers must be greater than 0, got {max_workers}")
+        if timeout_seconds <= 0:
+            raise ValueError(f"Timeout must be greater than 0, got {timeout_seconds}")
+
+        self.__mode: Final[PoolTaskExecutor.Mode] = mode
+        self.__max_workers: Final[int] = max_workers
+        self.__timeout_seconds: Final[float] = timeout_seconds
+        self.__logger: Final[LoggerABC] = logger
+        self.__lock: Final[threading.Lock] = threading.Lock()
+        self.__pool: Optional[Executor] = None
+
+    @as_awaitable_result
+    async def aexecute[**P, T](self, func: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> ContextResult[T]:
+        task_name = getattr(func, "__qualname__", repr(func))
+        try:
+            future = asyncio.get_running_loop().run_in_executor(self.__get_pool(), partial(func, *args, **kwargs))
+            return ContextResult[T].success(await asyncio.wait_for(future, timeout=self.__timeout_seconds))
+        except TimeoutError:
+            self.__logger.error(f"Task '{task_name}' did not complete within {self.__timeout_seconds} seconds")
+            return ContextResult[T].failure(ErrorContext.server_error("Unable to complete the task in time"))
+        except BrokenProcessPool as exception:
+            self.__logger.exception(exception, f"Worker pool is broken. Task '{task_name}' has been aborted")
+            self.__reset_pool()
+            return ContextResult[T].failure(ErrorContext.server_error("Unable to complete the task"))
+        except Exception as exception:
+            self.__logger.exception(exception, f"Task '{task_name}' failed")
+            return ContextResult[T].failure(ErrorContext.server_error("Unable to complete the task"))
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self.__lock:
+            pool, self.__pool = self.__pool, None
+
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+            self.__logger.debug(f"Shut down {self.__mode} pool with {self.__max_workers} worker(s)")
+
+    def __get_pool(self) -> Executor:
+        with self.__lock:
+            if self.__pool is None:
+                self.__pool = self.__create_pool()
+                self.__logger.debug(f"Started {self.__mode} pool with {self.__max_workers} worker(s)")
+            return self.__pool
+
+    def __reset_pool(self) -> None:
+        with self.__lock:
+            pool, self.__pool = self.__pool, None
+
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def __create_pool(self) -> Executor:
+        match self.__mode:
+            case PoolTaskExecutor.Mode.PROCESS:
+                # Forking a process that already runs an event loop and worker threads is unsafe
+                return ProcessPoolExecutor(max_workers=self.__max_workers, mp_context=multiprocessing.get_context("spawn"))
+            case PoolTaskExecutor.Mode.THREAD:
+                return ThreadPoolExecutor(max_workers=self.__max_workers, thread_name_prefix=PoolTaskExecutor.__name__)
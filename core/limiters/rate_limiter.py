@@ -0,0 +1,21 @@
+import asyncio
+import time
+from typing import Final, final
+
+
+@final
+class RateLimiter:
+    def __init__(self, max_per_second: float) -> None:
+        if max_per_second <= 0:
+            raise ValueError(f"Rate must be greater than 0, got {max_per_second}")
+
+        self.__interval: Final[float] = 1 / max_per_second
+        self.__next_at: float = 0.0
+
+    async def aacquire(self) -> None:
+        # Slots are reserved before sleeping, so concurrent callers are spaced evenly instead of waking up together
+        now = time.monotonic()
+        delay = self.__next_at - now
+        self.__next_at = max(now, self.__next_at) + self.__interval
+        if delay > 0:
+            await asyncio.sleep(delay)
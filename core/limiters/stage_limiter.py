@@ -0,0 +1,33 @@
+import asyncio
+from collections.abc import AsyncGenerator, Mapping
+from contextlib import asynccontextmanager
+from typing import Final, final
+
+from core.abc.tracer_abc import TracerABC
+
+
+@final
+class StageLimiter:
+    def __init__(self, max_concurrency: Mapping[str, int], tracer: TracerABC) -> None:
+        for stage, limit in max_concurrency.items():
+            if limit <= 0:
+                raise ValueError(f"Maximum concurrency of stage '{stage}' must be greater than 0, got {limit}")
+
+        self.__semaphores: Final[dict[str, asyncio.Semaphore]] = {
+            stage: asyncio.Semaphore(limit) for stage, limit in max_concurrency.items()
+        }
+        self.__tracer: Final[TracerABC] = tracer
+
+    @asynccontextmanager
+    async def aslot(self, stage: str) -> AsyncGenerator[None]:
+        semaphore = self.__semaphores.get(stage)
+        if semaphore is None:
+            raise ValueError(f"Unknown stage '{stage}'")
+
+        # Time spent waiting for a slot is traced apart from the stage itself, so saturated stages are visible
+        with self.__tracer.span(f"{stage}-queue"):
+            await semaphore.acquire()
+        try:
+            yield
+        finally:
+            semaphore.release()
@@ -0,0 +1,63 @@
+import time
+from enum import StrEnum
+from typing import Final, final
+
+
+@final
+class CircuitBreaker:
+    class State(StrEnum):
+        CLOSED = "closed"
+        OPEN = "open"
+        HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout_seconds: float) -> None:
+        if failure_threshold <= 0:
+            raise ValueError(f"Failure threshold must be greater than 0, got {failure_threshold}")
+        if reset_timeout_seconds <= 0:
+            raise ValueError(f"Reset timeout must be greater than 0, got {reset_timeout_seconds}")
+
+        self.__failure_threshold: Final[int] = failure_threshold
+        self.__reset_timeout_seconds: Final[float] = reset_timeout_seconds
+        self.__state: CircuitBreaker.State = CircuitBreaker.State.CLOSED
+        self.__failures: int = 0
+        self.__opened_at: float = 0.0
+        self.__trips: int = 0
+
+    @property
+    def state(self) -> State:
+        return self.__state
+
+    @property
+    def trips(self) -> int:
+        return self.__trips
+
+    def allow_request(self) -> bool:
+        match self.__state:
+            case CircuitBreaker.State.CLOSED:
+                return True
+            case CircuitBreaker.State.OPEN if time.monotonic() - self.__opened_at >= self.__reset_timeout_seconds:
+                # A single trial request decides whether the circuit closes again
+                self.__state = CircuitBreaker.State.HALF_OPEN
+                return True
+            case _:
+                return False
+
+    def record_success(self) -> None:
+        self.__state = CircuitBreaker.State.CLOSED
+        self.__failures = 0
+
+    def record_cancellation(self) -> None:
+        # A cancelled trial request says nothing about the endpoint, so the next request becomes the trial
+        if self.__state == CircuitBreaker.State.HALF_OPEN:
+            self.__state = CircuitBreaker.State.OPEN
+
+    def record_failure(self) -> bool:
+        self.__failures += 1
+        if self.__state == CircuitBreaker.State.HALF_OPEN or self.__failures >= self.__failure_threshold:
+            self.__state = CircuitBreaker.State.OPEN
+            self.__opened_at = time.monotonic()
+            self.__failures = 0
+            self.__trips += 1
+            return True
+
+        return False
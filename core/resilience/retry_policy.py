@@ -0,0 +1,27 @@
+import random
+from typing import Final, Optional, final
+
+
+@final
+class RetryPolicy:
+    def __init__(self, max_attempts: int, base_delay_seconds: float, max_delay_seconds: float) -> None:
+        if max_attempts <= 0:
+            raise ValueError(f"Maximum number of attempts must be greater than 0, got {max_attempts}")
+        if base_delay_seconds < 0 or max_delay_seconds < base_delay_seconds:
+            raise ValueError(f"Invalid retry delays, got {base_delay_seconds} and {max_delay_seconds}")
+
+        self.__max_attempts: Final[int] = max_attempts
+        self.__base_delay_seconds: Final[float] = base_delay_seconds
+        self.__max_delay_seconds: Final[float] = max_delay_seconds
+
+    @property
+    def max_attempts(self) -> int:
+        return self.__max_attempts
+
+    def get_delay(self, attempt: int, retry_after_seconds: Optional[float] = None) -> float:
+        # The delay requested by the server takes precedence. Otherwise, the exponential delay is fully jittered,
+        # so clients that failed together do not retry together
+        if retry_after_seconds is not None:
+            return min(max(retry_after_seconds, 0.0), self.__max_delay_seconds)
+
+        return random.uniform(0.0, min(self.__base_delay_seconds * 2**attempt, self.__max_delay_seconds))  # noqa: S311
@@ -246,6 +246,26 @@ class _AwaitableContextResult[TOut](Awaitable[ContextResult[TOut]]):
     ) -> ContextResult[TNewOut]:
         return await (await self).amap2(other, mapper)
 
+    @as_awaitable_result
+    async def azip[TOutOther, TNewOut](
+        self,
+        other: Awaitable[ContextResult[TOutOther]],
+        mapper: Callable[[TOut, TOutOther], TNewOut],
+    ) -> ContextResult[TNewOut]:
+        # Both results are awaited concurrently. The first failure cancels the other one, as its value is not needed anymore
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                task = task_group.create_task(_aensure_success(self))
+                other_task = task_group.create_task(_aensure_success(other))
+        except ExceptionGroup as exception_group:
+            exception = exception_group.exceptions[0]
+            if isinstance(exception, _FailedResultError):
+                return ContextResult[TNewOut].failure(exception.error)
+            # Unexpected exceptions are raised as they would be without the task group
+            raise exception from None
+
+        return task.result().map2(other_task.result(), mapper)
+
     @as_awaitable_enumerable_result
     async def bind_many[TNewOut](self, mapper: Callable[[TOut], "EnumerableContextResult[TNewOut]"]) -> "EnumerableContextResult[TNewOut]":
         return (await self).bind_many(mapper)
@@ -284,6 +304,19 @@ class _AwaitableContextResult[TOut](Awaitable[ContextResult[TOut]]):
         return ContextResult[TOut].from_result((await self).filter_with(predicate, default))
 
 
+class _FailedResultError(Exception):
+    def __init__(self, error: ErrorContext) -> None:
+        super().__init__(error.message)
+        self.error: ErrorContext = error
+
+
+async def _aensure_success[TOut](awaitable: Awaitable[ContextResult[TOut]]) -> ContextResult[TOut]:
+    result = await awaitable
+    if result.is_error():
+        raise _FailedResultError(result.error)
+    return result
+
+
 class EnumerableContextResult[TOut](Enumerable[ContextResult[TOut]]):
     @staticmethod
     def from_results(results: Collection[ContextResult[TOut]]) -> "EnumerableContextResult[TOut]":
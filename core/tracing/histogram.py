@@ -0,0 +1,44 @@
+import bisect
+import threading
+from collections.abc import Sequence
+from typing import Final, final
+
+
+@final
+class Histogram:
+    def __init__(self, name: str, description: str, buckets: Sequence[float]) -> None:
+        if len(buckets) == 0:
+            raise ValueError("Histogram must have at least one bucket")
+
+        self.__name: Final[str] = name
+        self.__description: Final[str] = description
+        self.__buckets: Final[tuple[float, ...]] = tuple(sorted(buckets))
+        self.__lock: Final[threading.Lock] = threading.Lock()
+        # Observations per stage and bucket. The last bucket holds the observations above the largest bound
+        self.__counts: Final[dict[str, list[int]]] = {}
+        self.__sums: Final[dict[str, float]] = {}
+
+    def observe(self, stage: str, value: float) -> None:
+        index = bisect.bisect_left(self.__buckets, value)
+        with self.__lock:
+            counts = self.__counts.setdefault(stage, [0] * (len(self.__buckets) + 1))
+            counts[index] += 1
+            self.__sums[stage] = self.__sums.get(stage, 0.0) + value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.__name} {self.__description}", f"# TYPE {self.__name} histogram"]
+
+        with self.__lock:
+            for stage, counts in sorted(self.__counts.items()):
+                cumulative_count = 0
+                for bound, count in zip((*map(self.__format_bound, self.__buckets), "+Inf"), counts, strict=True):
+                    cumulative_count += count
+                    lines.append(f'{self.__name}_bucket{{stage="{stage}",le="{bound}"}} {cumulative_count}')
+                lines.append(f'{self.__name}_sum{{stage="{stage}"}} {self.__sums[stage]}')
+                lines.append(f'{self.__name}_count{{stage="{stage}"}} {cumulative_count}')
+
+        return lines
+
+    @staticmethod
+    def __format_bound(bound: float) -> str:
+        return str(int(bound)) if bound.is_integer() else str(bound)
@@ -0,0 +1,19 @@
+import threading
+from typing import Final, final
+
+
+@final
+class RequestTrace:
+    def __init__(self) -> None:
+        self.__lock: Final[threading.Lock] = threading.Lock()
+        # Ordered by the first occurrence of each stage
+        self.__durations: Final[dict[str, float]] = {}
+
+    def record(self, stage: str, duration_seconds: float) -> None:
+        with self.__lock:
+            self.__durations[stage] = self.__durations.get(stage, 0.0) + duration_seconds
+
+    def to_server_timing(self) -> str:
+        # Stages that run once per file are summed over all the files of the request
+        with self.__lock:
+            return ", ".join(f"{stage};dur={duration * 1000:.1f}" for stage, duration in self.__durations.items())
@@ -0,0 +1,19 @@
+from typing import Final, final
+
+
+@final
+class Span:
+    def __init__(self, stage: str) -> None:
+        self.__stage: Final[str] = stage
+        self.__bytes: int = 0
+
+    @property
+    def stage(self) -> str:
+        return self.__stage
+
+    @property
+    def bytes(self) -> int:
+        return self.__bytes
+
+    def add_bytes(self, count: int) -> None:
+        self.__bytes += count
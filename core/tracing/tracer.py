@@ -0,0 +1,81 @@
+import time
+from collections.abc import Awaitable, Callable, Generator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Final, Optional, final
+
+from core.abc.tracer_abc import TracerABC
+from core.result import ContextResult, as_awaitable_result
+from core.tracing.histogram import Histogram
+from core.tracing.request_trace import RequestTrace
+from core.tracing.span import Span
+
+
+@final
+class Tracer(TracerABC):
+    __DURATION_BUCKETS_SECONDS: Final[tuple[float, ...]] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+    __SIZE_BUCKETS_BYTES: Final[tuple[float, ...]] = tuple(float(1024 * 4**exponent) for exponent in range(10))  # 1 KiB - 256 MiB
+    # The trace is mutated in place, so spans recorded in copied contexts of threads and tasks still reach it
+    __request_trace: Final[ContextVar[Optional[RequestTrace]]] = ContextVar("request_trace", default=None)
+
+    def __init__(self, enabled: bool) -> None:
+        self.__enabled: Final[bool] = enabled
+        self.__durations: Final[Histogram] = Histogram(
+            "webpeditor_stage_duration_seconds",
+            "Duration of the stages of the conversion pipeline",
+            self.__DURATION_BUCKETS_SECONDS,
+        )
+        self.__sizes: Final[Histogram] = Histogram(
+            "webpeditor_stage_size_bytes",
+            "Size of the files handled by the stages of the conversion pipeline",
+            self.__SIZE_BUCKETS_BYTES,
+        )
+
+    def span(self, stage: str) -> AbstractContextManager[Span]:
+        # Nothing is timed or recorded while tracing is disabled
+        return self.__span(stage) if self.__enabled else nullcontext(Span(stage))
+
+    @as_awaitable_result
+    async def atrace[T](
+        self,
+        stage: str,
+        awaitable: Awaitable[ContextResult[T]],
+        *,
+        measure: Optional[Callable[[T], int]] = None,
+    ) -> ContextResult[T]:
+        with self.span(stage) as span:
+            result = await awaitable
+            if measure is not None and result.is_ok():
+                span.add_bytes(measure(result.ok))
+            return result
+
+    def trace_request(self) -> AbstractContextManager[Optional[RequestTrace]]:
+        return self.__trace_request() if self.__enabled else nullcontext()
+
+    def render_metrics(self) -> str:
+        return "\n".join((*self.__durations.render(), *self.__sizes.render(), ""))
+
+    @contextmanager
+    def __span(self, stage: str) -> Generator[Span]:
+        span = Span(stage)
+        started_at = time.perf_counter()
+        try:
+            yield span
+        finally:
+            duration_seconds = time.perf_counter() - started_at
+            self.__durations.observe(stage, duration_seconds)
+            if span.bytes > 0:
+                self.__sizes.observe(stage, span.bytes)
+
+            request_trace = self.__request_trace.get()
+            if request_trace is not None:
+                request_trace.record(stage, duration_seconds)
+
+    @contextmanager
+    def __trace_request(self) -> Generator[RequestTrace]:
+        request_trace = RequestTrace()
+        token = self.__request_trace.set(request_trace)
+        try:
+            yield request_trace
+        finally:
+            self.__request_trace.reset(token)
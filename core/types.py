@@ -8,6 +8,10 @@ class Pair[T1, T2](tuple[T1, T2]):
     def __new__(cls, item1: T1, item2: T2) -> Self:
         return super().__new__(cls, (item1, item2))
 
+    # Pairs are returned from worker processes, so they are unpickled with both items as arguments
+    def __getnewargs__(self) -> tuple[T1, T2]:
+        return (self[0], self[1])
+
     @classmethod
     def from_tuple(cls, items: tuple[T1, T2]) -> Self:
         return cls(items[0], items[1])
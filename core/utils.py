@@ -1,4 +1,22 @@
+import hashlib
+from typing import Final
+
+
 class BoolUtils:
     @staticmethod
     def to_str(value: bool) -> str:
         return str(value).lower()
+
+
+class DigestUtils:
+    __SHA256_ATTRIBUTE: Final[str] = "sha256_hexdigest"
+
+    @staticmethod
+    def set_sha256(obj: object, hexdigest: str) -> None:
+        setattr(obj, DigestUtils.__SHA256_ATTRIBUTE, hexdigest)
+
+    @staticmethod
+    def get_sha256(obj: object, content: bytes) -> str:
+        # Computed from the content only if no digest has been attached while the object was created
+        hexdigest = getattr(obj, DigestUtils.__SHA256_ATTRIBUTE, None)
+        return hexdigest if isinstance(hexdigest, str) else hashlib.sha256(content).hexdigest()
@@ -19,9 +19,27 @@ class ConverterConstants(ImageFilePropertyConstants):
 
     MIN_QUALITY: Final[int] = 5
     MAX_QUALITY: Final[int] = 100
+    # Formats whose size and fidelity depend on the quality, so a target size or similarity can be met by choosing it
+    ADAPTIVE_QUALITY_FORMATS: Final[frozenset[str]] = frozenset[str]({ImageFormats.JPEG, ImageFormatsWithAlphaChannel.WEBP})
+    MIN_TARGET_SSIM: Final[float] = 0.5
+    MAX_TARGET_SSIM: Final[float] = 0.999
+    # Qualities are searched on a trial image of tiles sampled from the source until the bounds are this close
+    ADAPTIVE_QUALITY_TOLERANCE: Final[int] = 2
+    ADAPTIVE_TRIAL_TILE_SIZE: Final[int] = 128
+    ADAPTIVE_TRIAL_TILES_PER_SIDE: Final[int] = 4
+    # Images are never upscaled
+    MAX_RESIZE_SCALE: Final[float] = 1.0
+    # Downscaling reduces by an integer factor first while the remaining scale stays above the gap, then resamples
+    RESIZE_REDUCING_GAP: Final[float] = 3.0
     MAX_FILE_SIZE: Final[int] = 6_291_456
     MAX_FILES_LIMIT: Final[int] = 10
     SAFE_AREA: Final[int] = 1_000_000
+    MAX_IMAGE_PIXELS: Final[int] = SAFE_AREA * 50
+    MAX_TOTAL_FRAME_PIXELS: Final[int] = SAFE_AREA * 200
+    ANIMATED_IMAGE_FORMATS: Final[frozenset[str]] = frozenset[str]({ImageFormatsWithAlphaChannel.WEBP, ImageFormatsWithAlphaChannel.GIF})
+    # Reserved in the palette of animations that are quantized, since GIF frames have no alpha channel
+    TRANSPARENT_PALETTE_INDEX: Final[int] = 255
+    PALETTE_THUMBNAIL_SIZE: Final[int] = 32
     ALL_IMAGE_FORMATS: Final[frozenset[str]] = frozenset[str](
         {
             *(image_format.value for image_format in ImageFormats),
@@ -1,9 +1,15 @@
 from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import Optional, Sequence, Union
+from uuid import UUID
 
 from core.result import ContextResult, as_awaitable_result
-from domain.common.models import ImageAssetFile
-from domain.converter.models import ConverterImageAsset
-from infrastructure.repositories.converter_image_assets.models import CreateAssetFileParams
+from domain.converter.models import ConverterConvertedImageAssetFile, ConverterImageAsset, ConverterOriginalImageAssetFile
+from infrastructure.repositories.converter_image_assets.models import (
+    ConvertedZipArchive,
+    CreateConverterAssetFileParams,
+    ImageAssetTombstone,
+)
 
 
 class ConverterImageAssetsRepositoryABC(ABC):
@@ -13,16 +19,46 @@ class ConverterImageAssetsRepositoryABC(ABC):
 
     @abstractmethod
     @as_awaitable_result
-    async def aget_or_create_asset(self, user_id: str) -> ContextResult[ConverterImageAsset]: ...
+    async def areplace_asset(self, user_id: str) -> ContextResult[ConverterImageAsset]: ...
 
     @abstractmethod
     @as_awaitable_result
-    async def aasset_exists(self, user_id: str) -> ContextResult[bool]: ...
+    async def atombstone_expired_assets(self, *, created_before: datetime, limit: int) -> ContextResult[int]: ...
 
     @abstractmethod
     @as_awaitable_result
-    async def adelete_asset(self, user_id: str) -> ContextResult[None]: ...
+    async def aget_due_tombstones(self, *, user_id: Optional[str] = None, limit: int) -> ContextResult[list[ImageAssetTombstone]]: ...
 
     @abstractmethod
     @as_awaitable_result
-    async def aget_or_create_asset_file[T: ImageAssetFile](self, user_id: str, *, params: CreateAssetFileParams[T]) -> ContextResult[T]: ...
+    async def adelete_tombstone(self, asset_id: UUID) -> ContextResult[None]: ...
+
+    @abstractmethod
+    @as_awaitable_result
+    async def areschedule_tombstone(self, asset_id: UUID, *, delay: timedelta, error: str) -> ContextResult[None]: ...
+
+    @abstractmethod
+    @as_awaitable_result
+    async def aget_converted_asset_files(self, user_id: str) -> ContextResult[list[ConverterConvertedImageAssetFile]]: ...
+
+    @abstractmethod
+    @as_awaitable_result
+    async def aget_converted_asset_file_ids(self, user_id: str) -> ContextResult[list[UUID]]: ...
+
+    @abstractmethod
+    @as_awaitable_result
+    async def aget_zip_archive(self, user_id: str) -> ContextResult[ConvertedZipArchive]: ...
+
+    @abstractmethod
+    @as_awaitable_result
+    async def asave_zip_archive(self, user_id: str, asset_id: UUID, *, zip_archive: ConvertedZipArchive) -> ContextResult[None]: ...
+
+    @abstractmethod
+    @as_awaitable_result
+    async def abulk_create_asset_files(
+        self,
+        user_id: str,
+        asset_id: UUID,
+        *,
+        params: Sequence[CreateConverterAssetFileParams],
+    ) -> ContextResult[list[Union[ConverterOriginalImageAssetFile, ConverterConvertedImageAssetFile]]]: ...
@@ -4,7 +4,7 @@ from pydantic import HttpUrl
 
 from core.result import ContextResult, as_awaitable_result
 from infrastructure.cloudinary.models import GetFilesResponse
-from infrastructure.repositories.converter_files.models import UploadFileParams
+from infrastructure.repositories.converter_files.models import UploadFileParams, ZipArchive
 
 
 class FilesRepositoryABC(ABC):
@@ -14,7 +14,11 @@ class FilesRepositoryABC(ABC):
 
     @abstractmethod
     @as_awaitable_result
-    async def azip_folder(self, user_id: str, relative_folder_path: str) -> ContextResult[HttpUrl]: ...
+    async def azip_folder(self, user_id: str, relative_folder_path: str) -> ContextResult[ZipArchive]: ...
+
+    @abstractmethod
+    @as_awaitable_result
+    async def adownload_file(self, file_url: HttpUrl) -> ContextResult[bytes]: ...
 
     @abstractmethod
     @as_awaitable_result
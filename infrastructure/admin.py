@@ -14,7 +14,9 @@ from infrastructure.database.models.api import APIKeyDo
 from infrastructure.database.models.converter import (
     ConverterConvertedImageAssetFileDo,
     ConverterImageAssetDo,
+    ConverterImageAssetTombstoneDo,
     ConverterOriginalImageAssetFileDo,
+    ConverterZipArchiveDo,
 )
 from infrastructure.database.models.editor import (
     EditorEditedImageAssetDo,
@@ -128,6 +130,19 @@ class ConverterConvertedImageAssetFileAdmin(admin.ModelAdmin[ConverterConvertedI
     list_filter = ("image_asset",)
 
 
+@admin.register(ConverterImageAssetTombstoneDo)
+class ConverterImageAssetTombstoneAdmin(admin.ModelAdmin[ConverterImageAssetTombstoneDo]):
+    list_display = ("asset_id", "user_id", "attempts", "available_at", "last_error", "created_at")
+    list_filter = ("created_at", "user_id")
+    date_hierarchy = "created_at"
+
+
+@admin.register(ConverterZipArchiveDo)
+class ConverterZipArchiveAdmin(admin.ModelAdmin[ConverterZipArchiveDo]):
+    list_display = ("image_asset", "fingerprint", "expires_at", "created_at")
+    date_hierarchy = "created_at"
+
+
 @admin.register(EditorOriginalImageAssetDo)
 class EditorOriginalImageAssetAdmin(admin.ModelAdmin[EditorOriginalImageAssetDo]):
     class EditorOriginalImageAssetFileInline(admin.TabularInline[EditorOriginalImageAssetFileDo]):
@@ -1,77 +1,227 @@
+import asyncio
+import contextlib
 import hashlib
+import os
+import uuid
 from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from http import HTTPMethod
-from typing import Collection, Final, MutableMapping, Optional, final
+from io import BytesIO
+from pathlib import Path
+from typing import Any, AsyncIterator, BinaryIO, Collection, Final, Iterable, MutableMapping, Optional, Sequence, Union, final
 
-from hishel import AsyncSqliteStorage, SpecificationPolicy
-from hishel.httpx import AsyncCacheTransport
-from httpx import AsyncClient, AsyncHTTPTransport, BasicAuth, Timeout
+from httpx import AsyncClient, AsyncHTTPTransport, BasicAuth, HTTPError, Limits, QueryParams, Response, Timeout, TransportError
 from pydantic import BaseModel
+from types_linq import Enumerable
 
+from core.abc.byte_cache_abc import ByteCacheABC
 from core.abc.logger_abc import LoggerABC
+from core.caches.models import CacheStats
+from core.resilience.circuit_breaker import CircuitBreaker
+from core.resilience.retry_policy import RetryPolicy
 from core.result import ContextResult, ErrorContext, as_awaitable_result
 from core.utils import BoolUtils
-from infrastructure.cloudinary.models import DeleteFileResponse, GenerateZipResponse, GetFilesResponse, UploadFileResponse
-from infrastructure.cloudinary.types import QueryParamTypes, RequestData, RequestFiles
+from infrastructure.cloudinary.models import (
+    ConnectionPoolMetrics,
+    DeleteFileResponse,
+    GenerateZipResponse,
+    GetFilesResponse,
+    ResilienceMetrics,
+    UploadChunkResponse,
+    UploadFileResponse,
+)
+from infrastructure.cloudinary.tracing_transport import TracingTransport
+from infrastructure.cloudinary.types import PrimitiveData, QueryParamTypes, RequestData, RequestFiles
 from webpeditor import settings
 
 
 @final
 class CloudinaryClient:
     __MAX_RESULTS: Final[int] = 500
-    __EXPIRATION_IN_SECONDS: Final[int] = 60 * 15  # 15 minutes
+    __MAX_DELETES_PER_REQUEST: Final[int] = 100
+    __MAX_CONCURRENT_DELETES: Final[int] = 4
+    __TRANSIENT_STATUS_CODES: Final[frozenset[int]] = frozenset({429, 500, 502, 503, 504})
+    __FOLDER_VERSION_KEY_PREFIX: Final[str] = "folder-version"
 
-    def __init__(self, logger: LoggerABC) -> None:
+    def __init__(self, cache: ByteCacheABC, logger: LoggerABC) -> None:
+        self.__cache: Final[ByteCacheABC] = cache
         self.__logger: Final[LoggerABC] = logger
+        self.__retry_policy: Final[RetryPolicy] = RetryPolicy(
+            settings.CLOUDINARY_RETRY_MAX_ATTEMPTS,
+            settings.CLOUDINARY_RETRY_BASE_DELAY_SECONDS,
+            settings.CLOUDINARY_RETRY_MAX_DELAY_SECONDS,
+        )
+        self.__circuit_breakers: Final[dict[str, CircuitBreaker]] = {}
+        self.__retries: int = 0
+        self.__client: Optional[AsyncClient] = None
+        self.__client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.__requests_total: int = 0
+        self.__requests_in_flight: int = 0
+        self.__connections_opened: int = 0
+
+    async def astart(self) -> None:
+        await self.__aget_client()
+
+    async def aclose(self) -> None:
+        client, self.__client, self.__client_loop = self.__client, None, None
+        if client is not None:
+            await client.aclose()
+            self.__logger.debug(
+                f"Closed Cloudinary connection pool. {self.get_pool_metrics()} {self.get_resilience_metrics()} {self.get_cache_stats()}"
+            )
+
+    def get_pool_metrics(self) -> ConnectionPoolMetrics:
+        return ConnectionPoolMetrics(
+            requests_total=self.__requests_total,
+            requests_in_flight=self.__requests_in_flight,
+            connections_opened=self.__connections_opened,
+        )
+
+    def get_resilience_metrics(self) -> ResilienceMetrics:
+        return ResilienceMetrics(
+            retries=self.__retries,
+            circuit_breaker_trips=sum(circuit_breaker.trips for circuit_breaker in self.__circuit_breakers.values()),
+            open_circuits=[
+                endpoint
+                for endpoint, circuit_breaker in self.__circuit_breakers.items()
+                if circuit_breaker.state != CircuitBreaker.State.CLOSED
+            ],
+        )
+
+    def get_cache_stats(self) -> CacheStats:
+        return self.__cache.get_stats()
 
     @as_awaitable_result
     async def aupload_file(
         self,
         folder: str,
         public_id: str,
-        content: bytes,
+        content: Union[bytes, Path],
     ) -> ContextResult[UploadFileResponse]:
-        return await self.__asend_request(
-            HTTPMethod.POST,
-            "image/upload",
-            data=self.__create_request_data_with_signature(
-                {
-                    "public_id": public_id,
-                    "asset_folder": folder,
-                    "use_filename": BoolUtils.to_str(True),
-                    "overwrite": BoolUtils.to_str(True),
-                    "access_mode": "public",
-                }
-            ),
-            files={"file": content},
-            response_type=UploadFileResponse,
+        data = self.__create_request_data_with_signature(
+            {
+                "public_id": public_id,
+                "asset_folder": folder,
+                "use_filename": BoolUtils.to_str(True),
+                "overwrite": BoolUtils.to_str(True),
+                "access_mode": "public",
+            }
         )
 
+        # Files are read from the disk while the body is sent. Larger files are sent in chunks of the upload API,
+        # so at most one chunk is held in memory per request
+        with content.open("rb") if isinstance(content, Path) else BytesIO(content) as file:
+            size = file.seek(0, os.SEEK_END)
+            file.seek(0)
+
+            result = await (
+                self.__asend_request(
+                    HTTPMethod.POST,
+                    "image/upload",
+                    data=data,
+                    files={"file": file},
+                    response_type=UploadFileResponse,
+                )
+                if size <= settings.CLOUDINARY_UPLOAD_CHUNK_SIZE_BYTES
+                else self.__aupload_chunks(file, size, data)
+            )
+
+        await self.__arenew_folder_versions([folder])
+        return result
+
     @as_awaitable_result
     async def aget_files(self, folder_path: str) -> ContextResult[GetFilesResponse]:
-        return await self.__asend_request(
-            HTTPMethod.GET,
-            "resources/by_asset_folder",
-            query_params={"asset_folder": folder_path, "max_results": self.__MAX_RESULTS},
-            response_type=GetFilesResponse,
+        files: list[GetFilesResponse.FileData] = []
+
+        async for result in self.aiter_files(folder_path):
+            if result.is_error():
+                return result
+            files.extend(result.ok.files)
+
+        return ContextResult[GetFilesResponse].success(GetFilesResponse(total_count=len(files), resources=files, next_cursor=None))
+
+    async def aiter_files(self, folder_path: str) -> AsyncIterator[ContextResult[GetFilesResponse]]:
+        # All the pages are cached with the versions of the folder at the start of the listing
+        cache_version = await self.__aget_cache_version(folder_path)
+        next_cursor: Optional[str] = None
+
+        while True:
+            query_params: dict[str, PrimitiveData] = {"asset_folder": folder_path, "max_results": self.__MAX_RESULTS}
+            if next_cursor is not None:
+                query_params["next_cursor"] = next_cursor
+
+            result = await self.__asend_request(
+                HTTPMethod.GET,
+                "resources/by_asset_folder",
+                query_params=query_params,
+                response_type=GetFilesResponse,
+                cache_version=cache_version,
+            )
+            yield result
+
+            if result.is_error() or result.ok.next_cursor is None:
+                return
+
+            next_cursor = result.ok.next_cursor
+
+    @as_awaitable_result
+    async def adelete_files(self, public_ids: Collection[str], *, resource_type: str = "image") -> ContextResult[DeleteFileResponse]:
+        semaphore = asyncio.Semaphore(self.__MAX_CONCURRENT_DELETES)
+        # Built once, since unpacking a lazy sequence enumerates it more than once
+        deletions = (
+            Enumerable(public_ids)
+            .chunk(self.__MAX_DELETES_PER_REQUEST)
+            .select(lambda batch: self.__adelete_batch(batch, resource_type, semaphore))
+            .to_list()
+        )
+        results = await asyncio.gather(*deletions)
+        # Public IDs contain the folder path of their files
+        await self.__arenew_folder_versions({self.__get_parent_folder(public_id) for public_id in public_ids})
+
+        for result in results:
+            if result.is_error():
+                return result
+
+        return ContextResult[DeleteFileResponse].success(
+            DeleteFileResponse(deleted={public_id: status for result in results for public_id, status in result.ok.deleted.items()})
         )
 
     @as_awaitable_result
-    async def adelete_files(self, public_ids: Collection[str]) -> ContextResult[DeleteFileResponse]:
-        return (
-            await self.__asend_request(
+    async def adelete_files_by_prefix(self, prefix: str, *, resource_type: str = "image") -> ContextResult[DeleteFileResponse]:
+        deleted: dict[str, str] = {}
+        next_cursor: Optional[str] = None
+
+        # Cloudinary deletes a limited number of files per request and reports the rest as partial
+        while True:
+            query_params: dict[str, PrimitiveData] = {"prefix": prefix}
+            if next_cursor is not None:
+                query_params["next_cursor"] = next_cursor
+
+            result = await self.__asend_request(
                 HTTPMethod.DELETE,
-                "resources/image/upload",
-                query_params="&".join(f"public_ids[]={public_id}" for public_id in public_ids),
+                f"resources/{resource_type}/upload",
+                query_params=query_params,
                 response_type=DeleteFileResponse,
             )
-            if len(public_ids) > 0
-            else ContextResult[DeleteFileResponse].success(DeleteFileResponse(deleted={}))
-        )
+            await self.__arenew_folder_versions([self.__get_parent_folder(prefix)])
+            if result.is_error():
+                return result
+
+            deleted.update(result.ok.deleted)
+
+            if not result.ok.partial or result.ok.next_cursor is None:
+                return ContextResult[DeleteFileResponse].success(DeleteFileResponse(deleted=deleted))
+
+            next_cursor = result.ok.next_cursor
 
     @as_awaitable_result
-    async def agenerate_zip_archive(self, public_ids: Collection[str], zip_file_path: str) -> ContextResult[GenerateZipResponse]:
-        expires_at = str(int(datetime.now(timezone.utc).timestamp()) + self.__EXPIRATION_IN_SECONDS)
+    async def agenerate_zip_archive(
+        self,
+        public_ids: Collection[str],
+        zip_file_path: str,
+        *,
+        expires_at: datetime,
+    ) -> ContextResult[GenerateZipResponse]:
         params = {
             "resource_type": "image",
             "type": "upload",
@@ -79,19 +229,40 @@ class CloudinaryClient:
             "public_ids": ",".join(public_ids),
             "target_public_id": zip_file_path,
             "mode": "create",
-            "expires_at": expires_at,
+            "expires_at": str(int(expires_at.timestamp())),
         }
         request_data = self.__create_request_data_with_signature(params)
         request_data.pop("public_ids")
         request_data.setdefault("public_ids[]", list(public_ids))
 
-        return await self.__asend_request(
+        result = await self.__asend_request(
             HTTPMethod.POST,
             "image/generate_archive",
             data=request_data,
             files=[],  # Force multipart/form-data
             response_type=GenerateZipResponse,
         )
+        await self.__arenew_folder_versions([self.__get_parent_folder(zip_file_path)])
+        return result
+
+    @as_awaitable_result
+    async def adownload_file(self, file_url: str) -> ContextResult[bytes]:
+        # Delivery URLs are public, so API credentials are not sent to them
+        self.__requests_total += 1
+        self.__requests_in_flight += 1
+        try:
+            response = await (await self.__aget_client()).get(file_url, auth=None)
+        except HTTPError as error:
+            self.__logger.error(f"Unable to download file '{file_url}': {error}")
+            return ContextResult[bytes].failure(ErrorContext.server_error("Unable to download file"))
+        finally:
+            self.__requests_in_flight -= 1
+
+        if response.is_error:
+            self.__logger.error(f"Unable to download file: {response.status_code} {response.url}")
+            return ContextResult[bytes].failure(ErrorContext.server_error("Unable to download file"))
+
+        return ContextResult[bytes].success(response.content)
 
     def __create_request_data_with_signature(self, params: MutableMapping[str, str]) -> RequestData:
         keys = params.keys()
@@ -126,20 +297,221 @@ class CloudinaryClient:
         query_params: Optional[QueryParamTypes] = None,
         data: Optional[RequestData] = None,
         files: Optional[RequestFiles] = None,
+        headers: Optional[dict[str, str]] = None,
         response_type: type[T],
+        cache_version: Optional[str] = None,
     ) -> ContextResult[T]:
-        async with self.__get_client() as client:
-            response = await client.request(method, url, params=query_params, data=data, files=files)
-            if response.is_error:
-                self.__logger.error(f"Unexpected Cloudinary error occurred: {method} {response.status_code} {response.url} {response.text}")
-                return ContextResult[T].failure(ErrorContext.bad_request("Invalid request"))
+        # Only listings are cached. Uploads and deletes are sent as they are, and their bodies are never hashed
+        cache_key = self.__get_cache_key(cache_version, url, query_params) if cache_version is not None else None
+        if cache_key is not None:
+            cached_content = await self.__cache.aget(cache_key)
+            if cached_content.is_some():
+                return ContextResult[T].success(response_type.model_validate_json(cached_content.value))
+
+        result = await self.__asend_with_retries(method, url, query_params=query_params, data=data, files=files, headers=headers)
+
+        if result.is_error():
+            return ContextResult[T].failure(result.error)
+
+        if cache_key is not None:
+            await self.__cache.aset(cache_key, result.ok.content)
+
+        return ContextResult[T].success(response_type.model_validate(result.ok.json()))
 
-            return ContextResult[T].success(response_type.model_validate(response.json()))
+    @as_awaitable_result
+    async def __asend_with_retries(
+        self,
+        method: HTTPMethod,
+        url: str,
+        *,
+        query_params: Optional[QueryParamTypes],
+        data: Optional[RequestData],
+        files: Optional[RequestFiles],
+        headers: Optional[dict[str, str]],
+    ) -> ContextResult[Response]:
+        # Uploads overwrite the same public ID and deletes are idempotent, so every request is safe to retry
+        endpoint = f"{method} {url}"
+        circuit_breaker = self.__circuit_breakers.setdefault(
+            endpoint,
+            CircuitBreaker(
+                settings.CLOUDINARY_CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+                settings.CLOUDINARY_CIRCUIT_BREAKER_RESET_TIMEOUT_SECONDS,
+            ),
+        )
+
+        for attempt in range(self.__retry_policy.max_attempts):
+            if not circuit_breaker.allow_request():
+                self.__logger.error(f"Cloudinary circuit of '{endpoint}' is open. The request has been rejected")
+                return ContextResult[Response].failure(ErrorContext.server_error("Cloudinary is temporarily unavailable"))
+
+            response: Optional[Response] = None
+            self.__requests_total += 1
+            self.__requests_in_flight += 1
+            try:
+                response = await (await self.__aget_client()).request(
+                    method, url, params=query_params, data=data, files=files, headers=headers
+                )
+                failure_reason = f"{response.status_code} {response.reason_phrase}"
+            except TransportError as error:
+                failure_reason = f"{type(error).__name__} {error}"
+            except asyncio.CancelledError:
+                circuit_breaker.record_cancellation()
+                raise
+            finally:
+                self.__requests_in_flight -= 1
+
+            if response is not None and response.status_code not in self.__TRANSIENT_STATUS_CODES:
+                # Any other response, including a client error, shows that Cloudinary is available
+                circuit_breaker.record_success()
+                if response.is_error:
+                    self.__logger.error(
+                        f"Unexpected Cloudinary error occurred: {method} {response.status_code} {response.url} {response.text}"
+                    )
+                    return ContextResult[Response].failure(ErrorContext.bad_request("Invalid request"))
+                return ContextResult[Response].success(response)
+
+            if circuit_breaker.record_failure():
+                self.__logger.error(f"Cloudinary circuit of '{endpoint}' has been opened after {failure_reason}")
+
+            if attempt + 1 < self.__retry_policy.max_attempts:
+                delay = self.__retry_policy.get_delay(attempt, self.__get_retry_after_seconds(response))
+                self.__retries += 1
+                self.__logger.info(f"Retrying '{endpoint}' in {delay:.2f}s after {failure_reason} (attempt {attempt + 1})")
+                await asyncio.sleep(delay)
+            else:
+                self.__logger.error(f"Cloudinary request '{endpoint}' failed after {attempt + 1} attempt(s): {failure_reason}")
+
+        return ContextResult[Response].failure(ErrorContext.server_error("Cloudinary is unavailable"))
+
+    @staticmethod
+    def __get_retry_after_seconds(response: Optional[Response]) -> Optional[float]:
+        # Retry-After holds either a number of seconds or an HTTP date
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after is None:
+            return None
+        if retry_after.isdigit():
+            return float(retry_after)
+
+        try:
+            return (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+        except ValueError:
+            return None
+
+    async def __aget_cache_version(self, folder_path: str) -> str:
+        # Listings are cached under the versions of their folder and of each parent folder, which are kept in the cache
+        # itself, so processes that share it also share the listings. Changes renew the version of the deepest folder
+        # that contains them, so only listings of that folder and its subfolders are no longer reused
+        segments = [segment for segment in folder_path.split("/") if segment]
+        folder_paths = ["/".join(segments[:index]) for index in range(len(segments) + 1)]
+        return " ".join([await self.__aget_folder_version(path) for path in folder_paths])
+
+    async def __aget_folder_version(self, folder_path: str) -> str:
+        version = await self.__cache.aget(f"{self.__FOLDER_VERSION_KEY_PREFIX} {folder_path}")
+        # A version that is missing or evicted is replaced by a new one, so listings cached before are never reused
+        return version.value.decode() if version.is_some() else await self.__arenew_folder_version(folder_path)
+
+    async def __arenew_folder_versions(self, folder_paths: Iterable[str]) -> None:
+        for folder_path in folder_paths:
+            await self.__arenew_folder_version(folder_path)
+
+    async def __arenew_folder_version(self, folder_path: str) -> str:
+        version = uuid.uuid4().hex
+        await self.__cache.aset(f"{self.__FOLDER_VERSION_KEY_PREFIX} {folder_path}", version.encode())
+        return version
+
+    @staticmethod
+    def __get_parent_folder(path: str) -> str:
+        return path.rsplit("/", 1)[0] if "/" in path else ""
 
     @staticmethod
-    def __get_client() -> AsyncClient:
-        policy = SpecificationPolicy()
-        policy.use_body_key = True
+    def __get_cache_key(cache_version: str, url: str, query_params: Optional[QueryParamTypes]) -> str:
+        return hashlib.sha256(f"{cache_version} {url} {QueryParams(query_params)}".encode()).hexdigest()
+
+    @as_awaitable_result
+    async def __aupload_chunks(self, file: BinaryIO, size: int, data: RequestData) -> ContextResult[UploadFileResponse]:
+        # Cloudinary assembles the chunks that share the upload ID. The file is uploaded once the last chunk is received
+        upload_id = uuid.uuid4().hex
+        last_chunk_start = (size - 1) // settings.CLOUDINARY_UPLOAD_CHUNK_SIZE_BYTES * settings.CLOUDINARY_UPLOAD_CHUNK_SIZE_BYTES
+
+        for chunk_start in range(0, last_chunk_start, settings.CLOUDINARY_UPLOAD_CHUNK_SIZE_BYTES):
+            result = await self.__aupload_chunk(file, chunk_start, size, upload_id, data, UploadChunkResponse)
+            if result.is_error():
+                return ContextResult[UploadFileResponse].failure(result.error)
+
+        return await self.__aupload_chunk(file, last_chunk_start, size, upload_id, data, UploadFileResponse)
+
+    @as_awaitable_result
+    async def __aupload_chunk[T: BaseModel](
+        self,
+        file: BinaryIO,
+        chunk_start: int,
+        size: int,
+        upload_id: str,
+        data: RequestData,
+        response_type: type[T],
+    ) -> ContextResult[T]:
+        chunk = await asyncio.to_thread(file.read, settings.CLOUDINARY_UPLOAD_CHUNK_SIZE_BYTES)
+        return await self.__asend_request(
+            HTTPMethod.POST,
+            "image/upload",
+            data=data,
+            files={"file": ("file", chunk)},
+            headers={"X-Unique-Upload-Id": upload_id, "Content-Range": f"bytes {chunk_start}-{chunk_start + len(chunk) - 1}/{size}"},
+            response_type=response_type,
+        )
+
+    @as_awaitable_result
+    async def __adelete_batch(
+        self,
+        public_ids: Sequence[str],
+        resource_type: str,
+        semaphore: asyncio.Semaphore,
+    ) -> ContextResult[DeleteFileResponse]:
+        async with semaphore:
+            return await self.__asend_request(
+                HTTPMethod.DELETE,
+                f"resources/{resource_type}/upload",
+                query_params=[("public_ids[]", public_id) for public_id in public_ids],
+                response_type=DeleteFileResponse,
+            )
+
+    async def __atrace(self, event_name: str, _: dict[str, Any]) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            self.__connections_opened += 1
+
+    async def __aget_client(self) -> AsyncClient:
+        # Pooled connections are bound to the event loop they were opened in.
+        # A client is therefore created lazily and re-created only when the running loop changes
+        loop = asyncio.get_running_loop()
+        if self.__client is not None and self.__client_loop is loop:
+            return self.__client
+
+        # Replaced before the stale client is closed, so concurrent requests never see the stale client
+        stale_client, stale_loop = self.__client, self.__client_loop
+        client = self.__client = self.__create_client()
+        self.__client_loop = loop
+        self.__logger.debug(f"Created Cloudinary connection pool. {self.get_pool_metrics()}")
+
+        if stale_client is not None and stale_loop is not None:
+            await self.__aclose_stale_client(stale_client, stale_loop)
+
+        return client
+
+    async def __aclose_stale_client(self, client: AsyncClient, loop: asyncio.AbstractEventLoop) -> None:
+        try:
+            if loop.is_running():
+                # Connections are closed by the loop they belong to, which runs in another thread
+                await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(client.aclose(), loop))
+            else:
+                # Connections of a loop that is no longer running are released with it, and closing them fails.
+                # The client is still marked as closed, so it is not reported as leaked
+                with contextlib.suppress(RuntimeError):
+                    await client.aclose()
+            self.__logger.debug("Closed stale Cloudinary connection pool")
+        except Exception as exception:
+            self.__logger.exception(exception, "Unable to close stale Cloudinary connection pool")
+
+    def __create_client(self) -> AsyncClient:
         return AsyncClient(
             base_url=f"{settings.CLOUDINARY_BASE_URL}/v1_1/{settings.CLOUDINARY_CLOUD_NAME}/",
             auth=BasicAuth(
@@ -152,9 +524,15 @@ class CloudinaryClient:
                 write=30.0,
                 pool=5.0,
             ),
-            transport=AsyncCacheTransport(
-                next_transport=AsyncHTTPTransport(),
-                storage=AsyncSqliteStorage(database_path=f"{CloudinaryClient.__name__}.db", default_ttl=3600),
-                policy=policy,
+            transport=TracingTransport(
+                next_transport=AsyncHTTPTransport(
+                    http2=settings.CLOUDINARY_HTTP2_ENABLED,
+                    limits=Limits(
+                        max_connections=settings.CLOUDINARY_HTTP_MAX_CONNECTIONS,
+                        max_keepalive_connections=settings.CLOUDINARY_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                        keepalive_expiry=float(settings.CLOUDINARY_HTTP_KEEPALIVE_EXPIRY_SECONDS),
+                    ),
+                ),
+                trace=self.__atrace,
             ),
         )
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from ninja import Field
 from pydantic import BaseModel, ConfigDict, HttpUrl
 
@@ -7,6 +9,7 @@ class GetFilesResponse(BaseModel):
 
     total_count: int = Field(alias="total_count")
     files: list["GetFilesResponse.FileData"] = Field(alias="resources")
+    next_cursor: Optional[str] = Field(default=None, alias="next_cursor")
 
     class FileData(BaseModel):
         model_config = ConfigDict(frozen=True, strict=True, populate_by_name=True)
@@ -26,6 +29,8 @@ class DeleteFileResponse(BaseModel):
     model_config = ConfigDict(frozen=True, strict=True, populate_by_name=True)
 
     deleted: dict[str, str] = Field(alias="deleted")
+    partial: bool = Field(default=False, alias="partial")
+    next_cursor: Optional[str] = Field(default=None, alias="next_cursor")
 
 
 class UploadFileResponse(BaseModel):
@@ -39,3 +44,25 @@ class GenerateZipResponse(BaseModel):
     model_config = ConfigDict(frozen=True, strict=True, populate_by_name=True)
 
     secure_url: HttpUrl = Field(alias="secure_url")
+
+
+class UploadChunkResponse(BaseModel):
+    model_config = ConfigDict(frozen=True, strict=True, populate_by_name=True)
+
+    done: bool = Field(default=False, alias="done")
+
+
+class ConnectionPoolMetrics(BaseModel):
+    model_config = ConfigDict(frozen=True, strict=True, extra="forbid")
+
+    requests_total: int
+    requests_in_flight: int
+    connections_opened: int
+
+
+class ResilienceMetrics(BaseModel):
+    model_config = ConfigDict(frozen=True, strict=True, extra="forbid")
+
+    retries: int
+    circuit_breaker_trips: int
+    open_circuits: list[str]
@@ -0,0 +1,20 @@
+from typing import Any, Awaitable, Callable, Final, final
+
+from httpx import AsyncBaseTransport, Request, Response
+
+type TraceCallback = Callable[[str, dict[str, Any]], Awaitable[None]]
+
+
+@final
+class TracingTransport(AsyncBaseTransport):
+    def __init__(self, next_transport: AsyncBaseTransport, trace: TraceCallback) -> None:
+        self.__next_transport: Final[AsyncBaseTransport] = next_transport
+        self.__trace: Final[TraceCallback] = trace
+
+    async def handle_async_request(self, request: Request) -> Response:
+        # Attached at the transport level, so every request of the client is traced without passing the extension
+        request.extensions["trace"] = self.__trace
+        return await self.__next_transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self.__next_transport.aclose()
@@ -0,0 +1,29 @@
+# Generated by Django 6.0.4 on 2026-10-18 10:35
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("infrastructure", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ConverterImageAssetTombstoneDo",
+            fields=[
+                ("asset_id", models.UUIDField(editable=False, primary_key=True, serialize=False)),
+                ("user_id", models.CharField(max_length=100)),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("available_at", models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ("last_error", models.TextField(blank=True)),
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                "verbose_name": "Converter Image Asset Tombstone",
+                "verbose_name_plural": "Converter Image Asset Tombstones",
+                "ordering": ["available_at"],
+            },
+        ),
+    ]
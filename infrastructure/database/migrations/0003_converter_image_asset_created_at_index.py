@@ -0,0 +1,16 @@
+# Generated by Django 6.0.4 on 2026-10-18 10:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("infrastructure", "0002_converter_image_asset_tombstone"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="converterimageassetdo",
+            index=models.Index(fields=["created_at", "id"], name="converter_asset_created_idx"),
+        ),
+    ]
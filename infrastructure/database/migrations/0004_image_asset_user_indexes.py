@@ -0,0 +1,24 @@
+# Generated by Django 6.0.4 on 2026-10-18 10:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("infrastructure", "0003_converter_image_asset_created_at_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="converterimageassetdo",
+            index=models.Index(fields=["user_id", "-created_at"], name="converter_asset_user_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="editoreditedimageassetdo",
+            index=models.Index(fields=["user_id", "-created_at"], name="editor_edited_asset_user_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="editororiginalimageassetdo",
+            index=models.Index(fields=["user_id", "-created_at"], name="editor_original_asset_user_idx"),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 6.0.4 on 2026-10-18 10:50
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("infrastructure", "0004_image_asset_user_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ConverterZipArchiveDo",
+            fields=[
+                (
+                    "image_asset",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="zip_archive",
+                        serialize=False,
+                        to="infrastructure.converterimageassetdo",
+                    ),
+                ),
+                ("fingerprint", models.CharField(max_length=64)),
+                ("url", models.URLField(max_length=500)),
+                ("expires_at", models.DateTimeField()),
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                "verbose_name": "Converter Zip Archive",
+                "verbose_name_plural": "Converter Zip Archives",
+            },
+        ),
+    ]
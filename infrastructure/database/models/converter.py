@@ -1,11 +1,20 @@
+import uuid
+from datetime import datetime
+
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
+from django_stubs_ext import StrOrPromise
 
 from infrastructure.database.models.base import BaseImageAssetDo, BaseImageAssetFileDo
 
 
 class ConverterImageAssetDo(BaseImageAssetDo):
     class Meta(BaseImageAssetDo.Meta):
+        indexes: list[models.Index] = [
+            models.Index(fields=["user_id", "-created_at"], name="converter_asset_user_idx"),
+            models.Index(fields=["created_at", "id"], name="converter_asset_created_idx"),
+        ]
         verbose_name: str = _("Converter Image Asset")
         verbose_name_plural: str = _("Converter Image Assets")
 
@@ -32,3 +41,42 @@ class ConverterConvertedImageAssetFileDo(BaseImageAssetFileDo):
     class Meta(BaseImageAssetFileDo.Meta):
         verbose_name: str = _("Converter Converted Image Asset File")
         verbose_name_plural: str = _("Converter Converted Image Asset Files")
+
+
+class ConverterZipArchiveDo(models.Model):
+    # Archive of the converted files of the Image Asset. It is reused while its fingerprint matches the converted files
+    image_asset: models.OneToOneField[ConverterImageAssetDo] = models.OneToOneField(
+        ConverterImageAssetDo,
+        primary_key=True,
+        related_name="zip_archive",
+        on_delete=models.CASCADE,
+    )
+    fingerprint: models.CharField[str, str] = models.CharField(max_length=64)
+    url: models.URLField[str, str] = models.URLField(max_length=500)
+    expires_at: models.DateTimeField[datetime, datetime] = models.DateTimeField()
+    created_at: models.DateTimeField[datetime, datetime] = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name: StrOrPromise = _("Converter Zip Archive")
+        verbose_name_plural: StrOrPromise = _("Converter Zip Archives")
+
+    def __str__(self) -> str:
+        return self.url
+
+
+class ConverterImageAssetTombstoneDo(models.Model):
+    # Records of the Image Asset are already deleted. The row is kept until its remote files are deleted as well
+    asset_id: models.UUIDField[uuid.UUID, uuid.UUID] = models.UUIDField(primary_key=True, editable=False)
+    user_id: models.CharField[str, str] = models.CharField(max_length=100)
+    attempts: models.PositiveIntegerField[int, int] = models.PositiveIntegerField(default=0)
+    available_at: models.DateTimeField[datetime, datetime] = models.DateTimeField(default=timezone.now, db_index=True)
+    last_error: models.TextField[str, str] = models.TextField(blank=True)
+    created_at: models.DateTimeField[datetime, datetime] = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering: list[str] = ["available_at"]
+        verbose_name: StrOrPromise = _("Converter Image Asset Tombstone")
+        verbose_name_plural: StrOrPromise = _("Converter Image Asset Tombstones")
+
+    def __str__(self) -> str:
+        return str(self.asset_id)
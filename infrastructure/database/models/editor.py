@@ -7,6 +7,7 @@ from infrastructure.database.models.base import BaseImageAssetDo, BaseImageAsset
 # TODO: Merge into one EditorImageAsset that will contain 2 asset files - EditorOriginalImageAssetFile and EditorEditedImageAssetFile
 class EditorOriginalImageAssetDo(BaseImageAssetDo):
     class Meta(BaseImageAssetDo.Meta):
+        indexes: list[models.Index] = [models.Index(fields=["user_id", "-created_at"], name="editor_original_asset_user_idx")]
         verbose_name: str = _("Editor Original Image Asset")
         verbose_name_plural: str = _("Editor Original Image Assets")
 
@@ -31,6 +32,7 @@ class EditorEditedImageAssetDo(BaseImageAssetDo):
     )
 
     class Meta(BaseImageAssetDo.Meta):
+        indexes: list[models.Index] = [models.Index(fields=["user_id", "-created_at"], name="editor_edited_asset_user_idx")]
         verbose_name: str = _("Editor Edited Image Asset")
         verbose_name_plural: str = _("Editor Edited Image Assets")
 
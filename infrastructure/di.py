@@ -2,7 +2,11 @@ from typing import Annotated
 
 from anydi import Module, provider
 
+from core.abc.byte_cache_abc import ByteCacheABC
 from core.abc.logger_abc import LoggerABC
+from core.caches.memory_byte_cache import MemoryByteCache
+from core.caches.sqlite_byte_cache import SqliteByteCache
+from core.caches.tiered_byte_cache import TieredByteCache
 from infrastructure.abc.converter_image_assets_repository_abc import ConverterImageAssetsRepositoryABC
 from infrastructure.abc.editor_image_assets_repository_abc import EditorImageAssetsRepositoryABC
 from infrastructure.abc.files_repository_abc import FilesRepositoryABC
@@ -10,14 +14,39 @@ from infrastructure.cloudinary.cloudinary_client import CloudinaryClient
 from infrastructure.repositories.converter_files.converter_files_repository import ConverterFilesRepository
 from infrastructure.repositories.converter_image_assets.converter_image_assets_repository import ConverterImageAssetsRepository
 from infrastructure.repositories.editor_image_assets.editor_image_assets_repository import EditorImageAssetsRepository
+from infrastructure.repositories.local_files.local_files_repository import LocalFilesRepository
+from webpeditor import settings
 
 
 class InfrastructureModule(Module):
     @provider(scope="singleton")
-    def provide_cloudinary_client(self, logger: LoggerABC) -> CloudinaryClient:
-        return CloudinaryClient(logger)
+    def provide_cloudinary_cache(self, logger: LoggerABC) -> Annotated[ByteCacheABC, CloudinaryClient.__name__]:
+        memory_cache = MemoryByteCache(settings.CLOUDINARY_CACHE_MAX_SIZE_BYTES, settings.CLOUDINARY_CACHE_TTL_SECONDS)
+        match settings.CLOUDINARY_CACHE_BACKEND:
+            case "memory":
+                return memory_cache
+            case "tiered":
+                return TieredByteCache(
+                    memory_cache,
+                    SqliteByteCache(
+                        settings.CLOUDINARY_CACHE_DATABASE_PATH,
+                        settings.CLOUDINARY_CACHE_MAX_SIZE_BYTES,
+                        settings.CLOUDINARY_CACHE_TTL_SECONDS,
+                        logger,
+                    ),
+                )
+            case backend:
+                raise ValueError(f"Unsupported Cloudinary cache backend '{backend}'")
 
-    @provider(scope="request")
+    @provider(scope="singleton")
+    def provide_cloudinary_client(
+        self,
+        cache: Annotated[ByteCacheABC, CloudinaryClient.__name__],
+        logger: LoggerABC,
+    ) -> CloudinaryClient:
+        return CloudinaryClient(cache, logger)
+
+    @provider(scope="singleton")
     def provide_converter_image_assets_repository(self, logger: LoggerABC) -> ConverterImageAssetsRepositoryABC:
         return ConverterImageAssetsRepository(logger)
 
@@ -27,7 +56,13 @@ class InfrastructureModule(Module):
         logger: LoggerABC,
         cloudinary_client: CloudinaryClient,
     ) -> Annotated[FilesRepositoryABC, ConverterFilesRepository.__name__]:
-        return ConverterFilesRepository(cloudinary_client, logger)
+        match settings.CONVERTER_FILES_BACKEND:
+            case "cloudinary":
+                return ConverterFilesRepository(cloudinary_client, logger)
+            case "local":
+                return LocalFilesRepository(logger)
+            case backend:
+                raise ValueError(f"Unsupported converter files backend '{backend}'")
 
     @provider(scope="request")
     def provide_editor_image_assets_repository(self) -> EditorImageAssetsRepositoryABC:
@@ -0,0 +1,30 @@
+import asyncio
+from typing import Final
+
+from anydi_django import container
+from django_extensions.management.jobs import HourlyJob
+
+from application.converter.services.abc.expired_image_assets_sweeper_abc import ExpiredImageAssetsSweeperABC
+from infrastructure.cloudinary.cloudinary_client import CloudinaryClient
+
+
+class CleanupJob(HourlyJob):
+    help = "Clean up expired users data"
+
+    def __init__(self) -> None:
+        self.__sweeper: Final[ExpiredImageAssetsSweeperABC] = container.resolve(ExpiredImageAssetsSweeperABC)
+        self.__cloudinary_client: Final[CloudinaryClient] = container.resolve(CloudinaryClient)
+
+    def execute(self) -> None:
+        asyncio.run(self.__aexecute())
+
+    async def __aexecute(self) -> None:
+        try:
+            await self.__sweeper.asweep()
+        finally:
+            # The connection pool is bound to the event loop of this run
+            await self.__cloudinary_client.aclose()
+
+
+# Jobs are discovered by this name
+Job = CleanupJob
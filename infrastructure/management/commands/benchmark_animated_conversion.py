@@ -0,0 +1,81 @@
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from PIL import Image, ImageDraw, ImageSequence
+
+
+class Command(BaseCommand):
+    help = "Convert a generated animated GIF with all the frames copied up front and with the frames streamed by the converter"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--frames", type=int, default=200, help="Number of frames of the animation")
+        parser.add_argument("--width", type=int, default=480, help="Width of the animation")
+        parser.add_argument("--height", type=int, default=360, help="Height of the animation")
+        parser.add_argument("--quality", type=int, default=80, help="Quality of the converted animation")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        content = _create_animation(options["frames"], options["width"], options["height"])
+        self.stdout.write(f"Source: {options['frames']} frames of {options['width']}x{options['height']}, {len(content) / 1024:.0f} KiB")
+
+        self.stdout.write(f"{'Format':<8}{'Strategy':<12}{'Frames':>8}{'Seconds':>10}{'Size KiB':>11}{'Peak RSS MiB':>15}")
+        for output_format in ("WEBP", "GIF"):
+            for strategy in ("eager", "streamed"):
+                # Every run gets a fresh process, so its peak memory is not inflated by the previous runs
+                with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+                    frames, elapsed, size, peak_rss = pool.submit(_convert, content, output_format, options["quality"], strategy).result()
+                self.stdout.write(f"{output_format:<8}{strategy:<12}{frames:>8}{elapsed:>10.2f}{size / 1024:>11.0f}{peak_rss:>15.1f}")
+
+
+def _create_animation(frame_count: int, width: int, height: int) -> bytes:
+    frames: list[Image.Image] = []
+    for index in range(frame_count):
+        frame = Image.new("RGB", (width, height), (index % 256, 64, 255 - index % 256))
+        draw = ImageDraw.Draw(frame)
+        offset = index * 4 % width
+        draw.ellipse((offset, height // 4, offset + width // 4, height // 4 * 3), fill=(255, 255 - index % 256, 0))
+        frames.append(frame)
+
+    with BytesIO() as buffer:
+        frames[0].save(buffer, "GIF", save_all=True, append_images=frames[1:], duration=40, loop=0)
+        return buffer.getvalue()
+
+
+def _convert(content: bytes, output_format: str, quality: int, strategy: str) -> tuple[int, float, int, float]:
+    import os
+
+    import django
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "webpeditor.settings")
+    django.setup()
+
+    from application.converter.services.image_file_converter_worker import ImageFileConverterWorker
+
+    # The peak resident memory is reset, so only the conversion is measured (Linux only)
+    Path("/proc/self/clear_refs").write_text("5")
+    started_at = time.perf_counter()
+    if strategy == "eager":
+        # Mirrors a conversion with the same encoder options that copies every frame before encoding
+        with Image.open(BytesIO(content)) as file, BytesIO() as buffer:
+            frames = [frame.convert("RGBA") for frame in ImageSequence.Iterator(file)]
+            save_args: dict[str, Any] = (
+                {"quality": quality, "method": 4 if quality < 90 else 5, "lossless": quality >= 98}
+                if output_format == "WEBP"
+                else {"optimize": True}
+            )
+            frames[0].save(buffer, output_format, save_all=True, append_images=frames[1:], loop=0, **save_args)
+            converted = buffer.getvalue()
+    else:
+        converted = ImageFileConverterWorker.convert(content, ImageFileConverterWorker.Params.create(output_format, quality))
+    elapsed = time.perf_counter() - started_at
+
+    peak_rss_kib = next(int(line.split()[1]) for line in Path("/proc/self/status").read_text().splitlines() if line.startswith("VmHWM:"))
+
+    with Image.open(BytesIO(converted)) as result:
+        frame_count: int = getattr(result, "n_frames", 1)
+
+    return frame_count, elapsed, len(converted), peak_rss_kib / 1024
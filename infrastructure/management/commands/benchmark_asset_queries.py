@@ -0,0 +1,166 @@
+import asyncio
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Final
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connection
+from django.test.utils import setup_databases, teardown_databases
+
+from application.common.services.models.file_info import ImageFileInfo
+from core.logging.logger import Logger
+from domain.converter.models import ConverterConvertedImageAssetFile, ConverterOriginalImageAssetFile
+from infrastructure.database.models.converter import ConverterImageAssetDo
+from infrastructure.repositories.converter_image_assets.converter_image_assets_repository import ConverterImageAssetsRepository
+from infrastructure.repositories.converter_image_assets.models import CreateAssetFileParams, CreateConverterAssetFileParams
+
+type _Benchmark = Callable[[str], Awaitable[object]]
+
+
+class Command(BaseCommand):
+    help = "Seed a throwaway SQLite database with converter assets and report repository query latencies with and without indexes"
+
+    __SEED_BATCH_SIZE: Final[int] = 50_000
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--rows", type=int, default=1_000_000, help="Number of seeded asset rows")
+        parser.add_argument("--iterations", type=int, default=200, help="Number of calls per repository method")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed of the generated data")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        # The test database is created from the migrations and destroyed afterwards, so the real database is never touched
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            # Reproducible data only, nothing security related depends on it
+            rnd = random.Random(options["seed"])  # noqa: S311
+            user_ids = self.__seed(options["rows"], rnd)
+            self.__explain(user_ids[0])
+
+            with_indexes = self.__run(user_ids, options["iterations"], rnd)
+            dropped_indexes = self.__drop_indexes()
+            without_indexes = self.__run(user_ids, options["iterations"], rnd)
+
+            self.stdout.write(f"\nDropped for the baseline: {', '.join(dropped_indexes)}")
+            self.stdout.write(f"{'Method':<30}{'p50 without':>14}{'p95 without':>14}{'p50 with':>12}{'p95 with':>12}")
+            for name, latencies in with_indexes.items():
+                baseline = without_indexes[name]
+                self.stdout.write(
+                    f"{name:<30}{self.__ms(baseline, 50):>14}{self.__ms(baseline, 95):>14}"
+                    f"{self.__ms(latencies, 50):>12}{self.__ms(latencies, 95):>12}"
+                )
+        finally:
+            teardown_databases(old_config, verbosity=0)
+
+    def __seed(self, rows: int, rnd: random.Random) -> list[str]:
+        # Rows are inserted with plain executemany, since constructing a million models would dominate the run time
+        now = datetime.now(timezone.utc)
+        user_ids = [f"user-{index}" for index in range(rows)]
+        started_at = time.perf_counter()
+
+        with connection.cursor() as cursor:
+            for start in range(0, rows, self.__SEED_BATCH_SIZE):
+                assets = [
+                    (uuid.uuid4().hex, user_ids[index], now - timedelta(seconds=rnd.randrange(7 * 24 * 60 * 60)))
+                    for index in range(start, min(start + self.__SEED_BATCH_SIZE, rows))
+                ]
+                cursor.executemany("INSERT INTO infrastructure_converterimageassetdo (id, user_id, created_at) VALUES (%s, %s, %s)", assets)
+                cursor.executemany(
+                    "INSERT INTO infrastructure_converteroriginalimageassetfiledo (id, file_url, filename, filename_shorter, content_type, format, "
+                    "format_description, color_mode, exif_data, image_asset_id) VALUES (%s, '', '', '', 'image/webp', 'WEBP', '', "
+                    "'RGB', '{}', %s)",
+                    [(uuid.uuid4().hex, asset_id) for asset_id, _, _ in assets],
+                )
+            cursor.execute("ANALYZE")
+
+        self.stdout.write(f"Seeded {rows} assets and asset files in {time.perf_counter() - started_at:.1f}s")
+        return user_ids
+
+    def __explain(self, user_id: str) -> None:
+        queries = {
+            "exists by user": ("SELECT 1 FROM infrastructure_converterimageassetdo WHERE user_id = %s LIMIT 1", [user_id]),
+            "latest by user": (
+                "SELECT id FROM infrastructure_converterimageassetdo WHERE user_id = %s ORDER BY created_at DESC LIMIT 1",
+                [user_id],
+            ),
+            "expired batch": (
+                "SELECT id FROM infrastructure_converterimageassetdo WHERE created_at < %s ORDER BY created_at, id LIMIT 500",
+                [datetime.now(timezone.utc)],
+            ),
+            "files by asset": (
+                "SELECT id FROM infrastructure_converteroriginalimageassetfiledo WHERE image_asset_id = %s",
+                [uuid.uuid4().hex],
+            ),
+        }
+        with connection.cursor() as cursor:
+            for name, (query, params) in queries.items():
+                cursor.execute(f"EXPLAIN QUERY PLAN {query}", params)
+                self.stdout.write(f"{name}: {' | '.join(str(row[-1]) for row in cursor.fetchall())}")
+
+    def __run(self, user_ids: list[str], iterations: int, rnd: random.Random) -> dict[str, list[float]]:
+        repo = ConverterImageAssetsRepository(Logger())
+        params = self.__create_asset_file_params()
+        # Destructive methods get users of their own, so every call finds the rows it operates on.
+        # Asset files are attached to the current asset of the user, which is looked up first, as the converter does
+        benchmarks: dict[str, _Benchmark] = {
+            "aget_asset": repo.aget_asset,
+            "aget_converted_asset_file_ids": repo.aget_converted_asset_file_ids,
+            "abulk_create_asset_files": lambda user_id: repo.aget_asset(user_id).abind(
+                lambda asset: repo.abulk_create_asset_files(user_id, asset.id, params=params)
+            ),
+            "areplace_asset": repo.areplace_asset,
+            "aget_due_tombstones": lambda user_id: repo.aget_due_tombstones(user_id=user_id, limit=50),
+            "atombstone_expired_assets": lambda _: repo.atombstone_expired_assets(
+                created_before=datetime.now(timezone.utc) - timedelta(days=1), limit=50
+            ),
+        }
+        sampled_user_ids = rnd.sample(user_ids, iterations * len(benchmarks))
+
+        async def arun() -> dict[str, list[float]]:
+            latencies: dict[str, list[float]] = {}
+            for offset, (name, benchmark) in enumerate(benchmarks.items()):
+                latencies[name] = []
+                for user_id in sampled_user_ids[offset * iterations : (offset + 1) * iterations]:
+                    started_at = time.perf_counter()
+                    await benchmark(user_id)
+                    latencies[name].append(time.perf_counter() - started_at)
+            return latencies
+
+        return asyncio.run(arun())
+
+    def __drop_indexes(self) -> list[str]:
+        indexes = ConverterImageAssetDo._meta.indexes
+        with connection.schema_editor() as schema_editor:
+            for index in indexes:
+                schema_editor.remove_index(ConverterImageAssetDo, index)
+        return [str(index.name) for index in indexes]
+
+    @staticmethod
+    def __create_asset_file_params() -> list[CreateConverterAssetFileParams]:
+        file_info = ImageFileInfo.create(
+            ImageFileInfo.FilenameDetails.create("image.png", "image", "image.png"),
+            ImageFileInfo.FileDetails(
+                format="PNG",
+                format_description="Portable network graphics",
+                content=b"",
+                size=1024,
+                width=32,
+                height=32,
+                aspect_ratio=Decimal(1),
+                color_mode="RGB",
+                exif_data={},
+            ),
+        )
+        return [
+            CreateAssetFileParams(file_url="https://example.com/image.png", file_info=file_info, file_type=ConverterOriginalImageAssetFile),
+            CreateAssetFileParams(
+                file_url="https://example.com/image.webp", file_info=file_info, file_type=ConverterConvertedImageAssetFile
+            ),
+        ]
+
+    @staticmethod
+    def __ms(latencies: list[float], percentile: int) -> str:
+        return f"{statistics.quantiles(latencies, n=100)[percentile - 1] * 1000:.3f}ms"
@@ -0,0 +1,107 @@
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandParser
+
+
+class Command(BaseCommand):
+    help = "Run conversion-like writes from several processes against a temporary SQLite file with the stock and the configured profile"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--processes", type=int, default=8, help="Number of concurrent worker processes")
+        parser.add_argument("--requests", type=int, default=100, help="Number of requests per worker process")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        profiles: dict[str, dict[str, Any]] = {
+            "stock": {},
+            "configured": settings.DATABASES["default"]["OPTIONS"],
+        }
+        processes, requests = options["processes"], options["requests"]
+
+        self.stdout.write(f"{'Profile':<14}{'Completed':>11}{'Locked':>9}{'Requests/s':>12}{'p50':>11}{'p95':>11}")
+        for name, database_options in profiles.items():
+            with tempfile.TemporaryDirectory() as directory:
+                database_path = str(Path(directory) / "benchmark.sqlite3")
+                with ProcessPoolExecutor(
+                    max_workers=processes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_initialize_worker,
+                    initargs=(database_path, database_options),
+                ) as pool:
+                    pool.submit(_migrate).result()
+                    started_at = time.perf_counter()
+                    results = list(pool.map(_run_requests, range(processes), [requests] * processes))
+                    elapsed = time.perf_counter() - started_at
+
+            latencies = [latency for worker_latencies, _ in results for latency in worker_latencies]
+            locked = sum(worker_locked for _, worker_locked in results)
+            quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [0.0] * 99
+            self.stdout.write(
+                f"{name:<14}{len(latencies):>11}{locked:>9}{len(latencies) / elapsed:>12.1f}"
+                f"{quantiles[49] * 1000:>9.1f}ms{quantiles[94] * 1000:>9.1f}ms"
+            )
+
+
+def _initialize_worker(database_path: str, database_options: dict[str, Any]) -> None:
+    import django
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "webpeditor.settings")
+    django.setup()
+
+    from django.db import connections
+
+    connections["default"].close()
+    connections["default"].settings_dict.update({"NAME": database_path, "OPTIONS": database_options})
+
+
+def _migrate() -> None:
+    call_command("migrate", verbosity=0)
+
+
+def _run_requests(worker_index: int, requests: int) -> tuple[list[float], int]:
+    # Mirrors the writes of a conversion: the previous asset is replaced, then the asset files are created
+    from django.db import OperationalError, transaction
+
+    from infrastructure.database.models.converter import (
+        ConverterConvertedImageAssetFileDo,
+        ConverterImageAssetDo,
+        ConverterImageAssetTombstoneDo,
+        ConverterOriginalImageAssetFileDo,
+    )
+
+    latencies: list[float] = []
+    locked = 0
+    for index in range(requests):
+        user_id = f"user-{worker_index}-{index % 10}"
+        started_at = time.perf_counter()
+        try:
+            with transaction.atomic():
+                previous_asset_ids = list(ConverterImageAssetDo.objects.filter(user_id=user_id).values_list("id", flat=True))
+                ConverterImageAssetTombstoneDo.objects.bulk_create(
+                    [ConverterImageAssetTombstoneDo(asset_id=asset_id, user_id=user_id) for asset_id in previous_asset_ids]
+                )
+                ConverterImageAssetDo.objects.filter(id__in=previous_asset_ids).delete()
+                ConverterImageAssetDo.objects.create(user_id=user_id)
+
+            with transaction.atomic():
+                asset_do, _ = ConverterImageAssetDo.objects.get_or_create(user_id=user_id)
+                file_fields: dict[str, Any] = {"content_type": "image/webp", "color_mode": "RGB", "exif_data": {}, "image_asset": asset_do}
+                ConverterOriginalImageAssetFileDo.objects.bulk_create([ConverterOriginalImageAssetFileDo(**file_fields)])
+                ConverterConvertedImageAssetFileDo.objects.bulk_create([ConverterConvertedImageAssetFileDo(**file_fields)])
+        except OperationalError as error:
+            if "locked" not in str(error):
+                raise
+            locked += 1
+            continue
+
+        latencies.append(time.perf_counter() - started_at)
+
+    return latencies, locked
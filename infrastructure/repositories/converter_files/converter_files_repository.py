@@ -1,5 +1,8 @@
+import asyncio
+from datetime import timedelta
 from typing import Final, final
 
+from django.utils import timezone
 from pydantic import HttpUrl
 from types_linq import Enumerable
 
@@ -8,11 +11,15 @@ from core.result import ContextResult, as_awaitable_result
 from infrastructure.abc.files_repository_abc import FilesRepositoryABC
 from infrastructure.cloudinary.cloudinary_client import CloudinaryClient
 from infrastructure.cloudinary.models import GetFilesResponse
-from infrastructure.repositories.converter_files.models import UploadFileParams
+from infrastructure.repositories.converter_files.models import UploadFileParams, ZipArchive
 
 
 @final
 class ConverterFilesRepository(FilesRepositoryABC):
+    __ZIP_ARCHIVE_LIFETIME: Final[timedelta] = timedelta(minutes=15)
+    # Shared folders of the layout before the files of each asset were uploaded to a folder of their own
+    __LEGACY_FOLDERS: Final[tuple[str, ...]] = ("original", "converted")
+
     def __init__(self, cloudinary_client: CloudinaryClient, logger: LoggerABC) -> None:
         self.__cloudinary_client: Final[CloudinaryClient] = cloudinary_client
         self.__logger: Final[LoggerABC] = logger
@@ -24,35 +31,71 @@ class ConverterFilesRepository(FilesRepositoryABC):
         return await self.__cloudinary_client.aupload_file(folder, public_id, params.content).map(lambda response: response.secure_url)
 
     @as_awaitable_result
-    async def azip_folder(self, user_id: str, relative_folder_path: str) -> ContextResult[HttpUrl]:
-        zip_file_path = f"{self._get_root_folder_path(user_id)}/webpeditor_{relative_folder_path.replace('/', '_')}.zip"
+    async def azip_folder(self, user_id: str, relative_folder_path: str) -> ContextResult[ZipArchive]:
+        zip_file_path = f"{self.__get_zip_file_prefix(user_id, relative_folder_path)}.zip"
+        expires_at = timezone.now() + self.__ZIP_ARCHIVE_LIFETIME
         return await (
             self.aget_files(user_id, relative_folder_path)
             .map(lambda response: Enumerable(response.files).select(lambda resource: resource.public_id))
-            .abind(lambda public_ids: self.__cloudinary_client.agenerate_zip_archive(public_ids, zip_file_path))
-            .map(lambda response: response.secure_url)
+            .abind(lambda public_ids: self.__cloudinary_client.agenerate_zip_archive(public_ids, zip_file_path, expires_at=expires_at))
+            .map(lambda response: ZipArchive(url=response.secure_url, expires_at=expires_at))
         )
 
+    @as_awaitable_result
+    async def adownload_file(self, file_url: HttpUrl) -> ContextResult[bytes]:
+        return await self.__cloudinary_client.adownload_file(str(file_url))
+
     @as_awaitable_result
     async def adelete_files(self, user_id: str, relative_folder_path: str) -> ContextResult[None]:
+        # Public IDs contain the folder path, so the files are deleted by prefix without listing them first.
+        # Archives generated from the folder are stored as raw files next to it and are deleted by their own prefix.
+        # An empty relative folder path deletes all the files of the User
+        folder_path = "/".join(filter(None, (self._get_root_folder_path(user_id), relative_folder_path)))
+        return await (
+            self.__cloudinary_client.adelete_files_by_prefix(f"{folder_path}/")
+            .azip(
+                self.__cloudinary_client.adelete_files_by_prefix(
+                    self.__get_zip_file_prefix(user_id, relative_folder_path),
+                    resource_type="raw",
+                ),
+                lambda files, archives: len(files.deleted) + len(archives.deleted),
+            )
+            .map(lambda deleted: self.__logger.info(f"Deleted {deleted} files from '{folder_path}'"))
+            .abind(lambda _: self.__adelete_legacy_files(user_id))
+        )
+
+    @as_awaitable_result
+    async def aget_files(self, user_id: str, relative_folder_path: str) -> ContextResult[GetFilesResponse]:
         folder_path = f"{self._get_root_folder_path(user_id)}/{relative_folder_path}"
+        return await self.__cloudinary_client.aget_files(folder_path)
+
+    @as_awaitable_result
+    async def __adelete_legacy_files(self, user_id: str) -> ContextResult[None]:
+        # Files of the legacy layout are listed and deleted in batches by their public IDs, together with the archive
+        # generated from them. Once they are gone, the listings come back empty and nothing else is deleted
+        results = await asyncio.gather(*(self.aget_files(user_id, folder) for folder in self.__LEGACY_FOLDERS))
+        public_ids = (
+            Enumerable(results)
+            .where(lambda result: result.is_ok())
+            .select_many(lambda result: result.ok.files)
+            .select(lambda file: file.public_id)
+            .to_list()
+        )
 
-        get_files_response_result = await self.aget_files(user_id, relative_folder_path)
-        if get_files_response_result.is_error():
-            self.__logger.debug(f"No files to delete at {folder_path}")
+        if len(public_ids) == 0:
             return ContextResult[None].success(None)
 
-        public_ids = Enumerable(get_files_response_result.ok.files).select(lambda file: file.public_id).to_list()
         return await (
             self.__cloudinary_client.adelete_files(public_ids)
-            .map(lambda response: self.__logger.info(f"Deleted {len(response.deleted.values())} files from '{folder_path}'"))
-            .as_empty()
+            .azip(
+                self.__cloudinary_client.adelete_files([f"{self.__get_zip_file_prefix(user_id, 'converted')}.zip"], resource_type="raw"),
+                lambda files, archives: len(files.deleted) + len(archives.deleted),
+            )
+            .map(lambda deleted: self.__logger.info(f"Deleted {deleted} legacy files of User '{user_id}'"))
         )
 
-    @as_awaitable_result
-    async def aget_files(self, user_id: str, relative_folder_path: str) -> ContextResult[GetFilesResponse]:
-        folder_path = f"{self._get_root_folder_path(user_id)}/{relative_folder_path}"
-        return await self.__cloudinary_client.aget_files(folder_path)
+    def __get_zip_file_prefix(self, user_id: str, relative_folder_path: str) -> str:
+        return f"{self._get_root_folder_path(user_id)}/webpeditor_{relative_folder_path.replace('/', '_')}"
 
     @staticmethod
     def _get_root_folder_path(user_id: str) -> str:
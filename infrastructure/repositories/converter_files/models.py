@@ -1,4 +1,8 @@
-from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from pathlib import Path
+from typing import Union
+
+from pydantic import BaseModel, ConfigDict, HttpUrl
 
 
 class UploadFileParams(BaseModel):
@@ -6,4 +10,12 @@ class UploadFileParams(BaseModel):
 
     relative_folder_path: str
     basename: str
-    content: bytes
+    # A path is streamed from the disk instead of being read into memory
+    content: Union[bytes, Path]
+
+
+class ZipArchive(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid", strict=True)
+
+    url: HttpUrl
+    expires_at: datetime
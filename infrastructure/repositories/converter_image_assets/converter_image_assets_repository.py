@@ -1,23 +1,33 @@
+from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Final, cast, final
+from typing import Any, Final, Optional, Sequence, Union, final
+from uuid import UUID
 
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.db.models import F, QuerySet
+from django.utils import timezone
 from pydantic import HttpUrl
 
 from application.common.services.models.file_info import ImageFileInfo
 from core.abc.logger_abc import LoggerABC
 from core.result import ContextResult, ErrorContext, as_awaitable_result
-from core.types import Pair
 from domain.common.models import ImageAssetFile
-from domain.converter.models import ConverterConvertedImageAssetFile, ConverterImageAsset
+from domain.converter.models import ConverterConvertedImageAssetFile, ConverterImageAsset, ConverterOriginalImageAssetFile
 from infrastructure.abc.converter_image_assets_repository_abc import ConverterImageAssetsRepositoryABC
 from infrastructure.database.models.base import BaseImageAssetFileDo
 from infrastructure.database.models.converter import (
     ConverterConvertedImageAssetFileDo,
     ConverterImageAssetDo,
+    ConverterImageAssetTombstoneDo,
     ConverterOriginalImageAssetFileDo,
+    ConverterZipArchiveDo,
+)
+from infrastructure.repositories.converter_image_assets.models import (
+    ConvertedZipArchive,
+    CreateConverterAssetFileParams,
+    ImageAssetTombstone,
 )
-from infrastructure.repositories.converter_image_assets.models import CreateAssetFileParams
-from webpeditor import settings
 
 
 @final
@@ -30,55 +40,154 @@ class ConverterImageAssetsRepository(ConverterImageAssetsRepositoryABC):
         return await self.__aget_or_create_asset(user_id).map(self.__map_empty_asset_to_domain)
 
     @as_awaitable_result
-    async def aget_or_create_asset(self, user_id: str) -> ContextResult[ConverterImageAsset]:
+    async def areplace_asset(self, user_id: str) -> ContextResult[ConverterImageAsset]:
         try:
-            asset_do, _ = await ConverterImageAssetDo.objects.aget_or_create(user_id=user_id)
-            return ContextResult[ConverterImageAsset].success(self.__map_empty_asset_to_domain(asset_do))
+            return ContextResult[ConverterImageAsset].success(
+                self.__map_empty_asset_to_domain(await sync_to_async(self.__replace_asset)(user_id))
+            )
         except Exception as exception:
-            self.__logger.exception(exception, f"Failed to get or create Converter Image Asset for User '{user_id}'")
+            self.__logger.exception(exception, f"Unable to replace Converter Image Asset for User '{user_id}'")
             return ContextResult[ConverterImageAsset].failure(ErrorContext.bad_request())
 
     @as_awaitable_result
-    async def aasset_exists(self, user_id: str) -> ContextResult[bool]:
+    async def atombstone_expired_assets(self, *, created_before: datetime, limit: int) -> ContextResult[int]:
         try:
-            return ContextResult[bool].success(await ConverterImageAssetDo.objects.filter(user_id=user_id).aexists())
+            return ContextResult[int].success(await sync_to_async(self.__tombstone_expired_assets)(created_before, limit))
         except Exception as exception:
-            message = f"Failed to check if Converter Image Asset exists for User '{user_id}'"
-            self.__logger.exception(exception, message)
-            return ContextResult[bool].failure(ErrorContext.bad_request())
+            self.__logger.exception(exception, f"Unable to tombstone Converter Image Assets created before '{created_before}'")
+            return ContextResult[int].failure(ErrorContext.server_error())
 
     @as_awaitable_result
-    async def adelete_asset(self, user_id: str) -> ContextResult[None]:
+    async def aget_due_tombstones(self, *, user_id: Optional[str] = None, limit: int) -> ContextResult[list[ImageAssetTombstone]]:
         try:
-            asset_do = await ConverterImageAssetDo.objects.filter(user_id=user_id).afirst()
-            if asset_do is None:
-                return ContextResult[None].failure(ErrorContext.not_found(f"Converter Image Asset for User '{user_id}' not found"))
-
-            deleted_original = await ConverterOriginalImageAssetFileDo.objects.filter(image_asset=asset_do).adelete()
-            deleted_converted = await ConverterConvertedImageAssetFileDo.objects.filter(image_asset=asset_do).adelete()
+            query = ConverterImageAssetTombstoneDo.objects.filter(available_at__lte=timezone.now())
+            if user_id is not None:
+                query = query.filter(user_id=user_id)
+            return ContextResult[list[ImageAssetTombstone]].success(
+                [
+                    ImageAssetTombstone(asset_id=tombstone_do.asset_id, user_id=tombstone_do.user_id, attempts=tombstone_do.attempts)
+                    async for tombstone_do in query[:limit]
+                ]
+            )
+        except Exception as exception:
+            self.__logger.exception(exception, "Failed to get due Converter Image Asset Tombstones")
+            return ContextResult[list[ImageAssetTombstone]].failure(ErrorContext.server_error())
 
-            if settings.IS_DEVELOPMENT:
-                for model, count in {
-                    **Pair[int, dict[str, int]].from_tuple(deleted_original).item2,
-                    **Pair[int, dict[str, int]].from_tuple(deleted_converted).item2,
-                }.items():
-                    self.__logger.debug(f"Deleted '{model}': {count} for User '{user_id}'")
+    @as_awaitable_result
+    async def adelete_tombstone(self, asset_id: UUID) -> ContextResult[None]:
+        try:
+            await ConverterImageAssetTombstoneDo.objects.filter(asset_id=asset_id).adelete()
+            return ContextResult[None].success(None)
+        except Exception as exception:
+            self.__logger.exception(exception, f"Failed to delete Converter Image Asset Tombstone '{asset_id}'")
+            return ContextResult[None].failure(ErrorContext.server_error())
 
+    @as_awaitable_result
+    async def areschedule_tombstone(self, asset_id: UUID, *, delay: timedelta, error: str) -> ContextResult[None]:
+        try:
+            await ConverterImageAssetTombstoneDo.objects.filter(asset_id=asset_id).aupdate(
+                attempts=F("attempts") + 1,
+                available_at=timezone.now() + delay,
+                last_error=error,
+            )
             return ContextResult[None].success(None)
         except Exception as exception:
-            self.__logger.exception(exception, f"Unable to delete Converter Image Asset for User '{user_id}'")
-            return ContextResult[None].failure(ErrorContext.bad_request())
+            self.__logger.exception(exception, f"Failed to reschedule Converter Image Asset Tombstone '{asset_id}'")
+            return ContextResult[None].failure(ErrorContext.server_error())
 
     @as_awaitable_result
-    async def aget_or_create_asset_file[T: ImageAssetFile](self, user_id: str, *, params: CreateAssetFileParams[T]) -> ContextResult[T]:
-        asset_file_type = self.__map_file_type(params.file_type)
-        return await (
-            self.__aget_or_create_asset(user_id)
-            .abind(lambda asset: self.__aget_or_create_asset_file(asset_file_type, params.file_info, params.file_url, asset))
-            .map(self.__map_asset_file_to_domain)
-            .map(lambda asset_file: cast(T, asset_file))
+    async def aget_converted_asset_files(self, user_id: str) -> ContextResult[list[ConverterConvertedImageAssetFile]]:
+        try:
+            return ContextResult[list[ConverterConvertedImageAssetFile]].success(
+                [
+                    self.__map_asset_file_to_domain(asset_file_do, ConverterConvertedImageAssetFile)
+                    async for asset_file_do in ConverterConvertedImageAssetFileDo.objects.filter(image_asset__user_id=user_id).order_by(
+                        "filename"
+                    )
+                ]
+            )
+        except Exception as exception:
+            self.__logger.exception(exception, f"Failed to get Converter Converted Image Asset Files for User '{user_id}'")
+            return ContextResult[list[ConverterConvertedImageAssetFile]].failure(ErrorContext.bad_request())
+
+    @as_awaitable_result
+    async def aget_converted_asset_file_ids(self, user_id: str) -> ContextResult[list[UUID]]:
+        try:
+            return ContextResult[list[UUID]].success(
+                [
+                    asset_file_id
+                    async for asset_file_id in ConverterConvertedImageAssetFileDo.objects.filter(image_asset__user_id=user_id)
+                    .order_by("id")
+                    .values_list("id", flat=True)
+                ]
+            )
+        except Exception as exception:
+            self.__logger.exception(exception, f"Failed to get Converter Converted Image Asset File IDs for User '{user_id}'")
+            return ContextResult[list[UUID]].failure(ErrorContext.bad_request())
+
+    @as_awaitable_result
+    async def aget_zip_archive(self, user_id: str) -> ContextResult[ConvertedZipArchive]:
+        try:
+            zip_archive_do = await ConverterZipArchiveDo.objects.filter(image_asset__user_id=user_id).afirst()
+        except Exception as exception:
+            self.__logger.exception(exception, f"Failed to get Converter Zip Archive for User '{user_id}'")
+            return ContextResult[ConvertedZipArchive].failure(ErrorContext.server_error())
+
+        if zip_archive_do is None:
+            return ContextResult[ConvertedZipArchive].failure(
+                ErrorContext.not_found(f"Converter Zip Archive for User '{user_id}' not found")
+            )
+
+        return ContextResult[ConvertedZipArchive].success(
+            ConvertedZipArchive(
+                fingerprint=zip_archive_do.fingerprint,
+                url=HttpUrl(zip_archive_do.url),
+                expires_at=zip_archive_do.expires_at,
+            )
         )
 
+    @as_awaitable_result
+    async def asave_zip_archive(self, user_id: str, asset_id: UUID, *, zip_archive: ConvertedZipArchive) -> ContextResult[None]:
+        try:
+            # Archives are attached to the asset whose folder they were built from, which may have been replaced since
+            if not await ConverterImageAssetDo.objects.filter(id=asset_id, user_id=user_id).aexists():
+                return ContextResult[None].failure(self.__replaced_asset_error(user_id, asset_id))
+
+            await ConverterZipArchiveDo.objects.aupdate_or_create(
+                image_asset_id=asset_id,
+                defaults={
+                    "fingerprint": zip_archive.fingerprint,
+                    "url": str(zip_archive.url),
+                    "expires_at": zip_archive.expires_at,
+                    "created_at": timezone.now(),
+                },
+            )
+            return ContextResult[None].success(None)
+        except Exception as exception:
+            self.__logger.exception(exception, f"Failed to save Converter Zip Archive for User '{user_id}'")
+            return ContextResult[None].failure(ErrorContext.server_error())
+
+    @as_awaitable_result
+    async def abulk_create_asset_files(
+        self,
+        user_id: str,
+        asset_id: UUID,
+        *,
+        params: Sequence[CreateConverterAssetFileParams],
+    ) -> ContextResult[list[Union[ConverterOriginalImageAssetFile, ConverterConvertedImageAssetFile]]]:
+        try:
+            asset_files = await sync_to_async(self.__bulk_create_asset_files)(user_id, asset_id, params)
+            if asset_files is None:
+                return ContextResult[list[Union[ConverterOriginalImageAssetFile, ConverterConvertedImageAssetFile]]].failure(
+                    self.__replaced_asset_error(user_id, asset_id)
+                )
+            return ContextResult[list[Union[ConverterOriginalImageAssetFile, ConverterConvertedImageAssetFile]]].success(asset_files)
+        except Exception as exception:
+            self.__logger.exception(exception, f"Failed to create {len(params)} Converter Image Asset File(s) for User '{user_id}'")
+            return ContextResult[list[Union[ConverterOriginalImageAssetFile, ConverterConvertedImageAssetFile]]].failure(
+                ErrorContext.bad_request()
+            )
+
     @as_awaitable_result
     async def __aget_or_create_asset(self, user_id: str) -> ContextResult[ConverterImageAssetDo]:
         try:
@@ -89,38 +198,85 @@ class ConverterImageAssetsRepository(ConverterImageAssetsRepositoryABC):
             self.__logger.exception(exception, message)
             return ContextResult[ConverterImageAssetDo].failure(ErrorContext.bad_request())
 
-    @as_awaitable_result
-    async def __aget_or_create_asset_file[T: BaseImageAssetFileDo](
-        self,
-        asset_file_type: type[T],
-        file_info: ImageFileInfo,
-        file_url: str,
-        asset: ConverterImageAssetDo,
-    ) -> ContextResult[T]:
-        try:
-            value, _ = await asset_file_type.objects.aget_or_create(
-                file_url=file_url,
-                filename=file_info.filename_details.fullname,
-                filename_shorter=file_info.filename_details.shortname,
-                content_type=f"image/{file_info.file_details.format.lower()}",
-                format=file_info.file_details.format,
-                format_description=file_info.file_details.format_description or "",
-                size=file_info.file_details.size,
-                width=file_info.file_details.width,
-                height=file_info.file_details.height,
-                aspect_ratio=file_info.file_details.aspect_ratio,
-                color_mode=file_info.file_details.color_mode,
-                exif_data=file_info.file_details.exif_data,
-                image_asset=asset,
-            )
-            return ContextResult[T].success(value)
-        except Exception as exception:
-            message = (
-                f"Failed to create '{asset_file_type.__name__}' with filename "
-                f"'{file_info.filename_details.fullname}' for User '{asset.user_id}' with {ConverterImageAssetDo.__name__} '{asset.id}'"
+    @staticmethod
+    def __replace_asset(user_id: str) -> ConverterImageAssetDo:
+        # Previous assets are tombstoned in the same transaction their records are deleted in,
+        # so their remote files are never left without a pending deletion
+        with transaction.atomic():
+            ConverterImageAssetsRepository.__tombstone_assets(ConverterImageAssetDo.objects.filter(user_id=user_id))
+            return ConverterImageAssetDo.objects.create(user_id=user_id)
+
+    @staticmethod
+    def __tombstone_expired_assets(created_before: datetime, limit: int) -> int:
+        # The oldest assets are taken from the created_at index. Each batch is committed on its own,
+        # so an interrupted sweep resumes from the first asset that has not been tombstoned yet
+        with transaction.atomic():
+            return ConverterImageAssetsRepository.__tombstone_assets(
+                ConverterImageAssetDo.objects.filter(created_at__lt=created_before).order_by("created_at", "id")[:limit]
             )
-            self.__logger.exception(exception, message)
-            return ContextResult[T].failure(ErrorContext.bad_request())
+
+    @staticmethod
+    def __tombstone_assets(assets: QuerySet[ConverterImageAssetDo]) -> int:
+        asset_keys = list(assets.values_list("id", "user_id"))
+        ConverterImageAssetTombstoneDo.objects.bulk_create(
+            [ConverterImageAssetTombstoneDo(asset_id=asset_id, user_id=user_id) for asset_id, user_id in asset_keys],
+            ignore_conflicts=True,
+        )
+        # Asset files are deleted by the cascade with one statement per table
+        ConverterImageAssetDo.objects.filter(id__in=[asset_id for asset_id, _ in asset_keys]).delete()
+        return len(asset_keys)
+
+    def __bulk_create_asset_files(
+        self,
+        user_id: str,
+        asset_id: UUID,
+        params: Sequence[CreateConverterAssetFileParams],
+    ) -> Optional[list[Union[ConverterOriginalImageAssetFile, ConverterConvertedImageAssetFile]]]:
+        # One transaction and one INSERT per asset file table, regardless of the number of files
+        with transaction.atomic():
+            # Files are uploaded to the folder of the asset they were converted for. The asset is locked, so it cannot be
+            # replaced while its files are attached. Files of an asset that was already replaced are never attached
+            asset_do = ConverterImageAssetDo.objects.select_for_update().filter(id=asset_id, user_id=user_id).first()
+            if asset_do is None:
+                return None
+
+            asset_file_dos = [
+                self.__map_file_type(param.file_type)(**self.__get_asset_file_fields(param.file_info, param.file_url), image_asset=asset_do)
+                for param in params
+            ]
+            for asset_file_type in dict.fromkeys(type(asset_file_do) for asset_file_do in asset_file_dos):
+                asset_file_type.objects.bulk_create(
+                    [asset_file_do for asset_file_do in asset_file_dos if type(asset_file_do) is asset_file_type]
+                )
+            # The archive of the previous converted files no longer matches them
+            if any(isinstance(asset_file_do, ConverterConvertedImageAssetFileDo) for asset_file_do in asset_file_dos):
+                ConverterZipArchiveDo.objects.filter(image_asset=asset_do).delete()
+
+        return [
+            self.__map_asset_file_to_domain(asset_file_do, param.file_type)
+            for asset_file_do, param in zip(asset_file_dos, params, strict=True)
+        ]
+
+    @staticmethod
+    def __replaced_asset_error(user_id: str, asset_id: UUID) -> ErrorContext:
+        return ErrorContext.not_found(f"Converter Image Asset '{asset_id}' of User '{user_id}' has been replaced")
+
+    @staticmethod
+    def __get_asset_file_fields(file_info: ImageFileInfo, file_url: str) -> dict[str, Any]:
+        return {
+            "file_url": file_url,
+            "filename": file_info.filename_details.fullname,
+            "filename_shorter": file_info.filename_details.shortname,
+            "content_type": f"image/{file_info.file_details.format.lower()}",
+            "format": file_info.file_details.format,
+            "format_description": file_info.file_details.format_description or "",
+            "size": file_info.file_details.size,
+            "width": file_info.file_details.width,
+            "height": file_info.file_details.height,
+            "aspect_ratio": file_info.file_details.aspect_ratio,
+            "color_mode": file_info.file_details.color_mode,
+            "exif_data": file_info.file_details.exif_data,
+        }
 
     @staticmethod
     def __map_file_type[T: ImageAssetFile](file_type: type[T]) -> type[BaseImageAssetFileDo]:
@@ -131,8 +287,8 @@ class ConverterImageAssetsRepository(ConverterImageAssetsRepositoryABC):
         return ConverterImageAsset.create_empty(asset_do.id, asset_do.user_id, asset_do.created_at)
 
     @staticmethod
-    def __map_asset_file_to_domain(asset_file_do: BaseImageAssetFileDo) -> ImageAssetFile:
-        return ImageAssetFile(
+    def __map_asset_file_to_domain[T: ImageAssetFile](asset_file_do: BaseImageAssetFileDo, file_type: type[T]) -> T:
+        return file_type(
             id=asset_file_do.id,
             file_url=HttpUrl(asset_file_do.file_url),
             filename=asset_file_do.filename,
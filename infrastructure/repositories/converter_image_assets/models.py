@@ -1,7 +1,12 @@
-from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from typing import Union
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, HttpUrl
 
 from application.common.services.models.file_info import ImageFileInfo
 from domain.common.models import ImageAssetFile
+from domain.converter.models import ConverterConvertedImageAssetFile, ConverterOriginalImageAssetFile
 
 
 class CreateAssetFileParams[T: ImageAssetFile](BaseModel):
@@ -10,3 +15,25 @@ class CreateAssetFileParams[T: ImageAssetFile](BaseModel):
     file_type: type[T]
     file_info: ImageFileInfo
     file_url: str
+
+
+type CreateConverterAssetFileParams = Union[
+    CreateAssetFileParams[ConverterOriginalImageAssetFile],
+    CreateAssetFileParams[ConverterConvertedImageAssetFile],
+]
+
+
+class ImageAssetTombstone(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid", strict=True)
+
+    asset_id: UUID
+    user_id: str
+    attempts: int
+
+
+class ConvertedZipArchive(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid", strict=True)
+
+    fingerprint: str
+    url: HttpUrl
+    expires_at: datetime
@@ -0,0 +1,182 @@
+import asyncio
+import hashlib
+import os
+import shutil
+import tempfile
+import zipfile
+from datetime import datetime, timedelta, timezone
+from io import BytesIO
+from pathlib import Path
+from typing import BinaryIO, Final, Optional, Union, final
+from urllib.parse import unquote
+
+from PIL import Image
+from pydantic import HttpUrl
+
+from core.abc.logger_abc import LoggerABC
+from core.result import ContextResult, ErrorContext, as_awaitable_result
+from infrastructure.abc.files_repository_abc import FilesRepositoryABC
+from infrastructure.cloudinary.models import GetFilesResponse
+from infrastructure.repositories.converter_files.models import UploadFileParams, ZipArchive
+from webpeditor import settings
+
+
+@final
+class LocalFilesRepository(FilesRepositoryABC):
+    __ZIP_ARCHIVE_LIFETIME: Final[timedelta] = timedelta(minutes=15)
+    __HASH_BLOCK_SIZE: Final[int] = 1024 * 1024
+
+    def __init__(self, logger: LoggerABC) -> None:
+        self.__logger: Final[LoggerABC] = logger
+
+    @as_awaitable_result
+    async def aupload_file(self, user_id: str, *, params: UploadFileParams) -> ContextResult[HttpUrl]:
+        folder_path = f"{self._get_root_folder_path(user_id)}/{params.relative_folder_path}"
+        try:
+            relative_path = await asyncio.to_thread(self.__write_file, folder_path, params.basename, params.content)
+            return ContextResult[HttpUrl].success(self.__get_url(relative_path))
+        except Exception as exception:
+            self.__logger.exception(exception, f"Unable to store file '{params.basename}' in '{folder_path}'")
+            return ContextResult[HttpUrl].failure(ErrorContext.server_error("Unable to upload file"))
+
+    @as_awaitable_result
+    async def azip_folder(self, user_id: str, relative_folder_path: str) -> ContextResult[ZipArchive]:
+        folder_path = f"{self._get_root_folder_path(user_id)}/{relative_folder_path}"
+        zip_filename = f"webpeditor_{relative_folder_path.replace('/', '_')}.zip"
+        expires_at = datetime.now(timezone.utc) + self.__ZIP_ARCHIVE_LIFETIME
+        try:
+            relative_path = await asyncio.to_thread(self.__write_zip_archive, folder_path, zip_filename)
+            return ContextResult[ZipArchive].success(ZipArchive(url=self.__get_url(relative_path), expires_at=expires_at))
+        except Exception as exception:
+            self.__logger.exception(exception, f"Unable to zip folder '{folder_path}'")
+            return ContextResult[ZipArchive].failure(ErrorContext.server_error("Unable to zip folder"))
+
+    @as_awaitable_result
+    async def adownload_file(self, file_url: HttpUrl) -> ContextResult[bytes]:
+        path = self.__get_path(file_url)
+        if path is None:
+            return ContextResult[bytes].failure(ErrorContext.bad_request(f"File URL '{file_url}' is not a local file"))
+
+        try:
+            return ContextResult[bytes].success(await asyncio.to_thread(path.read_bytes))
+        except FileNotFoundError:
+            return ContextResult[bytes].failure(ErrorContext.not_found("File not found"))
+        except Exception as exception:
+            self.__logger.exception(exception, f"Unable to read file '{path}'")
+            return ContextResult[bytes].failure(ErrorContext.server_error("Unable to download file"))
+
+    @as_awaitable_result
+    async def adelete_files(self, user_id: str, relative_folder_path: str) -> ContextResult[None]:
+        # An empty relative folder path deletes all the files of the User
+        folder_path = "/".join(filter(None, (self._get_root_folder_path(user_id), relative_folder_path)))
+        try:
+            await asyncio.to_thread(self.__delete_folder, settings.LOCAL_FILES_ROOT / folder_path)
+            self.__logger.info(f"Deleted local folder '{folder_path}'")
+            return ContextResult[None].success(None)
+        except Exception as exception:
+            self.__logger.exception(exception, f"Unable to delete local folder '{folder_path}'")
+            return ContextResult[None].failure(ErrorContext.server_error("Unable to delete files"))
+
+    @as_awaitable_result
+    async def aget_files(self, user_id: str, relative_folder_path: str) -> ContextResult[GetFilesResponse]:
+        folder_path = f"{self._get_root_folder_path(user_id)}/{relative_folder_path}"
+        try:
+            files = await asyncio.to_thread(self.__list_files, folder_path)
+            return ContextResult[GetFilesResponse].success(GetFilesResponse(total_count=len(files), resources=files, next_cursor=None))
+        except Exception as exception:
+            self.__logger.exception(exception, f"Unable to list local folder '{folder_path}'")
+            return ContextResult[GetFilesResponse].failure(ErrorContext.server_error("Unable to get files"))
+
+    @staticmethod
+    def _get_root_folder_path(user_id: str) -> str:
+        return f"{user_id}/converter"
+
+    def __write_file(self, folder_path: str, basename: str, content: Union[bytes, Path]) -> str:
+        # Files are stored under the digest of their content, so a URL always refers to the same content
+        # and can be cached by clients without revalidation
+        with content.open("rb") if isinstance(content, Path) else BytesIO(content) as file:
+            digest = self.__get_digest(file)
+            file.seek(0)
+            with Image.open(file) as image:
+                extension = (image.format or "bin").lower()
+
+            relative_path = f"{folder_path}/{digest}/{basename}.{extension}"
+            path = settings.LOCAL_FILES_ROOT / relative_path
+            if path.exists():
+                return relative_path
+
+            path.parent.mkdir(parents=True, exist_ok=True)
+            file.seek(0)
+            # Written to a temporary file first, so readers never see a partially written file
+            with tempfile.NamedTemporaryFile(dir=path.parent, prefix=".", delete=False) as temporary_file:
+                shutil.copyfileobj(file, temporary_file)
+            os.replace(temporary_file.name, path)
+            return relative_path
+
+    def __write_zip_archive(self, folder_path: str, zip_filename: str) -> str:
+        files = sorted(self.__get_files(folder_path))
+        digest = hashlib.sha256("\n".join(path.as_posix() for path in files).encode()).hexdigest()
+        relative_path = f"{folder_path.rsplit('/', 1)[0]}/archives/{digest}/{zip_filename}"
+        path = settings.LOCAL_FILES_ROOT / relative_path
+        if path.exists():
+            return relative_path
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=path.parent, prefix=".", delete=False) as temporary_file:
+            # Images are already compressed, so they are stored as they are
+            with zipfile.ZipFile(temporary_file, "w", compression=zipfile.ZIP_STORED) as archive:
+                for file in files:
+                    archive.write(file, arcname=file.name)
+        os.replace(temporary_file.name, path)
+        return relative_path
+
+    def __list_files(self, folder_path: str) -> list[GetFilesResponse.FileData]:
+        return [self.__get_file_data(folder_path, path) for path in sorted(self.__get_files(folder_path))]
+
+    def __get_file_data(self, folder_path: str, path: Path) -> GetFilesResponse.FileData:
+        with Image.open(path) as image:
+            width, height = image.size
+
+        stat = path.stat()
+        return GetFilesResponse.FileData(
+            asset_id=path.parent.name,
+            public_id=f"{folder_path}/{path.stem}",
+            created_at=datetime.fromtimestamp(stat.st_mtime, timezone.utc).isoformat(),
+            format=path.suffix.removeprefix("."),
+            bytes=stat.st_size,
+            width=width,
+            height=height,
+            asset_folder=folder_path,
+            secure_url=self.__get_url(path.relative_to(settings.LOCAL_FILES_ROOT).as_posix()),
+        )
+
+    def __get_digest(self, file: BinaryIO) -> str:
+        digest = hashlib.sha256()
+        while block := file.read(self.__HASH_BLOCK_SIZE):
+            digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def __get_files(folder_path: str) -> list[Path]:
+        folder = settings.LOCAL_FILES_ROOT / folder_path
+        # Temporary files of writes in progress are hidden
+        return [path for path in folder.glob("*/*") if path.is_file() and not path.name.startswith(".")] if folder.is_dir() else []
+
+    @staticmethod
+    def __get_url(relative_path: str) -> HttpUrl:
+        return HttpUrl(f"{settings.LOCAL_FILES_BASE_URL.rstrip('/')}/{relative_path}")
+
+    @staticmethod
+    def __get_path(file_url: HttpUrl) -> Optional[Path]:
+        base_url = f"{settings.LOCAL_FILES_BASE_URL.rstrip('/')}/"
+        if not str(file_url).startswith(base_url):
+            return None
+
+        root = settings.LOCAL_FILES_ROOT.resolve()
+        path = (root / unquote(str(file_url).removeprefix(base_url))).resolve()
+        return path if path.is_relative_to(root) else None
+
+    @staticmethod
+    def __delete_folder(folder: Path) -> None:
+        if folder.is_dir():
+            shutil.rmtree(folder)
@@ -0,0 +1,27 @@
+import hashlib
+import unittest
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import RequestFactory, override_settings
+
+from core.utils import DigestUtils
+
+
+class UploadHandlersTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.content = b"\x89PNG" + bytes(range(256)) * 64
+
+    def test_memory_upload_handler_attaches_sha256(self) -> None:
+        self.__assert_sha256_attached()
+
+    def test_temporary_upload_handler_attaches_sha256(self) -> None:
+        with override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=1024):
+            self.__assert_sha256_attached()
+
+    def __assert_sha256_attached(self) -> None:
+        request = RequestFactory().post("/", {"files": SimpleUploadedFile("image.png", self.content)})
+
+        uploaded_file = request.FILES["files"]
+
+        # The fallback would produce the same digest, so it is checked against different content
+        self.assertEqual(hashlib.sha256(self.content).hexdigest(), DigestUtils.get_sha256(uploaded_file, b""))
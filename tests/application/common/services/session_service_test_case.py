@@ -0,0 +1,48 @@
+import unittest
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+from django.contrib.sessions.backends.signed_cookies import SessionStore
+from django.test import RequestFactory
+from django.utils import timezone
+
+from application.common.services.session_service import SessionService
+from application.common.services.signing_service import SigningService
+from core.abc.logger_abc import LoggerABC
+
+
+class SessionServiceTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.http_request = RequestFactory().get("/")
+        self.http_request.session = SessionStore()
+        logger = MagicMock(spec=LoggerABC)
+        self.session_service = SessionService(self.http_request, SigningService(logger), logger)
+
+    async def test_aget_user_id_creates_user_id_once(self) -> None:
+        first_user_id = await self.session_service.aget_user_id()
+        self.assertTrue(self.http_request.session.modified)
+
+        self.http_request.session.modified = False
+        second_user_id = await self.session_service.aget_user_id()
+
+        self.assertEqual(first_user_id.ok, second_user_id.ok)
+        self.assertFalse(self.http_request.session.modified)
+
+    async def test_aget_user_id_refreshes_expiry_near_its_end(self) -> None:
+        user_id = await self.session_service.aget_user_id()
+        self.http_request.session.set_expiry(timezone.now() + timedelta(minutes=1))
+        self.http_request.session.modified = False
+
+        result = await self.session_service.aget_user_id()
+
+        self.assertEqual(user_id.ok, result.ok)
+        self.assertTrue(self.http_request.session.modified)
+        self.assertGreater(self.http_request.session.get_expiry_date(), timezone.now() + timedelta(minutes=10))
+
+    async def test_aget_user_id_replaces_expired_user_id(self) -> None:
+        user_id = await self.session_service.aget_user_id()
+        self.http_request.session.set_expiry(timezone.now() - timedelta(minutes=1))
+
+        result = await self.session_service.aget_user_id()
+
+        self.assertNotEqual(user_id.ok, result.ok)
@@ -1,9 +1,240 @@
 import unittest
+import uuid
+from decimal import Decimal
+from io import BytesIO
+from pathlib import Path
+from typing import Optional, Union, cast
+from unittest.mock import MagicMock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
+from ninja import UploadedFile
+from PIL import Image
+from PIL.ImageFile import ImageFile
+from pydantic import HttpUrl
+
+from application.common.abc.validator_abc import ValidatorABC
+from application.common.services.filename_service import FilenameService
+from application.common.services.image_file_service import ImageFileService
+from application.common.services.models.file_info import ImageFileInfo
+from application.common.services.session_service_factory import SessionServiceFactory
+from application.converter.commands.convert_images_command import ConvertImagesCommand
+from application.converter.commands.schemas.conversion import ConversionRequest, ConversionResponse
+from application.converter.services.abc.image_assets_cleanup_worker_abc import ImageAssetsCleanupWorkerABC
+from application.converter.services.abc.image_file_converter_abc import ImageFileConverterABC
+from application.converter.services.models.conversion import ConvertedImage
+from core.abc.logger_abc import LoggerABC
+from core.limiters.stage_limiter import StageLimiter
+from core.result import ContextResult, ErrorContext, as_awaitable_result
+from core.tracing.tracer import Tracer
+from domain.converter.models import ConverterConvertedImageAssetFile, ConverterImageAsset, ConverterOriginalImageAssetFile
+from infrastructure.abc.converter_image_assets_repository_abc import ConverterImageAssetsRepositoryABC
+from infrastructure.abc.files_repository_abc import FilesRepositoryABC
+from infrastructure.repositories.converter_files.models import UploadFileParams
+from infrastructure.repositories.converter_image_assets.models import CreateConverterAssetFileParams
 
 
 class ConvertImagesCommandTestCase(unittest.IsolatedAsyncioTestCase):
-    def setUp(self) -> None: ...
+    def setUp(self) -> None:
+        self.asset = ConverterImageAsset.create_empty(uuid.uuid4(), "user", timezone.now())
+        self.failed_conversions: set[str] = set()
+        # Uploads are keyed by the kind of their folder and their basename, e.g. "original/first"
+        self.failed_uploads: set[str] = set()
+        self.uploaded_contents: dict[str, Union[bytes, Path]] = {}
+        self.converted_contents: dict[str, bytes] = {}
+        self.persistence_error: Optional[ErrorContext] = None
+        self.persisted_params: list[CreateConverterAssetFileParams] = []
+        logger = MagicMock(spec=LoggerABC)
+        tracer = Tracer(enabled=False)
+
+        session_service_factory = MagicMock(spec=SessionServiceFactory)
+        session_service_factory.create.return_value.aget_user_id.side_effect = lambda: ContextResult[str].asuccess("user")
+
+        validator = MagicMock(spec=ValidatorABC)
+        validator.validate.side_effect = ContextResult[ConversionRequest].success
+
+        self.converter_files_repo = MagicMock(spec=FilesRepositoryABC)
+        self.converter_files_repo.aupload_file = MagicMock(side_effect=self.__aupload_file)
+
+        image_converter = MagicMock(spec=ImageFileConverterABC)
+        image_converter.aconvert = MagicMock(side_effect=self.__aconvert)
+
+        self.converter_repo = MagicMock(spec=ConverterImageAssetsRepositoryABC)
+        self.converter_repo.areplace_asset = MagicMock(side_effect=self.__areplace_asset)
+        self.converter_repo.abulk_create_asset_files = MagicMock(side_effect=self.__abulk_create_asset_files)
+
+        assets_cleanup_worker = MagicMock(spec=ImageAssetsCleanupWorkerABC)
+        assets_cleanup_worker.aschedule = MagicMock(side_effect=self.__aschedule)
+
+        filename_service = FilenameService(logger)
+        self.command = ConvertImagesCommand(
+            session_service_factory,
+            validator,
+            self.converter_files_repo,
+            image_converter,
+            ImageFileService(logger, filename_service),
+            filename_service,
+            self.converter_repo,
+            assets_cleanup_worker,
+            StageLimiter(dict.fromkeys(("pipeline", "decode", "convert", "upload", "persist"), 2), tracer),
+            tracer,
+            logger,
+        )
+
+    async def test_ahandle_pairs_original_and_converted_files(self) -> None:
+        results = (await self.command.ahandle(MagicMock(), self.__create_request("first.png", "second.png"))).to_list()
+
+        self.assertTrue(all(result.is_ok() for result in results))
+        self.assertEqual(
+            [("first.png", "first.webp"), ("second.png", "second.webp")], [self.__get_filenames(result.ok) for result in results]
+        )
+        self.assertEqual(f"https://example.com/{self.asset.id}/converted/second.webp", results[1].ok.converted_image_data.url)
+        self.converter_repo.areplace_asset.assert_called_once_with("user")
+        self.converter_repo.abulk_create_asset_files.assert_called_once()
+        self.assertEqual(
+            (ConverterOriginalImageAssetFile, ConverterConvertedImageAssetFile) * 2,
+            tuple(param.file_type for param in self.persisted_params),
+        )
+
+    async def test_ahandle_keeps_position_of_failed_files(self) -> None:
+        self.failed_conversions.update({"second", "fourth"})
+
+        results = await self.command.ahandle(MagicMock(), self.__create_request("first.png", "second.png", "third.png", "fourth.png"))
+
+        # Failures of any file are reported in the order of the files, while the other files are still persisted in order
+        self.assertEqual(["Unable to convert 'second'", "Unable to convert 'fourth'"], [result.error.message for result in results])
+        self.assertEqual(
+            ["first.png", "first.webp", "third.png", "third.webp"],
+            [param.file_info.filename_details.fullname for param in self.persisted_params],
+        )
+
+    async def test_ahandle_reports_persistence_error(self) -> None:
+        self.persistence_error = ErrorContext.not_found("Replaced")
+
+        results = (await self.command.ahandle(MagicMock(), self.__create_request("first.png", "second.png"))).to_list()
+
+        self.assertEqual(1, len(results))
+        self.assertEqual(self.persistence_error, results[0].error)
+
+    async def test_ahandle_reports_failed_original_upload(self) -> None:
+        self.failed_uploads.add("original/second")
+
+        results = await self.command.ahandle(MagicMock(), self.__create_request("first.png", "second.png", "third.png"))
+
+        self.assertEqual(["Unable to upload 'original/second'"], [result.error.message for result in results])
+        self.assertEqual(
+            ["first.png", "first.webp", "third.png", "third.webp"],
+            [param.file_info.filename_details.fullname for param in self.persisted_params],
+        )
+
+    async def test_ahandle_releases_content_after_uploads(self) -> None:
+        content = self.__create_image()
+
+        results = (await self.command.ahandle(MagicMock(), self.__create_request("first.png"))).to_list()
+
+        # Both the conversion and the uploads get the content, but it is not kept in the params of the persisted files
+        self.assertTrue(results[0].is_ok())
+        self.assertEqual({"first": content}, self.converted_contents)
+        self.assertEqual({"original/first": content, "converted/first": b"converted first"}, self.uploaded_contents)
+        self.assertEqual([b"", b""], [param.file_info.file_details.content for param in self.persisted_params])
+        self.assertEqual([len(content), len(b"converted first")], [param.file_info.file_details.size for param in self.persisted_params])
+
+    @as_awaitable_result
+    async def __areplace_asset(self, user_id: str) -> ContextResult[ConverterImageAsset]:
+        return ContextResult[ConverterImageAsset].success(self.asset)
+
+    @staticmethod
+    @as_awaitable_result
+    async def __aschedule(user_id: str) -> ContextResult[None]:
+        return ContextResult[None].success(None)
+
+    @as_awaitable_result
+    async def __aupload_file(self, user_id: str, *, params: UploadFileParams) -> ContextResult[HttpUrl]:
+        upload_key = f"{params.relative_folder_path.rsplit('/', 1)[1]}/{params.basename}"
+        if upload_key in self.failed_uploads:
+            return ContextResult[HttpUrl].failure(ErrorContext.server_error(f"Unable to upload '{upload_key}'"))
+
+        self.uploaded_contents[upload_key] = params.content
+        extension = "webp" if params.relative_folder_path.endswith("/converted") else "png"
+        return ContextResult[HttpUrl].success(HttpUrl(f"https://example.com/{params.relative_folder_path}/{params.basename}.{extension}"))
+
+    @as_awaitable_result
+    async def __aconvert(
+        self,
+        file: ImageFile,
+        content: bytes,
+        content_hash: str,
+        options: ConversionRequest.Options,
+    ) -> ContextResult[ConvertedImage]:
+        basename = Path(str(file.filename)).stem
+        if basename in self.failed_conversions:
+            return ContextResult[ConvertedImage].failure(ErrorContext.bad_request(f"Unable to convert '{basename}'"))
+
+        self.converted_contents[basename] = content
+
+        converted_content = f"converted {basename}".encode()
+        file_info = ImageFileInfo.create(
+            ImageFileInfo.FilenameDetails.create(f"{basename}.webp", basename, f"{basename}.webp"),
+            ImageFileInfo.FileDetails(
+                format="WEBP",
+                format_description="WebP",
+                content=converted_content,
+                size=len(converted_content),
+                width=file.width,
+                height=file.height,
+                aspect_ratio=Decimal(1),
+                color_mode=file.mode,
+                exif_data={},
+            ),
+        )
+        return ContextResult[ConvertedImage].success(ConvertedImage.create(file_info, options.quality))
+
+    @as_awaitable_result
+    async def __abulk_create_asset_files(
+        self,
+        user_id: str,
+        asset_id: uuid.UUID,
+        *,
+        params: list[CreateConverterAssetFileParams],
+    ) -> ContextResult[list[Union[ConverterOriginalImageAssetFile, ConverterConvertedImageAssetFile]]]:
+        self.persisted_params.extend(params)
+        if self.persistence_error is not None:
+            return ContextResult[list[Union[ConverterOriginalImageAssetFile, ConverterConvertedImageAssetFile]]].failure(
+                self.persistence_error
+            )
+
+        return ContextResult[list[Union[ConverterOriginalImageAssetFile, ConverterConvertedImageAssetFile]]].success(
+            [
+                param.file_type(
+                    id=uuid.uuid4(),
+                    file_url=HttpUrl(param.file_url),
+                    filename=param.file_info.filename_details.fullname,
+                    filename_shorter=param.file_info.filename_details.shortname,
+                    content_type=f"image/{param.file_info.file_details.format.lower()}",
+                    format=param.file_info.file_details.format,
+                    format_description=param.file_info.file_details.format_description,
+                    size=param.file_info.file_details.size,
+                    width=param.file_info.file_details.width,
+                    height=param.file_info.file_details.height,
+                    aspect_ratio=param.file_info.file_details.aspect_ratio,
+                    color_mode=param.file_info.file_details.color_mode,
+                    exif_data=param.file_info.file_details.exif_data,
+                )
+                for param in params
+            ]
+        )
+
+    @staticmethod
+    def __create_request(*filenames: str) -> ConversionRequest:
+        files = [cast(UploadedFile, SimpleUploadedFile(filename, ConvertImagesCommandTestCase.__create_image())) for filename in filenames]
+        return ConversionRequest.create(files, ConversionRequest.Options.OutputFormats.WEBP, 80)
+
+    @staticmethod
+    def __create_image() -> bytes:
+        with BytesIO() as buffer:
+            Image.new("RGB", (8, 8)).save(buffer, "PNG")
+            return buffer.getvalue()
 
-    async def test_ahandle_success(self) -> None:
-        self.assertListEqual([], [])
-        self.assertTrue(True)
+    @staticmethod
+    def __get_filenames(response: ConversionResponse) -> tuple[str, str]:
+        return response.original_image_data.filename, response.converted_image_data.filename
@@ -0,0 +1,92 @@
+import unittest
+import uuid
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+from django.utils import timezone
+from pydantic import HttpUrl
+
+from application.common.services.session_service_factory import SessionServiceFactory
+from application.converter.queries.get_converted_zip_query import GetConvertedZipQuery
+from core.abc.logger_abc import LoggerABC
+from core.result import ContextResult, ErrorContext, as_awaitable_result
+from domain.converter.models import ConverterImageAsset
+from infrastructure.abc.converter_image_assets_repository_abc import ConverterImageAssetsRepositoryABC
+from infrastructure.abc.files_repository_abc import FilesRepositoryABC
+from infrastructure.repositories.converter_files.models import ZipArchive
+from infrastructure.repositories.converter_image_assets.models import ConvertedZipArchive
+
+
+class GetConvertedZipQueryTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.asset_file_ids = [uuid.uuid4(), uuid.uuid4()]
+        self.new_zip_archive = ZipArchive(url=HttpUrl("https://example.com/new.zip"), expires_at=timezone.now() + timedelta(minutes=15))
+
+        session_service_factory = MagicMock(spec=SessionServiceFactory)
+        session_service_factory.create.return_value.aget_user_id.side_effect = lambda: ContextResult[str].asuccess("user")
+
+        self.asset = ConverterImageAsset.create_empty(uuid.uuid4(), "user", timezone.now())
+        self.converter_repo = MagicMock(spec=ConverterImageAssetsRepositoryABC)
+        self.converter_repo.aget_asset = MagicMock(side_effect=self.__aget_asset)
+        self.converter_repo.aget_converted_asset_file_ids = MagicMock(side_effect=self.__aget_converted_asset_file_ids)
+        self.converter_repo.aget_zip_archive = AsyncMock(return_value=ContextResult[ConvertedZipArchive].failure(ErrorContext.not_found()))
+        self.converter_repo.asave_zip_archive = AsyncMock(return_value=ContextResult[None].success(None))
+
+        self.converter_files_repo = MagicMock(spec=FilesRepositoryABC)
+        self.converter_files_repo.azip_folder = MagicMock(side_effect=self.__azip_folder)
+
+        self.query = GetConvertedZipQuery(
+            session_service_factory, self.converter_files_repo, self.converter_repo, MagicMock(spec=LoggerABC)
+        )
+
+    async def test_ahandle_builds_and_memoizes_archive(self) -> None:
+        result = await self.query.ahandle(MagicMock())
+
+        self.assertEqual("https://example.com/new.zip", result.ok.zip_url)
+        self.converter_files_repo.azip_folder.assert_called_once()
+        saved_zip_archive: ConvertedZipArchive = self.converter_repo.asave_zip_archive.call_args.kwargs["zip_archive"]
+        self.assertEqual(self.new_zip_archive.url, saved_zip_archive.url)
+
+    async def test_ahandle_reuses_archive_of_same_files(self) -> None:
+        await self.query.ahandle(MagicMock())
+        saved_zip_archive: ConvertedZipArchive = self.converter_repo.asave_zip_archive.call_args.kwargs["zip_archive"]
+        self.converter_repo.aget_zip_archive.return_value = ContextResult[ConvertedZipArchive].success(saved_zip_archive)
+        # The order in which the files are listed does not change the fingerprint
+        self.asset_file_ids.reverse()
+
+        result = await self.query.ahandle(MagicMock())
+
+        self.assertEqual("https://example.com/new.zip", result.ok.zip_url)
+        self.converter_files_repo.azip_folder.assert_called_once()
+
+    async def test_ahandle_rebuilds_archive_of_changed_files(self) -> None:
+        await self.query.ahandle(MagicMock())
+        saved_zip_archive: ConvertedZipArchive = self.converter_repo.asave_zip_archive.call_args.kwargs["zip_archive"]
+        self.converter_repo.aget_zip_archive.return_value = ContextResult[ConvertedZipArchive].success(saved_zip_archive)
+        self.asset_file_ids.append(uuid.uuid4())
+
+        await self.query.ahandle(MagicMock())
+
+        self.assertEqual(2, self.converter_files_repo.azip_folder.call_count)
+
+    async def test_ahandle_rebuilds_archive_close_to_expiry(self) -> None:
+        await self.query.ahandle(MagicMock())
+        saved_zip_archive: ConvertedZipArchive = self.converter_repo.asave_zip_archive.call_args.kwargs["zip_archive"]
+        expiring_zip_archive = saved_zip_archive.model_copy(update={"expires_at": timezone.now() + timedelta(minutes=1)})
+        self.converter_repo.aget_zip_archive.return_value = ContextResult[ConvertedZipArchive].success(expiring_zip_archive)
+
+        await self.query.ahandle(MagicMock())
+
+        self.assertEqual(2, self.converter_files_repo.azip_folder.call_count)
+
+    @as_awaitable_result
+    async def __aget_asset(self, user_id: str) -> ContextResult[ConverterImageAsset]:
+        return ContextResult[ConverterImageAsset].success(self.asset)
+
+    @as_awaitable_result
+    async def __aget_converted_asset_file_ids(self, user_id: str) -> ContextResult[list[uuid.UUID]]:
+        return ContextResult[list[uuid.UUID]].success(self.asset_file_ids)
+
+    @as_awaitable_result
+    async def __azip_folder(self, user_id: str, relative_folder_path: str) -> ContextResult[ZipArchive]:
+        return ContextResult[ZipArchive].success(self.new_zip_archive)
@@ -0,0 +1,89 @@
+import asyncio
+import io
+import unittest
+import uuid
+import zipfile
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+from pydantic import HttpUrl
+
+from application.common.services.session_service_factory import SessionServiceFactory
+from application.converter.queries.stream_converted_zip_query import StreamConvertedZipQuery
+from core.abc.logger_abc import LoggerABC
+from core.result import ContextResult, ErrorContext
+from domain.converter.models import ConverterConvertedImageAssetFile
+from infrastructure.abc.converter_image_assets_repository_abc import ConverterImageAssetsRepositoryABC
+from infrastructure.abc.files_repository_abc import FilesRepositoryABC
+
+
+class StreamConvertedZipQueryTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+        session_service_factory = MagicMock(spec=SessionServiceFactory)
+        session_service_factory.create.return_value.aget_user_id.side_effect = lambda: ContextResult[str].asuccess("user")
+
+        self.converter_repo = MagicMock(spec=ConverterImageAssetsRepositoryABC)
+        self.converter_files_repo = MagicMock(spec=FilesRepositoryABC)
+        self.converter_files_repo.adownload_file = AsyncMock(side_effect=self.adownload_file)
+
+        self.query = StreamConvertedZipQuery(
+            session_service_factory,
+            self.converter_files_repo,
+            self.converter_repo,
+            MagicMock(spec=LoggerABC),
+        )
+
+    async def adownload_file(self, file_url: HttpUrl) -> ContextResult[bytes]:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if file_url.path == "/broken.webp":
+            return ContextResult[bytes].failure(ErrorContext.server_error())
+        return ContextResult[bytes].success(str(file_url.path).encode())
+
+    async def test_ahandle_streams_downloaded_files(self) -> None:
+        filenames = [f"image_{index}.webp" for index in range(8)] + ["image_0.webp", "broken.webp"]
+        self.converter_repo.aget_converted_asset_files = AsyncMock(
+            return_value=ContextResult[list[ConverterConvertedImageAssetFile]].success([self.create_asset_file(name) for name in filenames])
+        )
+
+        result = await self.query.ahandle(MagicMock())
+
+        self.assertTrue(result.is_ok())
+        with zipfile.ZipFile(io.BytesIO(b"".join([chunk async for chunk in result.ok]))) as archive:
+            self.assertEqual(9, len(archive.namelist()))
+            self.assertIn("1_image_0.webp", archive.namelist())
+            self.assertNotIn("broken.webp", archive.namelist())
+        self.assertEqual(4, self.max_in_flight)
+
+    async def test_ahandle_without_files_is_not_found(self) -> None:
+        self.converter_repo.aget_converted_asset_files = AsyncMock(
+            return_value=ContextResult[list[ConverterConvertedImageAssetFile]].success([])
+        )
+
+        result = await self.query.ahandle(MagicMock())
+
+        self.assertTrue(result.is_error())
+        self.assertEqual(ErrorContext.ErrorCode.NOT_FOUND, result.error.error_code)
+
+    @staticmethod
+    def create_asset_file(filename: str) -> ConverterConvertedImageAssetFile:
+        return ConverterConvertedImageAssetFile(
+            id=uuid.uuid4(),
+            file_url=HttpUrl(f"https://example.com/{filename}"),
+            filename=filename,
+            filename_shorter=filename,
+            content_type="image/webp",
+            format="WEBP",
+            format_description="WebP",
+            size=1,
+            width=1,
+            height=1,
+            aspect_ratio=Decimal(1),
+            color_mode="RGB",
+            exif_data={},
+        )
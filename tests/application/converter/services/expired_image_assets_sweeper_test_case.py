@@ -0,0 +1,46 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+from application.converter.services.abc.image_assets_cleanup_worker_abc import ImageAssetsCleanupWorkerABC
+from application.converter.services.expired_image_assets_sweeper import ExpiredImageAssetsSweeper
+from application.converter.services.models.cleanup import CleanupStats
+from core.abc.logger_abc import LoggerABC
+from core.result import ContextResult, ErrorContext
+from infrastructure.abc.converter_image_assets_repository_abc import ConverterImageAssetsRepositoryABC
+
+
+class ExpiredImageAssetsSweeperTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.converter_repo = MagicMock(spec=ConverterImageAssetsRepositoryABC)
+        self.assets_cleanup_worker = MagicMock(spec=ImageAssetsCleanupWorkerABC)
+        self.assets_cleanup_worker.adrain = MagicMock(
+            side_effect=lambda: ContextResult[CleanupStats].asuccess(CleanupStats(cleaned=700, failed=2))
+        )
+        self.sweeper = ExpiredImageAssetsSweeper(
+            timedelta(minutes=15),
+            self.converter_repo,
+            self.assets_cleanup_worker,
+            MagicMock(spec=LoggerABC),
+        )
+
+    async def test_asweep_tombstones_in_batches_then_drains(self) -> None:
+        self.converter_repo.atombstone_expired_assets = AsyncMock(
+            side_effect=[ContextResult[int].success(500), ContextResult[int].success(202)]
+        )
+
+        result = await self.sweeper.asweep()
+
+        self.assertTrue(result.is_ok())
+        self.assertEqual((702, 700, 2), (result.ok.expired_assets, result.ok.cleaned_folders, result.ok.failed_folders))
+        self.assertEqual(2, self.converter_repo.atombstone_expired_assets.await_count)
+        created_before = self.converter_repo.atombstone_expired_assets.await_args.kwargs["created_before"]
+        self.assertAlmostEqual((datetime.now(timezone.utc) - timedelta(minutes=15)).timestamp(), created_before.timestamp(), delta=5)
+
+    async def test_asweep_stops_on_database_error(self) -> None:
+        self.converter_repo.atombstone_expired_assets = AsyncMock(return_value=ContextResult[int].failure(ErrorContext.server_error()))
+
+        result = await self.sweeper.asweep()
+
+        self.assertTrue(result.is_error())
+        self.assets_cleanup_worker.adrain.assert_not_called()
@@ -0,0 +1,60 @@
+import asyncio
+import unittest
+import uuid
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+from application.converter.services.image_assets_cleanup_worker import ImageAssetsCleanupWorker
+from core.abc.logger_abc import LoggerABC
+from core.result import ContextResult, ErrorContext
+from infrastructure.abc.converter_image_assets_repository_abc import ConverterImageAssetsRepositoryABC
+from infrastructure.abc.files_repository_abc import FilesRepositoryABC
+from infrastructure.repositories.converter_image_assets.models import ImageAssetTombstone
+
+
+class ImageAssetsCleanupWorkerTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.tombstone = ImageAssetTombstone(asset_id=uuid.uuid4(), user_id="user", attempts=2)
+
+        self.converter_repo = MagicMock(spec=ConverterImageAssetsRepositoryABC)
+        self.converter_repo.aget_due_tombstones = AsyncMock(
+            side_effect=[ContextResult[list[ImageAssetTombstone]].success([self.tombstone])]
+            + [ContextResult[list[ImageAssetTombstone]].success([])] * 10
+        )
+        self.converter_repo.adelete_tombstone = AsyncMock(return_value=ContextResult[None].success(None))
+        self.converter_repo.areschedule_tombstone = AsyncMock(return_value=ContextResult[None].success(None))
+
+        self.converter_files_repo = MagicMock(spec=FilesRepositoryABC)
+        self.converter_files_repo.adelete_files = AsyncMock(return_value=ContextResult[None].success(None))
+
+    def create_worker(self, mode: ImageAssetsCleanupWorker.Mode) -> ImageAssetsCleanupWorker:
+        return ImageAssetsCleanupWorker(mode, self.converter_repo, self.converter_files_repo, 4, 100, MagicMock(spec=LoggerABC))
+
+    async def test_inline_cleanup_deletes_files_and_tombstone(self) -> None:
+        result = await self.create_worker(ImageAssetsCleanupWorker.Mode.INLINE).aschedule("user")
+
+        self.assertTrue(result.is_ok())
+        self.converter_repo.aget_due_tombstones.assert_awaited_once_with(user_id="user", limit=50)
+        self.converter_files_repo.adelete_files.assert_awaited_once_with("user", str(self.tombstone.asset_id))
+        self.converter_repo.adelete_tombstone.assert_awaited_once_with(self.tombstone.asset_id)
+
+    async def test_failed_cleanup_is_rescheduled_with_backoff(self) -> None:
+        self.converter_files_repo.adelete_files.return_value = ContextResult[None].failure(ErrorContext.server_error())
+
+        result = await self.create_worker(ImageAssetsCleanupWorker.Mode.INLINE).aschedule("user")
+
+        self.assertTrue(result.is_error())
+        self.converter_repo.adelete_tombstone.assert_not_awaited()
+        self.assertEqual(timedelta(seconds=20), self.converter_repo.areschedule_tombstone.await_args.kwargs["delay"])
+
+    async def test_deferred_cleanup_runs_in_background(self) -> None:
+        worker = self.create_worker(ImageAssetsCleanupWorker.Mode.DEFERRED)
+        self.addAsyncCleanup(worker.aclose)
+
+        result = await worker.aschedule("user")
+
+        self.assertTrue(result.is_ok())
+        async with asyncio.timeout(5):
+            while self.converter_repo.adelete_tombstone.await_count == 0:
+                await asyncio.sleep(0.01)
+        self.converter_files_repo.adelete_files.assert_awaited_once_with("user", str(self.tombstone.asset_id))
@@ -0,0 +1,106 @@
+import unittest
+from io import BytesIO
+from unittest.mock import patch
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageSequence
+
+from application.converter.services.image_file_converter_worker import ImageFileConverterWorker
+from domain.converter.constants import ConverterConstants
+
+
+class ImageFileConverterWorkerTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        frames: list[Image.Image] = []
+        for index in range(6):
+            frame = Image.new("RGBA", (64, 48), (0, 0, 0, 0))
+            draw = ImageDraw.Draw(frame)
+            draw.rectangle((index * 4, 10, index * 4 + 10, 30), fill=(255, index * 40, 0, 255))
+            # A translucent pixel keeps the alpha channel in the encoded source
+            draw.point((60, 2), fill=(0, 0, 255, 100))
+            frames.append(frame)
+
+        with BytesIO() as buffer:
+            durations = [40 + index * 10 for index in range(6)]
+            frames[0].save(buffer, "WEBP", save_all=True, append_images=frames[1:], duration=durations, loop=0, lossless=True, exact=True)
+            self.content = buffer.getvalue()
+
+    def test_convert_keeps_frames_and_durations_of_animation(self) -> None:
+        for output_format in ConverterConstants.ANIMATED_IMAGE_FORMATS:
+            converted = ImageFileConverterWorker.convert(self.content, ImageFileConverterWorker.Params.create(output_format, 80))
+
+            durations: list[int] = []
+            with Image.open(BytesIO(converted)) as image:
+                self.assertEqual(output_format, image.format)
+                for frame in ImageSequence.Iterator(image):
+                    frame.load()
+                    durations.append(frame.info["duration"])
+                last_frame = image.convert("RGBA")
+
+            self.assertEqual([40, 50, 60, 70, 80, 90], durations)
+            # Colors of the last frame and transparency are kept
+            self.assertAlmostEqual(200, last_frame.getpixel((22, 20))[1], delta=8)  # pyright: ignore
+            self.assertEqual(0, last_frame.getpixel((1, 1))[3])  # pyright: ignore
+
+    def test_convert_flattens_animation_for_single_frame_format(self) -> None:
+        converted = ImageFileConverterWorker.convert(self.content, ImageFileConverterWorker.Params.create("PNG", 80))
+
+        self.assertEqual(1, getattr(Image.open(BytesIO(converted)), "n_frames", 1))
+
+    def test_convert_rejects_animation_over_pixel_budget(self) -> None:
+        with patch.object(ConverterConstants, "MAX_TOTAL_FRAME_PIXELS", 64 * 48 * 5):
+            with self.assertRaises(ValueError):
+                ImageFileConverterWorker.convert(self.content, ImageFileConverterWorker.Params.create("WEBP", 80))
+
+    def test_convert_adaptive_fits_target_size(self) -> None:
+        content = self.__create_photo()
+        full_size = len(ImageFileConverterWorker.convert(content, ImageFileConverterWorker.Params.create("JPEG", 95)))
+
+        converted = ImageFileConverterWorker.convert_adaptive(content, ImageFileConverterWorker.Params.create("JPEG", 95, full_size // 3))
+
+        self.assertLess(converted.item1, 95)
+        # The size is estimated from a downscaled trial, so it is only expected to be close to the target
+        self.assertLess(len(converted.item2), full_size // 3 * 1.25)
+
+    def test_convert_adaptive_chooses_lowest_similar_quality(self) -> None:
+        content = self.__create_photo()
+
+        loose = ImageFileConverterWorker.convert_adaptive(content, ImageFileConverterWorker.Params.create("WEBP", 95, target_ssim=0.8))
+        strict = ImageFileConverterWorker.convert_adaptive(content, ImageFileConverterWorker.Params.create("WEBP", 95, target_ssim=0.98))
+
+        self.assertLess(loose.item1, strict.item1)
+        self.assertLess(len(loose.item2), len(strict.item2))
+
+    def test_convert_downscales_to_smallest_allowed_size(self) -> None:
+        with BytesIO() as buffer:
+            Image.open(BytesIO(self.__create_photo())).save(buffer, "JPEG", quality=90)
+            content = buffer.getvalue()
+
+        cases = [
+            (ImageFileConverterWorker.Params.create("WEBP", 80, max_width=256), (256, 192)),
+            (ImageFileConverterWorker.Params.create("PNG", 80, max_width=512, max_height=96), (128, 96)),
+            (ImageFileConverterWorker.Params.create("JPEG", 80, max_width=512, scale=0.25), (256, 192)),
+            # Images are never upscaled
+            (ImageFileConverterWorker.Params.create("JPEG", 80, max_width=4096), (1024, 768)),
+        ]
+        for params, size in cases:
+            with Image.open(BytesIO(ImageFileConverterWorker.convert(content, params))) as image:
+                self.assertEqual(size, image.size)
+
+    def test_convert_downscales_frames_of_animation(self) -> None:
+        for output_format in ConverterConstants.ANIMATED_IMAGE_FORMATS:
+            params = ImageFileConverterWorker.Params.create(output_format, 80, scale=0.5)
+
+            with Image.open(BytesIO(ImageFileConverterWorker.convert(self.content, params))) as image:
+                self.assertEqual((32, 24), image.size)
+                self.assertEqual(6, getattr(image, "n_frames", 1))
+
+    @staticmethod
+    def __create_photo() -> bytes:
+        # Smooth gradients with noise, so the encoded size and similarity depend on the quality
+        generator = np.random.default_rng(7)
+        y, x = np.mgrid[0:768, 0:1024]
+        pixels = np.stack((x / 4, y / 3, (x + y) / 7), axis=-1) + generator.normal(0, 12, (768, 1024, 3))
+        with BytesIO() as buffer:
+            Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8), "RGB").save(buffer, "PNG")
+            return buffer.getvalue()
@@ -0,0 +1,80 @@
+import unittest
+from io import BytesIO
+from typing import cast
+from unittest.mock import MagicMock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from ninja import UploadedFile
+from PIL import Image
+
+from application.common.abc.image_file_service_abc import ImageFileServiceABC
+from application.common.services.filename_service import FilenameService
+from application.converter.commands.schemas import ConversionRequest
+from application.converter.validators.conversion_request_validator import ConversionRequestValidator
+from core.abc.logger_abc import LoggerABC
+
+
+class ConversionRequestValidatorTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        logger = MagicMock(spec=LoggerABC)
+        self.validator = ConversionRequestValidator(MagicMock(spec=ImageFileServiceABC), FilenameService(logger), logger)
+
+    def test_validate_success(self) -> None:
+        result = self.validator.validate(self.__create_request(self.__create_image("PNG", (64, 32))))
+
+        self.assertTrue(result.is_ok())
+
+    def test_validate_rejects_image_over_pixel_budget(self) -> None:
+        result = self.validator.validate(self.__create_request(self.__create_image("PNG", (10_000, 6_000), mode="1")))
+
+        self.assertTrue(result.is_error())
+        self.assertIn("10000x6000", result.error.reasons[0])
+
+    def test_validate_rejects_unknown_content(self) -> None:
+        result = self.validator.validate(self.__create_request(b"definitely not an image"))
+
+        self.assertTrue(result.is_error())
+        self.assertIn("Incompatible file type", result.error.reasons[0])
+
+    def test_validate_leaves_file_at_start(self) -> None:
+        uploaded_file = cast(UploadedFile, SimpleUploadedFile("image.png", self.__create_image("PNG", (8, 8))))
+
+        self.validator.validate(ConversionRequest.create([uploaded_file], ConversionRequest.Options.OutputFormats.WEBP, 80))
+
+        self.assertEqual(0, uploaded_file.tell())
+
+    def test_validate_rejects_invalid_targets(self) -> None:
+        content = self.__create_image("PNG", (8, 8))
+        cases = [
+            (ConversionRequest.Options.OutputFormats.WEBP, 1000, 0.9, "Only one of"),
+            (ConversionRequest.Options.OutputFormats.PNG, 1000, None, "only supported for"),
+            (ConversionRequest.Options.OutputFormats.JPEG, None, 1.5, "Target SSIM must be between"),
+        ]
+        for output_format, target_size_bytes, target_ssim, reason in cases:
+            uploaded_file = cast(UploadedFile, SimpleUploadedFile("image.png", content))
+            request = ConversionRequest.create([uploaded_file], output_format, 80, target_size_bytes, target_ssim)
+
+            result = self.validator.validate(request)
+
+            self.assertTrue(result.is_error())
+            self.assertIn(reason, result.error.reasons[0])
+
+    def test_validate_rejects_upscaling(self) -> None:
+        uploaded_file = cast(UploadedFile, SimpleUploadedFile("image.png", self.__create_image("PNG", (8, 8))))
+        request = ConversionRequest.create([uploaded_file], ConversionRequest.Options.OutputFormats.WEBP, 80, scale=1.5)
+
+        result = self.validator.validate(request)
+
+        self.assertTrue(result.is_error())
+        self.assertIn("Scale must be greater than 0", result.error.reasons[0])
+
+    @staticmethod
+    def __create_request(content: bytes) -> ConversionRequest:
+        uploaded_file = cast(UploadedFile, SimpleUploadedFile("image.png", content))
+        return ConversionRequest.create([uploaded_file], ConversionRequest.Options.OutputFormats.WEBP, 80)
+
+    @staticmethod
+    def __create_image(image_format: str, size: tuple[int, int], mode: str = "RGB") -> bytes:
+        with BytesIO() as buffer:
+            Image.new(mode, size).save(buffer, image_format)
+            return buffer.getvalue()
@@ -0,0 +1,27 @@
+import io
+import unittest
+import zipfile
+from typing import AsyncIterator
+
+from core.archives.stored_zip_stream import StoredZipStream
+from core.types import Pair
+
+
+class StoredZipStreamTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_aiter_writes_stored_entries(self) -> None:
+        entries = {"first.webp": b"a" * 200_000, "second.webp": b"b" * 10, "empty.webp": b""}
+
+        async def aiter_entries() -> AsyncIterator[Pair[str, bytes]]:
+            for filename, content in entries.items():
+                yield Pair(filename, content)
+
+        chunks = [chunk async for chunk in StoredZipStream.aiter(aiter_entries())]
+
+        with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as archive:
+            self.assertIsNone(archive.testzip())
+            self.assertEqual(entries, {info.filename: archive.read(info) for info in archive.infolist()})
+            self.assertTrue(all(info.compress_type == zipfile.ZIP_STORED for info in archive.infolist()))
+        # The content is yielded in chunks as it is written, not as one archive at the end
+        self.assertGreater(len(chunks), 4)
+        self.assertLessEqual(max(len(chunk) for chunk in chunks), 70 * 1024)
+        self.assertNotIn(b"", chunks)
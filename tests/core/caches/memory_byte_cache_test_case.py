@@ -0,0 +1,38 @@
+import unittest
+
+from core.caches.memory_byte_cache import MemoryByteCache
+
+
+class MemoryByteCacheTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_aget_hit_and_miss(self) -> None:
+        cache = MemoryByteCache(max_size_bytes=1024, ttl_seconds=60)
+
+        await cache.aset("key", b"value")
+
+        self.assertEqual(b"value", (await cache.aget("key")).value)
+        self.assertTrue((await cache.aget("missing")).is_none())
+
+        stats = cache.get_stats()
+        self.assertEqual((1, 1, 1), (stats.hits, stats.misses, stats.writes))
+        self.assertEqual(0.5, stats.hit_ratio)
+
+    async def test_aset_evicts_least_recently_used(self) -> None:
+        cache = MemoryByteCache(max_size_bytes=10, ttl_seconds=60)
+
+        await cache.aset("first", b"1234")
+        await cache.aset("second", b"1234")
+        await cache.aget("first")
+        await cache.aset("third", b"1234")
+
+        self.assertTrue((await cache.aget("first")).is_some())
+        self.assertTrue((await cache.aget("second")).is_none())
+        self.assertTrue((await cache.aget("third")).is_some())
+        self.assertEqual(1, cache.get_stats().evictions)
+
+    async def test_aset_skips_oversized_value(self) -> None:
+        cache = MemoryByteCache(max_size_bytes=4, ttl_seconds=60)
+
+        await cache.aset("key", b"12345")
+
+        self.assertTrue((await cache.aget("key")).is_none())
+        self.assertEqual(0, cache.get_stats().writes)
@@ -0,0 +1,38 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from core.abc.logger_abc import LoggerABC
+from core.caches.sqlite_byte_cache import SqliteByteCache
+
+
+class SqliteByteCacheTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.database_path = Path(directory.name) / "cache.sqlite3"
+        self.logger = MagicMock(spec=LoggerABC)
+
+    async def test_aget_shared_between_instances(self) -> None:
+        writer = SqliteByteCache(self.database_path, max_size_bytes=1024, ttl_seconds=60, logger=self.logger)
+        reader = SqliteByteCache(self.database_path, max_size_bytes=1024, ttl_seconds=60, logger=self.logger)
+
+        await writer.aset("key", b"value")
+
+        self.assertEqual(b"value", (await reader.aget("key")).value)
+        self.assertTrue((await reader.aget("missing")).is_none())
+        self.assertEqual((1, 1), (reader.get_stats().hits, reader.get_stats().misses))
+
+    async def test_aset_evicts_least_recently_used(self) -> None:
+        cache = SqliteByteCache(self.database_path, max_size_bytes=10, ttl_seconds=60, logger=self.logger)
+
+        await cache.aset("first", b"1234")
+        await cache.aset("second", b"1234")
+        await cache.aget("first")
+        await cache.aset("third", b"1234")
+
+        self.assertTrue((await cache.aget("first")).is_some())
+        self.assertTrue((await cache.aget("second")).is_none())
+        self.assertTrue((await cache.aget("third")).is_some())
+        self.assertEqual(1, cache.get_stats().evictions)
@@ -0,0 +1,22 @@
+import unittest
+
+from core.caches.memory_byte_cache import MemoryByteCache
+from core.caches.tiered_byte_cache import TieredByteCache
+
+
+class TieredByteCacheTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_aget_promotes_far_entries(self) -> None:
+        near_cache = MemoryByteCache(max_size_bytes=5, ttl_seconds=60)
+        far_cache = MemoryByteCache(max_size_bytes=1024, ttl_seconds=60)
+        cache = TieredByteCache(near_cache, far_cache)
+
+        await cache.aset("first", b"value")
+        # Evicts the first entry from the near tier only
+        await cache.aset("second", b"value")
+
+        self.assertEqual(b"value", (await cache.aget("first")).value)
+        self.assertTrue((await cache.aget("missing")).is_none())
+
+        stats = cache.get_stats()
+        self.assertEqual((1, 1, 2, 0), (stats.hits, stats.misses, stats.writes, stats.evictions))
+        self.assertEqual(b"value", (await near_cache.aget("first")).value)
@@ -0,0 +1,60 @@
+import time
+import unittest
+from io import BytesIO
+from unittest.mock import MagicMock
+
+from PIL import Image
+
+from application.converter.services.image_file_converter_worker import ImageFileConverterWorker
+from core.abc.logger_abc import LoggerABC
+from core.executors.pool_task_executor import PoolTaskExecutor
+from core.result import ErrorContext
+
+
+class PoolTaskExecutorTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.logger = MagicMock(spec=LoggerABC)
+
+    async def test_aexecute_thread_success(self) -> None:
+        executor = PoolTaskExecutor(PoolTaskExecutor.Mode.THREAD, 2, 5, self.logger)
+        self.addCleanup(executor.shutdown)
+
+        result = await executor.aexecute(sum, [1, 2, 3])
+
+        self.assertTrue(result.is_ok())
+        self.assertEqual(6, result.ok)
+
+    async def test_aexecute_thread_timeout(self) -> None:
+        executor = PoolTaskExecutor(PoolTaskExecutor.Mode.THREAD, 1, 0.05, self.logger)
+        self.addCleanup(executor.shutdown)
+
+        result = await executor.aexecute(time.sleep, 0.5)
+
+        self.assertTrue(result.is_error())
+        self.assertEqual(ErrorContext.ErrorCode.INTERNAL_SERVER_ERROR, result.error.error_code)
+
+    async def test_aexecute_thread_exception(self) -> None:
+        executor = PoolTaskExecutor(PoolTaskExecutor.Mode.THREAD, 1, 5, self.logger)
+        self.addCleanup(executor.shutdown)
+
+        result = await executor.aexecute(int, "not a number")
+
+        self.assertTrue(result.is_error())
+        self.logger.exception.assert_called_once()
+
+    async def test_aexecute_process_converts_image(self) -> None:
+        executor = PoolTaskExecutor(PoolTaskExecutor.Mode.PROCESS, 1, 60, self.logger)
+        self.addCleanup(executor.shutdown)
+
+        with BytesIO() as buffer:
+            Image.new("RGBA", (64, 32), (255, 0, 0, 128)).save(buffer, "PNG")
+            content = buffer.getvalue()
+
+        params = ImageFileConverterWorker.Params.create("JPEG", 80)
+        result = await executor.aexecute(ImageFileConverterWorker.convert, content, params)
+
+        self.assertTrue(result.is_ok())
+        with Image.open(BytesIO(result.ok)) as converted:
+            self.assertEqual("JPEG", converted.format)
+            self.assertEqual((64, 32), converted.size)
+            self.assertEqual("RGB", converted.mode)
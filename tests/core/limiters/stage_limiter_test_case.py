@@ -0,0 +1,33 @@
+import asyncio
+import unittest
+
+from core.limiters.stage_limiter import StageLimiter
+from core.tracing.tracer import Tracer
+
+
+class StageLimiterTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_aslot_limits_concurrency_of_stage(self) -> None:
+        tracer = Tracer(enabled=True)
+        stage_limiter = StageLimiter({"convert": 2, "upload": 1}, tracer)
+        in_flight = 0
+        max_in_flight = 0
+
+        async def aconvert() -> None:
+            nonlocal in_flight, max_in_flight
+            async with stage_limiter.aslot("convert"):
+                in_flight += 1
+                max_in_flight = max(max_in_flight, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+
+        await asyncio.gather(*(aconvert() for _ in range(5)))
+
+        self.assertEqual(2, max_in_flight)
+        self.assertIn('webpeditor_stage_duration_seconds_count{stage="convert-queue"} 5', tracer.render_metrics())
+
+    async def test_aslot_rejects_unknown_stage(self) -> None:
+        stage_limiter = StageLimiter({"convert": 1}, Tracer(enabled=False))
+
+        with self.assertRaises(ValueError):
+            async with stage_limiter.aslot("decode"):
+                pass
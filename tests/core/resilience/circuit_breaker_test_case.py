@@ -0,0 +1,40 @@
+import unittest
+from unittest.mock import patch
+
+from core.resilience.circuit_breaker import CircuitBreaker
+
+
+class CircuitBreakerTestCase(unittest.TestCase):
+    def test_half_open_trial_closes_or_reopens_circuit(self) -> None:
+        circuit_breaker = CircuitBreaker(failure_threshold=2, reset_timeout_seconds=10)
+
+        with patch("core.resilience.circuit_breaker.time.monotonic", return_value=100.0):
+            self.assertFalse(circuit_breaker.record_failure())
+            self.assertTrue(circuit_breaker.record_failure())
+            self.assertFalse(circuit_breaker.allow_request())
+
+        with patch("core.resilience.circuit_breaker.time.monotonic", return_value=110.0):
+            self.assertTrue(circuit_breaker.allow_request())
+            # Only one trial request is let through
+            self.assertFalse(circuit_breaker.allow_request())
+            self.assertTrue(circuit_breaker.record_failure())
+            self.assertEqual(CircuitBreaker.State.OPEN, circuit_breaker.state)
+
+        with patch("core.resilience.circuit_breaker.time.monotonic", return_value=120.0):
+            self.assertTrue(circuit_breaker.allow_request())
+            circuit_breaker.record_success()
+            self.assertEqual(CircuitBreaker.State.CLOSED, circuit_breaker.state)
+            self.assertEqual(2, circuit_breaker.trips)
+
+    def test_cancelled_trial_lets_next_request_through(self) -> None:
+        circuit_breaker = CircuitBreaker(failure_threshold=1, reset_timeout_seconds=10)
+
+        with patch("core.resilience.circuit_breaker.time.monotonic", return_value=100.0):
+            self.assertTrue(circuit_breaker.record_failure())
+
+        with patch("core.resilience.circuit_breaker.time.monotonic", return_value=110.0):
+            self.assertTrue(circuit_breaker.allow_request())
+            circuit_breaker.record_cancellation()
+            self.assertEqual(CircuitBreaker.State.OPEN, circuit_breaker.state)
+            self.assertTrue(circuit_breaker.allow_request())
+            self.assertEqual(1, circuit_breaker.trips)
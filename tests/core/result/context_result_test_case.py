@@ -0,0 +1,50 @@
+import asyncio
+import time
+import unittest
+
+from core.result import ContextResult, ErrorContext, as_awaitable_result
+
+
+class ContextResultTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_azip_awaits_both_results_concurrently(self) -> None:
+        started_at = time.perf_counter()
+
+        result = await self.__asleep(0.1, 1).azip(self.__asleep(0.1, 2), lambda first, second: first + second)
+
+        self.assertEqual(3, result.ok)
+        self.assertLess(time.perf_counter() - started_at, 0.18)
+
+    async def test_azip_cancels_other_result_on_failure(self) -> None:
+        other = asyncio.Event()
+
+        @as_awaitable_result
+        async def afail() -> ContextResult[int]:
+            await asyncio.sleep(0.01)
+            return ContextResult[int].failure(ErrorContext.server_error("Upload failed"))
+
+        @as_awaitable_result
+        async def await_forever() -> ContextResult[int]:
+            try:
+                await asyncio.sleep(10)
+            finally:
+                other.set()
+            return ContextResult[int].success(0)
+
+        result = await afail().azip(await_forever(), lambda first, second: first + second)
+
+        self.assertEqual("Upload failed", result.error.message)
+        self.assertTrue(other.is_set())
+
+    async def test_azip_raises_unexpected_exception(self) -> None:
+        @as_awaitable_result
+        async def araise() -> ContextResult[int]:
+            raise ValueError("Unexpected")
+
+        with self.assertRaises(ValueError):
+            await self.__asleep(0.01, 1).azip(araise(), lambda first, second: first + second)
+
+    @staticmethod
+    @as_awaitable_result
+    async def __asleep(delay: float, value: int) -> ContextResult[int]:
+        await asyncio.sleep(delay)
+        return ContextResult[int].success(value)
@@ -0,0 +1,53 @@
+import asyncio
+import unittest
+
+from core.result import ContextResult, ErrorContext
+from core.tracing.tracer import Tracer
+
+
+class TracerTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_span_records_duration_and_size(self) -> None:
+        tracer = Tracer(enabled=True)
+
+        with tracer.trace_request() as request_trace:
+            with tracer.span("decode") as span:
+                span.add_bytes(2048)
+
+        metrics = tracer.render_metrics()
+        self.assertIn('webpeditor_stage_duration_seconds_count{stage="decode"} 1', metrics)
+        self.assertIn('webpeditor_stage_size_bytes_bucket{stage="decode",le="1024"} 0', metrics)
+        self.assertIn('webpeditor_stage_size_bytes_bucket{stage="decode",le="4096"} 1', metrics)
+        self.assertIsNotNone(request_trace)
+        self.assertRegex(request_trace.to_server_timing() if request_trace else "", r"^decode;dur=\d+\.\d$")
+
+    async def test_atrace_sums_concurrent_stages_of_request(self) -> None:
+        tracer = Tracer(enabled=True)
+
+        async def aconvert(size: int) -> ContextResult[bytes]:
+            await asyncio.sleep(0.01)
+            return ContextResult[bytes].success(bytes(size))
+
+        async def aupload() -> ContextResult[None]:
+            return ContextResult[None].failure(ErrorContext.server_error())
+
+        with tracer.trace_request() as request_trace:
+            await asyncio.gather(*(tracer.atrace("convert", aconvert(size), measure=len) for size in (10, 20)))
+            await tracer.atrace("upload", aupload(), measure=lambda _: 1)
+
+        metrics = tracer.render_metrics()
+        self.assertIn('webpeditor_stage_duration_seconds_count{stage="convert"} 2', metrics)
+        self.assertIn('webpeditor_stage_size_bytes_sum{stage="convert"} 30.0', metrics)
+        self.assertNotIn('webpeditor_stage_size_bytes_count{stage="upload"}', metrics)
+        server_timing = request_trace.to_server_timing() if request_trace else ""
+        self.assertRegex(server_timing, r"^convert;dur=\d+\.\d, upload;dur=\d+\.\d$")
+        self.assertGreaterEqual(float(server_timing.split(",")[0].removeprefix("convert;dur=")), 20)
+
+    async def test_disabled_tracer_records_nothing(self) -> None:
+        tracer = Tracer(enabled=False)
+
+        with tracer.trace_request() as request_trace:
+            with tracer.span("decode") as span:
+                span.add_bytes(1)
+
+        self.assertIsNone(request_trace)
+        self.assertNotIn("stage=", tracer.render_metrics())
@@ -0,0 +1,254 @@
+import asyncio
+import json
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, ClassVar, Optional
+from unittest.mock import MagicMock, patch
+from urllib.parse import parse_qs, urlparse
+
+from core.abc.logger_abc import LoggerABC
+from core.caches.memory_byte_cache import MemoryByteCache
+from infrastructure.cloudinary.cloudinary_client import CloudinaryClient
+
+
+class _FakeCloudinaryHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests: ClassVar[list[tuple[str, dict[str, list[str]]]]] = []
+    paths: ClassVar[list[str]] = []
+    uploads: ClassVar[list[tuple[Optional[str], Optional[str], int]]] = []
+    # Status codes and headers of the failures returned before any regular response
+    failures: ClassVar[list[tuple[int, dict[str, str]]]] = []
+
+    def do_GET(self) -> None:
+        query = self.__record("GET")
+        if self.__respond_failure():
+            return
+
+        cursor = query.get("next_cursor", ["0"])[0]
+        page = int(cursor)
+        self.__respond(
+            {
+                "total_count": 3,
+                "resources": [self.__file_data(f"file_{page}")],
+                **({"next_cursor": str(page + 1)} if page < 2 else {}),
+            }
+        )
+
+    def do_POST(self) -> None:
+        self.__record("POST")
+        content_range = self.headers.get("Content-Range")
+        body_size = len(self.rfile.read(int(self.headers["Content-Length"])))
+        self.uploads.append((self.headers.get("X-Unique-Upload-Id"), content_range, body_size))
+
+        if content_range is not None and not self.__is_last_chunk(content_range):
+            self.__respond({"done": False})
+        else:
+            self.__respond({"asset_id": "file", "secure_url": "https://example.com/file.webp"})
+
+    def do_DELETE(self) -> None:
+        query = self.__record("DELETE")
+        if "prefix" in query:
+            partial = "next_cursor" not in query
+            self.__respond({"deleted": {f"{query['prefix'][0]}{len(self.requests)}": "deleted"}, "partial": partial, "next_cursor": "next"})
+        else:
+            self.__respond({"deleted": {public_id: "deleted" for public_id in query["public_ids[]"]}})
+
+    def log_message(self, format: str, *args: Any) -> None: ...
+
+    def __record(self, method: str) -> dict[str, list[str]]:
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        self.requests.append((method, query))
+        self.paths.append(url.path)
+        return query
+
+    def __respond_failure(self) -> bool:
+        if len(self.failures) == 0:
+            return False
+
+        status_code, headers = self.failures.pop(0)
+        self.send_response(status_code)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+        return True
+
+    def __respond(self, body: dict[str, Any]) -> None:
+        content = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    @staticmethod
+    def __is_last_chunk(content_range: str) -> bool:
+        byte_range, size = content_range.removeprefix("bytes ").split("/")
+        return int(byte_range.split("-")[1]) == int(size) - 1
+
+    @staticmethod
+    def __file_data(public_id: str) -> dict[str, Any]:
+        return {
+            "asset_id": public_id,
+            "public_id": public_id,
+            "created_at": "2025-01-01T00:00:00Z",
+            "format": "webp",
+            "bytes": 1,
+            "width": 1,
+            "height": 1,
+            "asset_folder": "folder",
+            "secure_url": f"https://example.com/{public_id}.webp",
+        }
+
+
+class CloudinaryClientTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        _FakeCloudinaryHandler.requests.clear()
+        _FakeCloudinaryHandler.paths.clear()
+        _FakeCloudinaryHandler.uploads.clear()
+        _FakeCloudinaryHandler.failures.clear()
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeCloudinaryHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        settings_patch = patch.multiple(
+            "webpeditor.settings",
+            CLOUDINARY_BASE_URL=f"http://127.0.0.1:{server.server_address[1]}",
+            CLOUDINARY_HTTP2_ENABLED=False,
+            CLOUDINARY_UPLOAD_CHUNK_SIZE_BYTES=1024,
+            CLOUDINARY_RETRY_BASE_DELAY_SECONDS=0.01,
+            CLOUDINARY_CIRCUIT_BREAKER_FAILURE_THRESHOLD=3,
+        )
+        settings_patch.start()
+        self.addCleanup(settings_patch.stop)
+
+        self.logger = MagicMock(spec=LoggerABC)
+        self.cache = MemoryByteCache(max_size_bytes=1024 * 1024, ttl_seconds=60)
+        self.client = CloudinaryClient(self.cache, self.logger)
+
+    async def asyncTearDown(self) -> None:
+        await self.client.aclose()
+
+    async def test_aget_files_follows_cursor(self) -> None:
+        result = await self.client.aget_files("folder")
+
+        self.assertTrue(result.is_ok())
+        self.assertEqual(["file_0", "file_1", "file_2"], [file.public_id for file in result.ok.files])
+        self.assertEqual(3, len(_FakeCloudinaryHandler.requests))
+
+    async def test_aget_files_is_cached_until_files_change(self) -> None:
+        await self.client.aget_files("folder")
+        cached_result = await self.client.aget_files("folder")
+
+        self.assertEqual(3, len(cached_result.ok.files))
+        self.assertEqual(3, len(_FakeCloudinaryHandler.requests))
+        self.assertEqual(0.5, self.client.get_cache_stats().hit_ratio)
+
+        await self.client.adelete_files(["folder/file_0"])
+        await self.client.aget_files("folder")
+
+        self.assertEqual(7, len(_FakeCloudinaryHandler.requests))
+
+    async def test_aget_files_is_shared_and_invalidated_by_folder(self) -> None:
+        other_client = CloudinaryClient(self.cache, self.logger)
+        self.addAsyncCleanup(other_client.aclose)
+        await self.client.aget_files("user/a")
+        await self.client.aupload_file("user/b", "user/b/image", b"0")
+
+        # Clients sharing the cache reuse the listing, and changes to other folders keep it
+        await other_client.aget_files("user/a")
+
+        self.assertEqual(3, self.__count_requests("GET"))
+
+        await self.client.adelete_files_by_prefix("user/")
+        await other_client.aget_files("user/a")
+
+        self.assertEqual(6, self.__count_requests("GET"))
+
+    async def test_aget_files_retries_transient_errors(self) -> None:
+        _FakeCloudinaryHandler.failures.extend([(503, {"Retry-After": "0"}), (429, {})])
+
+        result = await self.client.aget_files("folder")
+
+        self.assertTrue(result.is_ok())
+        self.assertEqual(3, len(result.ok.files))
+        self.assertEqual(2, self.client.get_resilience_metrics().retries)
+
+    async def test_aget_files_fails_fast_while_circuit_is_open(self) -> None:
+        _FakeCloudinaryHandler.failures.extend([(500, {}), (502, {}), (504, {})])
+
+        result = await self.client.aget_files("folder")
+        requests_count = len(_FakeCloudinaryHandler.requests)
+        rejected_result = await self.client.aget_files("folder")
+
+        self.assertEqual("Cloudinary is unavailable", result.error.message)
+        self.assertEqual("Cloudinary is temporarily unavailable", rejected_result.error.message)
+        self.assertEqual(3, requests_count)
+        self.assertEqual(requests_count, len(_FakeCloudinaryHandler.requests))
+        metrics = self.client.get_resilience_metrics()
+        self.assertEqual((1, ["GET resources/by_asset_folder"]), (metrics.circuit_breaker_trips, metrics.open_circuits))
+        # Circuits are kept per endpoint
+        self.assertTrue((await self.client.adelete_files(["folder/file"])).is_ok())
+
+    async def test_aupload_file_in_chunks_from_disk(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "image.webp"
+            path.write_bytes(b"0" * 2500)
+
+            result = await self.client.aupload_file("folder", "folder/image", path)
+
+        self.assertTrue(result.is_ok())
+        upload_ids, content_ranges, body_sizes = zip(*_FakeCloudinaryHandler.uploads, strict=True)
+        self.assertEqual(1, len(set(upload_ids)))
+        self.assertEqual(("bytes 0-1023/2500", "bytes 1024-2047/2500", "bytes 2048-2499/2500"), content_ranges)
+        self.assertTrue(all(body_size < 2500 for body_size in body_sizes))
+
+    async def test_aupload_file_in_one_request(self) -> None:
+        result = await self.client.aupload_file("folder", "folder/image", b"0" * 1024)
+
+        self.assertEqual("https://example.com/file.webp", str(result.ok.secure_url))
+        self.assertEqual([(None, None, _FakeCloudinaryHandler.uploads[0][2])], _FakeCloudinaryHandler.uploads)
+
+    async def test_adelete_files_in_batches(self) -> None:
+        public_ids = [f"folder/file_{index}" for index in range(250)]
+
+        result = await self.client.adelete_files(public_ids)
+
+        self.assertTrue(result.is_ok())
+        self.assertEqual(set(public_ids), set(result.ok.deleted))
+        self.assertEqual([100, 100, 50], sorted((len(query["public_ids[]"]) for _, query in _FakeCloudinaryHandler.requests), reverse=True))
+
+    async def test_adelete_files_by_prefix_until_complete(self) -> None:
+        result = await self.client.adelete_files_by_prefix("user/converter/")
+
+        self.assertTrue(result.is_ok())
+        self.assertEqual(2, len(result.ok.deleted))
+        self.assertEqual(["next"], _FakeCloudinaryHandler.requests[1][1]["next_cursor"])
+
+    async def test_adelete_files_of_resource_type(self) -> None:
+        await self.client.adelete_files(["folder/archive.zip"], resource_type="raw")
+        await self.client.adelete_files_by_prefix("folder/archive", resource_type="raw")
+
+        self.assertEqual({"raw/upload"}, {path.split("/resources/")[1] for path in _FakeCloudinaryHandler.paths})
+
+    async def test_closes_client_of_previous_event_loop(self) -> None:
+        async def aget_files() -> None:
+            await self.client.aget_files("folder")
+
+        await asyncio.to_thread(asyncio.run, aget_files())
+
+        result = await self.client.adelete_files(["folder/file"])
+
+        self.assertTrue(result.is_ok())
+        self.logger.debug.assert_any_call("Closed stale Cloudinary connection pool")
+        self.logger.exception.assert_not_called()
+
+    @staticmethod
+    def __count_requests(method: str) -> int:
+        return sum(1 for request_method, _ in _FakeCloudinaryHandler.requests if request_method == method)
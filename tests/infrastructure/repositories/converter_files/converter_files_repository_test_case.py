@@ -0,0 +1,78 @@
+import unittest
+import uuid
+from unittest.mock import MagicMock
+
+from pydantic import HttpUrl
+
+from core.abc.logger_abc import LoggerABC
+from core.result import ContextResult, as_awaitable_result
+from infrastructure.cloudinary.cloudinary_client import CloudinaryClient
+from infrastructure.cloudinary.models import DeleteFileResponse, GetFilesResponse
+from infrastructure.repositories.converter_files.converter_files_repository import ConverterFilesRepository
+
+
+class ConverterFilesRepositoryTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.asset_id = str(uuid.uuid4())
+        # Folders of the legacy layout with the public IDs of their files
+        self.legacy_files: dict[str, list[str]] = {}
+
+        self.cloudinary_client = MagicMock(spec=CloudinaryClient)
+        self.cloudinary_client.aget_files = MagicMock(side_effect=self.__aget_files)
+        self.cloudinary_client.adelete_files = MagicMock(side_effect=self.__adelete_files)
+        self.cloudinary_client.adelete_files_by_prefix = MagicMock(side_effect=self.__adelete_files_by_prefix)
+
+        self.repo = ConverterFilesRepository(self.cloudinary_client, MagicMock(spec=LoggerABC))
+
+    async def test_adelete_files_deletes_folder_and_its_archives_by_prefix(self) -> None:
+        result = await self.repo.adelete_files("user", self.asset_id)
+
+        self.assertTrue(result.is_ok())
+        self.assertEqual(
+            [((f"user/converter/{self.asset_id}/",), {}), ((f"user/converter/webpeditor_{self.asset_id}",), {"resource_type": "raw"})],
+            [(call.args, call.kwargs) for call in self.cloudinary_client.adelete_files_by_prefix.call_args_list],
+        )
+        self.cloudinary_client.adelete_files.assert_not_called()
+
+    async def test_adelete_files_deletes_legacy_files_by_public_ids(self) -> None:
+        self.legacy_files["user/converter/original"] = ["user/converter/original/image"]
+        self.legacy_files["user/converter/converted"] = ["user/converter/converted/image"]
+
+        result = await self.repo.adelete_files("user", self.asset_id)
+
+        self.assertTrue(result.is_ok())
+        self.assertEqual(
+            [
+                ((["user/converter/original/image", "user/converter/converted/image"],), {}),
+                ((["user/converter/webpeditor_converted.zip"],), {"resource_type": "raw"}),
+            ],
+            [(call.args, call.kwargs) for call in self.cloudinary_client.adelete_files.call_args_list],
+        )
+
+    @as_awaitable_result
+    async def __aget_files(self, folder_path: str) -> ContextResult[GetFilesResponse]:
+        files = [
+            GetFilesResponse.FileData(
+                asset_id=public_id,
+                public_id=public_id,
+                created_at="2025-01-01T00:00:00Z",
+                format="webp",
+                bytes=1,
+                width=1,
+                height=1,
+                asset_folder=folder_path,
+                secure_url=HttpUrl(f"https://example.com/{public_id}.webp"),
+            )
+            for public_id in self.legacy_files.get(folder_path, [])
+        ]
+        return ContextResult[GetFilesResponse].success(GetFilesResponse(total_count=len(files), resources=files))
+
+    @staticmethod
+    @as_awaitable_result
+    async def __adelete_files(public_ids: list[str], **_: str) -> ContextResult[DeleteFileResponse]:
+        return ContextResult[DeleteFileResponse].success(DeleteFileResponse(deleted=dict.fromkeys(public_ids, "deleted")))
+
+    @staticmethod
+    @as_awaitable_result
+    async def __adelete_files_by_prefix(prefix: str, **_: str) -> ContextResult[DeleteFileResponse]:
+        return ContextResult[DeleteFileResponse].success(DeleteFileResponse(deleted={f"{prefix}file": "deleted"}))
@@ -0,0 +1,63 @@
+import io
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from PIL import Image
+
+from core.abc.logger_abc import LoggerABC
+from infrastructure.repositories.converter_files.models import UploadFileParams
+from infrastructure.repositories.local_files.local_files_repository import LocalFilesRepository
+
+
+class LocalFilesRepositoryTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = Path(directory.name)
+
+        settings_patch = patch.multiple(
+            "webpeditor.settings",
+            LOCAL_FILES_ROOT=self.root,
+            LOCAL_FILES_BASE_URL="http://localhost/files",
+        )
+        settings_patch.start()
+        self.addCleanup(settings_patch.stop)
+
+        self.repo = LocalFilesRepository(MagicMock(spec=LoggerABC))
+
+    async def test_aupload_file_is_content_addressed(self) -> None:
+        content = self.create_image()
+
+        first_url = await self.repo.aupload_file("user", params=self.create_params(content))
+        second_url = await self.repo.aupload_file("user", params=self.create_params(content))
+
+        self.assertEqual(first_url.ok, second_url.ok)
+        self.assertRegex(first_url.ok.path or "", r"^/files/user/converter/asset/converted/[0-9a-f]{64}/image\.webp$")
+        self.assertEqual(content, (await self.repo.adownload_file(first_url.ok)).ok)
+
+    async def test_azip_folder_and_adelete_files(self) -> None:
+        await self.repo.aupload_file("user", params=self.create_params(self.create_image()))
+
+        files = await self.repo.aget_files("user", "asset/converted")
+        zip_archive = await self.repo.azip_folder("user", "asset/converted")
+
+        self.assertEqual([("user/converter/asset/converted/image", 2, 1)], [(f.public_id, f.width, f.height) for f in files.ok.files])
+        zip_content = (await self.repo.adownload_file(zip_archive.ok.url)).ok
+        with zipfile.ZipFile(io.BytesIO(zip_content)) as archive:
+            self.assertEqual(["image.webp"], archive.namelist())
+
+        self.assertTrue((await self.repo.adelete_files("user", "")).is_ok())
+        self.assertEqual(0, (await self.repo.aget_files("user", "asset/converted")).ok.total_count)
+
+    @staticmethod
+    def create_params(content: bytes) -> UploadFileParams:
+        return UploadFileParams(relative_folder_path="asset/converted", basename="image", content=content)
+
+    @staticmethod
+    def create_image() -> bytes:
+        with io.BytesIO() as buffer:
+            Image.new("RGB", (2, 1)).save(buffer, "WEBP")
+            return buffer.getvalue()
@@ -1,13 +1,53 @@
 import unittest
 
+from tests.api.upload_handlers_test_case import UploadHandlersTestCase
+from tests.application.common.services.session_service_test_case import SessionServiceTestCase
 from tests.application.converter.commands.convert_images_command_test_case import ConvertImagesCommandTestCase
+from tests.application.converter.queries.get_converted_zip_query_test_case import GetConvertedZipQueryTestCase
+from tests.application.converter.queries.stream_converted_zip_query_test_case import StreamConvertedZipQueryTestCase
+from tests.application.converter.services.expired_image_assets_sweeper_test_case import ExpiredImageAssetsSweeperTestCase
+from tests.application.converter.services.image_assets_cleanup_worker_test_case import ImageAssetsCleanupWorkerTestCase
+from tests.application.converter.services.image_file_converter_worker_test_case import ImageFileConverterWorkerTestCase
+from tests.application.converter.validators.conversion_request_validator_test_case import ConversionRequestValidatorTestCase
+from tests.core.archives.stored_zip_stream_test_case import StoredZipStreamTestCase
+from tests.core.caches.memory_byte_cache_test_case import MemoryByteCacheTestCase
+from tests.core.caches.sqlite_byte_cache_test_case import SqliteByteCacheTestCase
+from tests.core.caches.tiered_byte_cache_test_case import TieredByteCacheTestCase
+from tests.core.executors.pool_task_executor_test_case import PoolTaskExecutorTestCase
+from tests.core.limiters.stage_limiter_test_case import StageLimiterTestCase
+from tests.core.resilience.circuit_breaker_test_case import CircuitBreakerTestCase
+from tests.core.result.context_result_test_case import ContextResultTestCase
+from tests.core.tracing.tracer_test_case import TracerTestCase
+from tests.infrastructure.cloudinary.cloudinary_client_test_case import CloudinaryClientTestCase
+from tests.infrastructure.repositories.converter_files.converter_files_repository_test_case import ConverterFilesRepositoryTestCase
+from tests.infrastructure.repositories.local_files.local_files_repository_test_case import LocalFilesRepositoryTestCase
 
 
 def main() -> None:
     loader = unittest.TestLoader()
     suite = unittest.TestSuite()
 
+    suite.addTests(loader.loadTestsFromTestCase(UploadHandlersTestCase))
+    suite.addTests(loader.loadTestsFromTestCase(SessionServiceTestCase))
     suite.addTests(loader.loadTestsFromTestCase(ConvertImagesCommandTestCase))
+    suite.addTests(loader.loadTestsFromTestCase(GetConvertedZipQueryTestCase))
+    suite.addTests(loader.loadTestsFromTestCase(StreamConvertedZipQueryTestCase))
+    suite.addTests(loader.loadTestsFromTestCase(ExpiredImageAssetsSweeperTestCase))
+    suite.addTests(loader.loadTestsFromTestCase(ImageAssetsCleanupWorkerTestCase))
+    suite.addTests(loader.loadTestsFromTestCase(ImageFileConverterWorkerTestCase))
+    suite.addTests(loader.loadTestsFromTestCase(ConversionRequestValidatorTestCase))
+    suite.addTests(loader.loadTestsFromTestCase(StoredZipStreamTestCase))
+    suite.addTests(loader.loadTestsFromTestCase(MemoryByteCacheTestCase))
+    suite.addTests(loader.loadTestsFromTestCase(SqliteByteCacheTestCase))
+    suite.addTests(loader.loadTestsFromTestCase(TieredByteCacheTestCase))
+    suite.addTests(loader.loadTestsFromTestCase(CircuitBreakerTestCase))
+    suite.addTests(loader.loadTestsFromTestCase(ContextResultTestCase))
+    suite.addTests(loader.loadTestsFromTestCase(PoolTaskExecutorTestCase))
+    suite.addTests(loader.loadTestsFromTestCase(StageLimiterTestCase))
+    suite.addTests(loader.loadTestsFromTestCase(TracerTestCase))
+    suite.addTests(loader.loadTestsFromTestCase(CloudinaryClientTestCase))
+    suite.addTests(loader.loadTestsFromTestCase(ConverterFilesRepositoryTestCase))
+    suite.addTests(loader.loadTestsFromTestCase(LocalFilesRepositoryTestCase))
 
     runner = unittest.TextTestRunner()
     runner.run(suite)
@@ -0,0 +1,29 @@
+from typing import Any
+
+from django.http import FileResponse, Http404, HttpRequest, HttpResponse, HttpResponseBase
+from django.views import View
+
+from webpeditor import settings
+
+
+class LocalFileView(View):
+    # Paths contain the digest of the content, so the response never changes
+    __CACHE_CONTROL: str = "public, max-age=31536000, immutable"
+
+    def get(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponseBase:
+        root = settings.LOCAL_FILES_ROOT.resolve()
+        path = (root / str(kwargs["file_path"])).resolve()
+        if not path.is_relative_to(root) or not path.is_file():
+            raise Http404("File not found")
+
+        relative_path = path.relative_to(root).as_posix()
+
+        if settings.LOCAL_FILES_ACCEL_REDIRECT_PREFIX is not None:
+            # The proxy sends the file, so the worker is released as soon as the headers are returned
+            response = HttpResponse(content_type="")
+            response["X-Accel-Redirect"] = f"{settings.LOCAL_FILES_ACCEL_REDIRECT_PREFIX.rstrip('/')}/{relative_path}"
+        else:
+            response = FileResponse(path.open("rb"), filename=path.name)
+
+        response["Cache-Control"] = self.__CACHE_CONTROL
+        return response
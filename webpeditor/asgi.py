@@ -7,11 +7,32 @@ For more information on this file, see
 https://docs.djangoproject.com/en/4.1/howto/deployment/asgi/
 """
 
+import asyncio
 import os
+from functools import partial
 
 from django.core.asgi import get_asgi_application
 from django.core.handlers.asgi import ASGIHandler
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "webpeditor.settings")
 
-application: ASGIHandler = get_asgi_application()
+django_application: ASGIHandler = get_asgi_application()
+
+# Imported after the Django setup, since the container and its providers require the loaded apps
+from anydi_django import container  # noqa: E402
+
+from application.converter.services.abc.image_assets_cleanup_worker_abc import ImageAssetsCleanupWorkerABC  # noqa: E402
+from core.abc.task_executor_abc import TaskExecutorABC  # noqa: E402
+from infrastructure.cloudinary.cloudinary_client import CloudinaryClient  # noqa: E402
+from webpeditor.lifespan import LifespanApplication  # noqa: E402
+
+cloudinary_client: CloudinaryClient = container.resolve(CloudinaryClient)
+image_assets_cleanup_worker: ImageAssetsCleanupWorkerABC = container.resolve(ImageAssetsCleanupWorkerABC)
+task_executor: TaskExecutorABC = container.resolve(TaskExecutorABC)
+
+application: LifespanApplication = LifespanApplication(
+    django_application,
+    on_startup=[cloudinary_client.astart, image_assets_cleanup_worker.astart],
+    # Worker processes are stopped once the cleanup worker is closed, waiting in a thread for their tasks to be cancelled
+    on_shutdown=[image_assets_cleanup_worker.aclose, partial(asyncio.to_thread, task_executor.shutdown), cloudinary_client.aclose],
+)
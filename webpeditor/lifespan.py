@@ -0,0 +1,45 @@
+from typing import Any, Awaitable, Callable, Final, Mapping, Sequence, final
+
+from django.core.handlers.asgi import ASGIHandler
+
+type LifespanHook = Callable[[], Awaitable[None]]
+type _Receive = Callable[[], Awaitable[Mapping[str, Any]]]
+type _Send = Callable[[Mapping[str, Any]], Awaitable[None]]
+
+
+@final
+class LifespanApplication:
+    def __init__(
+        self,
+        application: ASGIHandler,
+        on_startup: Sequence[LifespanHook],
+        on_shutdown: Sequence[LifespanHook],
+    ) -> None:
+        self.__application: Final[ASGIHandler] = application
+        self.__on_startup: Final[Sequence[LifespanHook]] = on_startup
+        self.__on_shutdown: Final[Sequence[LifespanHook]] = on_shutdown
+
+    async def __call__(self, scope: dict[str, Any], receive: _Receive, send: _Send) -> None:
+        # Django does not handle the lifespan protocol. Servers that do not send lifespan events are not affected
+        if scope["type"] != "lifespan":
+            return await self.__application(scope, receive, send)
+
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    for hook in self.__on_startup:
+                        await hook()
+                except Exception as exception:
+                    await send({"type": "lifespan.startup.failed", "message": str(exception)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                try:
+                    for hook in self.__on_shutdown:
+                        await hook()
+                except Exception as exception:
+                    await send({"type": "lifespan.shutdown.failed", "message": str(exception)})
+                    return
+                await send({"type": "lifespan.shutdown.complete"})
+                return
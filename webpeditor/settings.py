@@ -82,6 +82,7 @@ CORS_ORIGIN_WHITELIST: list[str] = str(os.getenv("CORS_ORIGIN_WHITELIST")).split
 MIDDLEWARE: list[str] = [
     "anydi_django.middleware.request_scoped_middleware",
     "api.middlewares.ErrorHandlingMiddleware",
+    "api.middlewares.ServerTimingMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.admindocs.middleware.XViewMiddleware",
     "django.middleware.security.SecurityMiddleware",
@@ -94,6 +95,12 @@ MIDDLEWARE: list[str] = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Uploaded files are hashed while they are received, so their content is not read again to compute a digest
+FILE_UPLOAD_HANDLERS: list[str] = [
+    "api.upload_handlers.HashingMemoryFileUploadHandler",
+    "api.upload_handlers.HashingTemporaryFileUploadHandler",
+]
+
 ROOT_URLCONF: str = "webpeditor.urls"
 
 TEMPLATES: list[dict[str, Any]] = [
@@ -116,10 +123,32 @@ ASGI_APPLICATION: str = "webpeditor.asgi.application"
 
 # Database
 
+# SQLite profile for concurrent access. In WAL mode readers do not block the writer, and writers take the lock
+# when a transaction begins, so they wait for it up to the timeout instead of failing on a lock upgrade
+SQLITE_INIT_COMMAND: str = ";".join(
+    [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA mmap_size={int(str(os.getenv('SQLITE_MMAP_SIZE_BYTES', 256 * 1024 * 1024)))}",  # 256 MiB
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-16000",  # 16 MiB
+    ]
+)
+
 DATABASES: dict[str, Any] = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        "OPTIONS": {
+            "init_command": SQLITE_INIT_COMMAND,
+            "transaction_mode": "IMMEDIATE",
+            "timeout": int(str(os.getenv("SQLITE_BUSY_TIMEOUT_SECONDS", "20"))),
+        },
+        # Under ASGI the ORM calls of each request run in a thread of their own, so a persistent connection is never reused
+        # by a later request. Connections are closed after each request, which is cheap with the pragmas above.
+        # Persistent connections only pay off for sync workers, which can opt in through the environment
+        "CONN_MAX_AGE": int(str(os.getenv("DATABASE_CONN_MAX_AGE_SECONDS", "0"))),
+        "CONN_HEALTH_CHECKS": True,
     },
 }
 
@@ -163,13 +192,16 @@ EMAIL_HOST_PASSWORD: str = str(os.getenv("EMAIL_HOST_PASSWORD"))
 DEFAULT_FROM_EMAIL: str = str(os.getenv("DEFAULT_FROM_EMAIL"))
 
 # Session handling
-SESSION_ENGINE: str = "django.contrib.sessions.backends.db"
+# Sessions are read from the cache of the process and fall back to the database
+SESSION_ENGINE: str = str(os.getenv("SESSION_ENGINE", "django.contrib.sessions.backends.cached_db"))
 SESSION_SERIALIZER: str = "django.contrib.sessions.serializers.JSONSerializer"
 SESSION_EXPIRE_AT_BROWSER_CLOSE: bool = True
 SESSION_COOKIE_SAMESITE: str = "Strict"
 SESSION_COOKIE_HTTPONLY: bool = True
 SESSION_COOKIE_SECURE: bool = True
 SESSION_COOKIE_AGE: int = math.ceil(timedelta(minutes=15).total_seconds())  # 15 minutes
+# Expiry of a session is extended only once less than this remains, so most requests do not write the session
+SESSION_REFRESH_THRESHOLD_SECONDS: int = math.ceil(timedelta(minutes=10).total_seconds())  # 10 minutes
 
 # CSRF
 CSRF_COOKIE_SAMESITE: str = "Strict"
@@ -207,12 +239,61 @@ COMPRESS_ENABLED: bool = True if DEBUG else False
 
 MEDIA_URL: str = "/"
 
+# Storage of the converter files. Backend: "cloudinary" or "local" (files on the disk of the app, served under LOCAL_FILES_BASE_URL)
+CONVERTER_FILES_BACKEND: str = str(os.getenv("CONVERTER_FILES_BACKEND", "cloudinary"))
+LOCAL_FILES_ROOT: Path = Path(os.getenv("LOCAL_FILES_ROOT", BASE_DIR / "local_files"))
+LOCAL_FILES_BASE_URL: str = str(os.getenv("LOCAL_FILES_BASE_URL", "http://localhost:8000/files"))
+# Internal location of LOCAL_FILES_ROOT in a reverse proxy. When set, files are sent by the proxy through X-Accel-Redirect
+LOCAL_FILES_ACCEL_REDIRECT_PREFIX: Optional[str] = os.getenv("LOCAL_FILES_ACCEL_REDIRECT_PREFIX")
+
 # Cloudinary storage config
 CLOUDINARY_BASE_URL: str = str(os.getenv("CLOUDINARY_BASE_URL"))
 CLOUDINARY_CLOUD_NAME: str = str(os.getenv("CLOUDINARY_CLOUD_NAME"))
 CLOUDINARY_API_KEY: str = str(os.getenv("CLOUDINARY_API_KEY"))
 CLOUDINARY_API_SECRET: str = str(os.getenv("CLOUDINARY_API_SECRET"))
 CLOUDINARY_HTTP_TIMEOUT_SECONDS: int = 120
+CLOUDINARY_HTTP2_ENABLED: bool = bool(int(str(os.getenv("CLOUDINARY_HTTP2_ENABLED", "1"))))
+CLOUDINARY_HTTP_MAX_CONNECTIONS: int = int(str(os.getenv("CLOUDINARY_HTTP_MAX_CONNECTIONS", "20")))
+CLOUDINARY_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = int(str(os.getenv("CLOUDINARY_HTTP_MAX_KEEPALIVE_CONNECTIONS", "10")))
+CLOUDINARY_HTTP_KEEPALIVE_EXPIRY_SECONDS: int = int(str(os.getenv("CLOUDINARY_HTTP_KEEPALIVE_EXPIRY_SECONDS", "30")))
+# Requests that fail with 429, 5xx or a transport error are retried. The circuit of an endpoint opens after consecutive failures
+CLOUDINARY_RETRY_MAX_ATTEMPTS: int = int(str(os.getenv("CLOUDINARY_RETRY_MAX_ATTEMPTS", "3")))
+CLOUDINARY_RETRY_BASE_DELAY_SECONDS: float = float(str(os.getenv("CLOUDINARY_RETRY_BASE_DELAY_SECONDS", "0.5")))
+CLOUDINARY_RETRY_MAX_DELAY_SECONDS: float = float(str(os.getenv("CLOUDINARY_RETRY_MAX_DELAY_SECONDS", "10")))
+CLOUDINARY_CIRCUIT_BREAKER_FAILURE_THRESHOLD: int = int(str(os.getenv("CLOUDINARY_CIRCUIT_BREAKER_FAILURE_THRESHOLD", "5")))
+CLOUDINARY_CIRCUIT_BREAKER_RESET_TIMEOUT_SECONDS: float = float(str(os.getenv("CLOUDINARY_CIRCUIT_BREAKER_RESET_TIMEOUT_SECONDS", "30")))
+# Files larger than a chunk are uploaded in chunks. Cloudinary requires chunks of at least 5 MiB, except the last one
+CLOUDINARY_UPLOAD_CHUNK_SIZE_BYTES: int = int(str(os.getenv("CLOUDINARY_UPLOAD_CHUNK_SIZE_BYTES", 20 * 1024 * 1024)))  # 20 MiB
+# Cache of Cloudinary listings. Backend: "memory" (per process) or "tiered" (memory backed by a SQLite file)
+CLOUDINARY_CACHE_BACKEND: str = str(os.getenv("CLOUDINARY_CACHE_BACKEND", "memory"))
+CLOUDINARY_CACHE_MAX_SIZE_BYTES: int = int(str(os.getenv("CLOUDINARY_CACHE_MAX_SIZE_BYTES", 16 * 1024 * 1024)))  # 16 MiB
+CLOUDINARY_CACHE_TTL_SECONDS: int = int(str(os.getenv("CLOUDINARY_CACHE_TTL_SECONDS", "300")))
+CLOUDINARY_CACHE_DATABASE_PATH: Path = Path(os.getenv("CLOUDINARY_CACHE_DATABASE_PATH", BASE_DIR / "cloudinary_cache.sqlite3"))
+
+# CPU-bound task execution (image conversion). Mode: "process" or "thread"
+TASK_EXECUTOR_MODE: str = str(os.getenv("TASK_EXECUTOR_MODE", "process"))
+TASK_EXECUTOR_MAX_WORKERS: int = int(str(os.getenv("TASK_EXECUTOR_MAX_WORKERS", os.cpu_count() or 1)))
+TASK_EXECUTOR_TIMEOUT_SECONDS: int = int(str(os.getenv("TASK_EXECUTOR_TIMEOUT_SECONDS", "60")))
+
+# Conversion result cache. Backend: "memory" (per process) or "sqlite" (shared by processes on the same machine)
+CONVERSION_CACHE_BACKEND: str = str(os.getenv("CONVERSION_CACHE_BACKEND", "sqlite"))
+CONVERSION_CACHE_MAX_SIZE_BYTES: int = int(str(os.getenv("CONVERSION_CACHE_MAX_SIZE_BYTES", 256 * 1024 * 1024)))  # 256 MiB
+CONVERSION_CACHE_DATABASE_PATH: Path = Path(os.getenv("CONVERSION_CACHE_DATABASE_PATH", BASE_DIR / "conversion_cache.sqlite3"))
+
+# Concurrency of the stages of the conversion pipeline per process. The pipeline limit bounds the files held in memory
+CONVERTER_PIPELINE_MAX_FILES: int = int(str(os.getenv("CONVERTER_PIPELINE_MAX_FILES", "8")))
+CONVERTER_DECODE_MAX_CONCURRENCY: int = int(str(os.getenv("CONVERTER_DECODE_MAX_CONCURRENCY", "2")))
+CONVERTER_CONVERT_MAX_CONCURRENCY: int = int(str(os.getenv("CONVERTER_CONVERT_MAX_CONCURRENCY", TASK_EXECUTOR_MAX_WORKERS)))
+CONVERTER_UPLOAD_MAX_CONCURRENCY: int = int(str(os.getenv("CONVERTER_UPLOAD_MAX_CONCURRENCY", "6")))
+CONVERTER_PERSIST_MAX_CONCURRENCY: int = int(str(os.getenv("CONVERTER_PERSIST_MAX_CONCURRENCY", "1")))
+
+# Cleanup of the previous converter assets. Mode: "deferred" (background worker with retries) or "inline" (awaited by the request)
+CONVERTER_ASSETS_CLEANUP_MODE: str = str(os.getenv("CONVERTER_ASSETS_CLEANUP_MODE", "deferred"))
+CONVERTER_ASSETS_CLEANUP_MAX_CONCURRENCY: int = int(str(os.getenv("CONVERTER_ASSETS_CLEANUP_MAX_CONCURRENCY", "4")))
+CONVERTER_ASSETS_CLEANUP_MAX_REQUESTS_PER_SECOND: float = float(str(os.getenv("CONVERTER_ASSETS_CLEANUP_MAX_REQUESTS_PER_SECOND", "10")))
+
+# Per-stage latency and size histograms of the conversion pipeline, exposed on "api/metrics" and as a Server-Timing header
+TRACING_ENABLED: bool = bool(int(str(os.getenv("TRACING_ENABLED", "0"))))
 
 RESERVED_WINDOWS_FILENAMES: list[str] = str(os.getenv("RESERVED_WINDOWS_FILENAMES")).split(",")
 
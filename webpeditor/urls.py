@@ -17,6 +17,7 @@ from views.contact_view import ContactView
 from views.content_not_found_view import ContentNotFoundView
 from views.image_converter_view import ImageConverterView
 from views.image_not_found_view import ImageNotFoundView
+from views.local_file_view import LocalFileView
 from webpeditor import settings
 
 # Admin
@@ -60,6 +61,10 @@ urlpatterns += [
 if settings.IS_DEVELOPMENT:
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
 
+# Converter files stored on the disk of the app
+if settings.CONVERTER_FILES_BACKEND == "local":
+    urlpatterns += [path("files/<path:file_path>", LocalFileView.as_view(), name="local-file-view")]
+
 # WebP Editor App
 urlpatterns += [
     path("api/", include("api.urls")),